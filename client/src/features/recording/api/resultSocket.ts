@@ -0,0 +1,59 @@
+// resultSocket.ts
+
+import type { ResultEvent } from './types';
+
+export interface ResultSocket {
+    subscribe: (jobIds: string[]) => void;
+    close: () => void;
+    isAvailable: () => boolean;
+}
+
+// apiClient와 같은 baseURL을 ws(s):// 주소로 변환
+const buildResultSocketUrl = (): string => {
+    const baseUrl = new URL(import.meta.env.VITE_API_BASE_URL ?? '/api', window.location.href);
+    baseUrl.protocol = baseUrl.protocol === 'https:' ? 'wss:' : 'ws:';
+    baseUrl.pathname = `${baseUrl.pathname.replace(/\/$/, '')}/ws/results`;
+    return baseUrl.toString();
+};
+
+// 하나의 WebSocket으로 여러 Job의 결과를 구독 (/result 폴링 대체)
+export const createResultSocket = (
+    onResult: (result: ResultEvent) => void,
+    onUnavailable: (pendingJobIds: string[]) => void,
+): ResultSocket => {
+    const socket = new WebSocket(buildResultSocketUrl());
+    const pendingJobIds = new Set<string>();
+    let available = true;
+
+    const send = (jobIds: string[]) => {
+        if (socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify({ subscribe: jobIds }));
+        }
+    };
+
+    socket.onopen = () => send([...pendingJobIds]);
+    socket.onmessage = (event) => {
+        const result: ResultEvent = JSON.parse(event.data);
+        if (result.status === 'Completed' || result.status === 'Failed') {
+            pendingJobIds.delete(result.job_id);
+        }
+        onResult(result);
+    };
+    socket.onclose = () => {
+        if (!available) return;
+        available = false;
+        onUnavailable([...pendingJobIds]);
+    };
+
+    return {
+        subscribe: (jobIds) => {
+            jobIds.forEach((jobId) => pendingJobIds.add(jobId));
+            send(jobIds);
+        },
+        close: () => {
+            available = false;
+            socket.close();
+        },
+        isAvailable: () => available,
+    };
+};
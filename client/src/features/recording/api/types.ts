@@ -2,6 +2,10 @@
 export interface UploadResponse {
     job_id: string;
     message: string;
+    cached?: boolean; // 동일 오디오의 캐시된 STT 결과로 즉시 완료된 경우 true
+    idempotent_replay?: boolean; // 같은 Idempotency-Key로 이미 만든 Job을 돌려준 경우 true
+    session_id?: string;
+    seq?: number;
 }
 
 // 2. /result/{job_id} 요청 시 백엔드가 반환하는 응답 타입
@@ -11,4 +15,49 @@ export interface ResultResponse {
     error?: string;
     error_detail?: string;
     detected_language?: string;
-}
\ No newline at end of file
+    segment_count?: number; // 세그먼트는 /result/{jobId}/segments로 구간별 조회
+}
+
+// GET /result/{jobId}/segments 응답 타입
+export interface TranscriptSegment {
+    index: number;
+    start: number; // 초
+    end: number;
+    text: string;
+    avg_logprob: number | null;
+    no_speech_prob: number | null;
+}
+
+export interface SegmentsResponse {
+    job_id: string;
+    segment_count: number;
+    first_index: number;
+    segments: TranscriptSegment[];
+}
+
+// POST /results 응답 타입 (jobId -> 결과)
+export interface ResultsResponse {
+    results: Record<string, ResultResponse>;
+}
+
+// 3. /ws/results WebSocket으로 전달되는 결과 이벤트 타입
+export interface ResultEvent extends ResultResponse {
+    job_id: string;
+}
+
+// 4. /session/{session_id} 요청 시 백엔드가 반환하는 응답 타입
+export interface SessionChunk extends ResultResponse {
+    seq: number;
+    job_id: string;
+}
+
+export interface SessionResponse {
+    session_id: string;
+    chunk_count: number;
+    completed: number;
+    failed: number;
+    processing: number;
+    is_final: boolean;
+    transcript: string; // 완료된 청크를 seq 순서로 이어붙인 전사본
+    chunks: SessionChunk[];
+}
@@ -1,11 +1,14 @@
 // uploadingRecording.ts
 
 import apiClient from "../../../shared/lib/api/apiClient";
-import type { UploadResponse, ResultResponse } from './types';
+import type { UploadResponse, ResultResponse, ResultsResponse, SegmentsResponse, SessionResponse } from './types';
 
 export interface UploadRecordingParams {
     blob: Blob;
     filename?: string;
+    sessionId?: string; // 같은 녹음의 청크들을 서버에서 하나의 세션 전사본으로 모음
+    seq?: number;
+    idempotencyKey?: string; // 재시도 시 같은 값을 보내면 서버가 처음 만든 Job을 그대로 돌려줌 (중복 업로드/STT 방지)
 }
 
 // Job ID를 반환하는 업로드 함수
@@ -14,12 +17,50 @@ export const uploadRecording = async (
 ): Promise<UploadResponse> => {
     const formData = new FormData();
     formData.append('file', params.blob, params.filename ?? 'recording.webm');
-    const res = await apiClient.post<UploadResponse>('/upload', formData); 
+    if (params.sessionId !== undefined && params.seq !== undefined) {
+        formData.append('session_id', params.sessionId);
+        formData.append('seq', String(params.seq));
+    }
+    const headers = params.idempotencyKey ? { 'Idempotency-Key': params.idempotencyKey } : undefined;
+    const res = await apiClient.post<UploadResponse>('/upload', formData, { headers }); 
     return res.data;
 };
 
-// 결과를 조회하는 함수
-export const getResult = async (jobId: string): Promise<ResultResponse> => {
-    const res = await apiClient.get<ResultResponse>(`/result/${jobId}`);
+// 결과를 조회하는 함수 (서버가 ETag를 보내므로 브라우저가 If-None-Match로 재검증, 변경이 없으면 304)
+// waitSeconds를 주면 롱 폴링: 서버가 작업이 완료/실패할 때까지(최대 waitSeconds초) 기다렸다가 바로 응답
+export const getResult = async (jobId: string, waitSeconds?: number): Promise<ResultResponse> => {
+    const res = await apiClient.get<ResultResponse>(`/result/${jobId}`, {
+        params: { wait: waitSeconds },
+        // 기본 요청 타임아웃(10초)보다 오래 기다릴 수 있으므로 대기 시간만큼 늘림
+        ...(waitSeconds ? { timeout: (waitSeconds + 10) * 1000 } : {}),
+    });
     return res.data;
-};
\ No newline at end of file
+};
+
+// 더 이상 필요 없는 결과를 만료 전에 서버에서 삭제하는 함수 (조회만으로는 삭제되지 않음)
+export const deleteResult = async (jobId: string): Promise<void> => {
+    await apiClient.delete(`/result/${jobId}`);
+};
+
+// 완료된 Job의 세그먼트 중 [from, to)초 구간만 조회하는 함수 (화면에 보이는 부분만 가져오기)
+export const getSegments = async (jobId: string, from?: number, to?: number): Promise<SegmentsResponse> => {
+    const res = await apiClient.get<SegmentsResponse>(`/result/${jobId}/segments`, { params: { from, to } });
+    return res.data;
+};
+
+// 여러 Job의 결과를 한 번에 조회하는 함수
+export const getResults = async (jobIds: string[]): Promise<ResultsResponse> => {
+    const res = await apiClient.post<ResultsResponse>('/results', { job_ids: jobIds });
+    return res.data;
+};
+// 세션 전체(청크별 상태 + 이어붙인 전사본)를 한 번에 조회하는 함수
+export const getSession = async (sessionId: string): Promise<SessionResponse> => {
+    const res = await apiClient.get<SessionResponse>(`/session/${sessionId}`);
+    return res.data;
+};
+
+// 서버에 모인 세션 전사본으로 요약을 시작하는 함수 (요약 Job ID 반환)
+export const summarizeSession = async (sessionId: string): Promise<UploadResponse> => {
+    const res = await apiClient.post<UploadResponse>(`/session/${sessionId}/summarize`);
+    return res.data;
+};
@@ -1,7 +1,8 @@
 // src/features/recording/hooks/useUploadRecording.ts
 
 import { useState, useCallback, useEffect, useRef } from 'react';
-import { uploadRecording, getResult } from "../api/uploadingRecording";
+import { uploadRecording, getResults } from "../api/uploadingRecording";
+import { createResultSocket, type ResultSocket } from "../api/resultSocket";
 import type { UploadResponse, ResultResponse } from '../api/types';
 
 // 각 청크의 상태를 나타내는 타입 정의
@@ -11,42 +12,91 @@ export const useUploadRecording = () => {
     const [transcripts, setTranscripts] = useState<Record<string, string>>({});
     const [statuses, setStatuses] = useState<Record<string, ChunkStatus>>({});
     const [errors, setErrors] = useState<Record<string, string>>({});
-    const pollingIntervals = useRef<Record<string, number>>({});
+    const pollingJobIds = useRef<Set<string>>(new Set()); // 폴링으로 결과를 기다리는 jobId (WebSocket을 쓸 수 없을 때)
+    const pollingTimer = useRef<number | null>(null);
+    const jobChunkIds = useRef<Record<string, string>>({}); // jobId -> chunkId (결과 대기 중인 작업)
+    const resultSocket = useRef<ResultSocket | null>(null);
+    const sessionId = useRef<string>(crypto.randomUUID()); // 이 녹음의 청크들을 묶는 서버 세션 ID
+    const chunkSeqs = useRef<Record<string, number>>({}); // chunkId -> 세션 내 순서 (재업로드 시 같은 순서 유지)
+    const chunkUploadKeys = useRef<Record<string, string>>({}); // chunkId -> Idempotency-Key (업로드 타임아웃 후 재시도해도 같은 Job)
 
-    const pollForResult = useCallback((chunkId: string, jobId: string) => {
-        if (pollingIntervals.current[chunkId]) {
-            clearInterval(pollingIntervals.current[chunkId]);
+    // 최종 상태(Completed/Failed)이면 true 반환
+    const applyResult = useCallback((chunkId: string, result: ResultResponse): boolean => {
+        if (result.status === 'Processing') return false;
+
+        const finalStatus = result.status.toLowerCase() as ChunkStatus;
+        setStatuses((prev) => ({ ...prev, [chunkId]: finalStatus }));
+
+        if (result.status === 'Completed') {
+            setTranscripts((prev) => ({ ...prev, [chunkId]: result.transcription || "" }));
+            if (result.error_detail) {
+                setErrors((prev) => ({ ...prev, [chunkId]: result.error_detail }));
+            }
+        } else if (result.status === 'Failed') {
+            setErrors((prev) => ({ ...prev, [chunkId]: result.error || "처리 실패" }));
+            delete chunkUploadKeys.current[chunkId]; // 서버에서 실패한 작업은 다시 업로드할 때 새 Job으로 처리
         }
+        return true;
+    }, []);
 
-        const intervalId = window.setInterval(async () => {
+    const stopPolling = useCallback(() => {
+        if (pollingTimer.current !== null) {
+            clearInterval(pollingTimer.current);
+            pollingTimer.current = null;
+        }
+    }, []);
+
+    // 폴링 중인 모든 작업을 하나의 타이머와 한 번의 POST /results 요청으로 확인
+    const pollForResult = useCallback((jobId: string) => {
+        pollingJobIds.current.add(jobId);
+        if (pollingTimer.current !== null) return;
+
+        pollingTimer.current = window.setInterval(async () => {
+            const jobIds = [...pollingJobIds.current].filter((id) => {
+                if (jobChunkIds.current[id]) return true;
+                pollingJobIds.current.delete(id); // 재업로드로 대체된 작업
+                return false;
+            });
+            if (jobIds.length === 0) {
+                stopPolling();
+                return;
+            }
             try {
-                const result: ResultResponse = await getResult(jobId);
-                if (result.status !== 'Processing') {
-                    clearInterval(intervalId);
-                    delete pollingIntervals.current[chunkId];
-
-                    const finalStatus = result.status.toLowerCase() as ChunkStatus;
-                    setStatuses((prev) => ({ ...prev, [chunkId]: finalStatus }));
-
-                    if (result.status === 'Completed') {
-                        setTranscripts((prev) => ({ ...prev, [chunkId]: result.transcription || "" }));
-                        if (result.error_detail) {
-                            setErrors((prev) => ({ ...prev, [chunkId]: result.error_detail }));
-                        }
-                    } else if (result.status === 'Failed') {
-                        setErrors((prev) => ({ ...prev, [chunkId]: result.error || "처리 실패" }));
+                const { results } = await getResults(jobIds);
+                jobIds.forEach((id) => {
+                    const chunkId = jobChunkIds.current[id];
+                    if (chunkId && results[id] && applyResult(chunkId, results[id])) {
+                        pollingJobIds.current.delete(id);
+                        delete jobChunkIds.current[id];
                     }
-                }
+                });
             } catch (err) {
-                console.error(`청크(${chunkId}) 결과 조회 실패:`, err);
-                clearInterval(intervalId);
-                delete pollingIntervals.current[chunkId];
-                setErrors((prev) => ({ ...prev, [chunkId]: "결과 조회 실패" }));
-                setStatuses((prev) => ({ ...prev, [chunkId]: 'failed' }));
+                console.error(`결과 조회 실패 (${jobIds.length}개 작업):`, err);
+                jobIds.forEach((id) => {
+                    const chunkId = jobChunkIds.current[id];
+                    pollingJobIds.current.delete(id);
+                    if (!chunkId) return;
+                    setErrors((prev) => ({ ...prev, [chunkId]: "결과 조회 실패" }));
+                    setStatuses((prev) => ({ ...prev, [chunkId]: 'failed' }));
+                });
             }
         }, 5000); // 5초 간격으로 결과 확인
-        pollingIntervals.current[chunkId] = intervalId;
-    }, []);
+    }, [applyResult, stopPolling]);
+
+    // WebSocket 구독을 우선 사용하고, 연결할 수 없으면 폴링으로 대체
+    const watchResult = useCallback((chunkId: string, jobId: string) => {
+        Object.keys(jobChunkIds.current)
+            .filter((prevJobId) => jobChunkIds.current[prevJobId] === chunkId)
+            .forEach((prevJobId) => delete jobChunkIds.current[prevJobId]);
+        jobChunkIds.current[jobId] = chunkId;
+
+        const socket = resultSocket.current;
+        if (socket && socket.isAvailable()) {
+            socket.subscribe([jobId]);
+        } else {
+            pollForResult(jobId);
+        }
+    }, [pollForResult]);
 
     const upload = useCallback(async (chunkId: string, audioUrl: string) => {
         if (!audioUrl) return;
@@ -59,12 +109,21 @@ export const useUploadRecording = () => {
             const blob = await fetch(audioUrl).then((res) => res.blob());
             const filename = `chunk-${chunkId}.webm`;
 
-            const response: UploadResponse = await uploadRecording({ blob, filename }); 
+            if (chunkSeqs.current[chunkId] === undefined) {
+                chunkSeqs.current[chunkId] = Object.keys(chunkSeqs.current).length;
+            }
+            if (chunkUploadKeys.current[chunkId] === undefined) {
+                chunkUploadKeys.current[chunkId] = crypto.randomUUID();
+            }
+            const response: UploadResponse = await uploadRecording({
+                blob, filename, sessionId: sessionId.current, seq: chunkSeqs.current[chunkId],
+                idempotencyKey: chunkUploadKeys.current[chunkId],
+            });
             const jobId = response.job_id;
 
             if (jobId) {
                 setStatuses((prev) => ({ ...prev, [chunkId]: 'processing' }));
-                pollForResult(chunkId, jobId);
+                watchResult(chunkId, jobId);
             } else {
                 throw new Error("서버로부터 Job ID를 받지 못했습니다.");
             }
@@ -74,14 +133,30 @@ export const useUploadRecording = () => {
             setErrors((prev) => ({ ...prev, [chunkId]: errorMessage }));
             setStatuses((prev) => ({ ...prev, [chunkId]: 'failed' }));
         }
-    }, [pollForResult]);
+    }, [watchResult]);
 
     useEffect(() => {
-        const intervals = pollingIntervals.current;
+        const socket = createResultSocket(
+            (result) => {
+                const chunkId = jobChunkIds.current[result.job_id];
+                if (chunkId && applyResult(chunkId, result)) {
+                    delete jobChunkIds.current[result.job_id];
+                }
+            },
+            (pendingJobIds) => {
+                pendingJobIds.forEach((jobId) => {
+                    if (jobChunkIds.current[jobId]) pollForResult(jobId);
+                });
+            },
+        );
+        resultSocket.current = socket;
+
         return () => {
-            Object.values(intervals).forEach(clearInterval);
+            socket.close();
+            resultSocket.current = null;
+            stopPolling();
         };
-    }, []);
+    }, [applyResult, pollForResult, stopPolling]);
 
-    return { upload, transcripts, statuses, errors };
+    return { upload, transcripts, statuses, errors, sessionId: sessionId.current };
 };
\ No newline at end of file
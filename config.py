@@ -24,4 +24,11 @@ class Config:
     REDIS_HOST = os.environ.get('REDIS_HOST') or 'localhost'
     REDIS_PORT = int(os.environ.get('REDIS_PORT') or 6379)
     REDIS_RESULT_DB = int(os.environ.get('REDIS_RESULT_DB') or 2)
-    REDIS_RESULT_EXPIRE_SECONDS = int(os.environ.get('REDIS_RESULT_EXPIRE_SECONDS') or 3600)
\ No newline at end of file
+    REDIS_RESULT_EXPIRE_SECONDS = int(os.environ.get('REDIS_RESULT_EXPIRE_SECONDS') or 3600)
+    # API 프로세스의 비동기 Redis 연결 풀 (워커 프로세스당)
+    REDIS_API_POOL_MAX_CONNECTIONS = int(os.environ.get('REDIS_API_POOL_MAX_CONNECTIONS') or 50)
+    REDIS_API_POOL_TIMEOUT_SECONDS = int(os.environ.get('REDIS_API_POOL_TIMEOUT_SECONDS') or 5) # 풀이 가득 찼을 때 최대 대기 시간
+
+    # 업로드 스트리밍 설정 (GCS resumable 업로드 청크는 256KB의 배수)
+    UPLOAD_CHUNK_SIZE_BYTES = int(os.environ.get('UPLOAD_CHUNK_SIZE_BYTES') or 4 * 1024 * 1024) # 4MB
+    UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES') or 500 * 1024 * 1024) # 500MB
\ No newline at end of file
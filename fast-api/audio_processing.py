@@ -0,0 +1,145 @@
+# audio_processing.py
+# 워커에서 사용하는 오디오 전처리 유틸리티 (ffmpeg/ffprobe CLI 필요)
+import os
+import re
+import shutil
+import subprocess
+import logging
+
+logger = logging.getLogger(__name__)
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+def ffmpeg_available():
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def probe_duration_seconds(file_path):
+    """ffprobe로 오디오 길이(초)를 구합니다. 구할 수 없으면 None."""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", file_path],
+        capture_output=True, text=True, check=False
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        logger.warning(f"ffprobe duration parse failed for {file_path}: {result.stderr.strip()[:200]}")
+        return None
+
+
+def detect_silences(file_path, noise_db, min_silence_seconds):
+    """ffmpeg silencedetect 필터로 무음 구간 [(start, end), ...]을 반환합니다."""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostats", "-i", file_path,
+         "-af", f"silencedetect=noise={noise_db}dB:d={min_silence_seconds}", "-f", "null", "-"],
+        capture_output=True, text=True, check=False
+    )
+    silences = []
+    current_start = None
+    for line in result.stderr.splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            current_start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and current_start is not None:
+            silences.append((current_start, float(end_match.group(1))))
+            current_start = None
+    return silences
+
+
+def plan_split_points(duration_seconds, silences, max_segment_seconds):
+    """무음 구간 중앙을 우선 절단점으로 삼아 max_segment_seconds 이하의 구간 목록 [(start, end), ...]을 만듭니다.
+
+    구간의 후반부(최대 길이의 절반 이후)에 무음이 없으면 최대 길이 지점에서 강제로 자릅니다.
+    """
+    if duration_seconds <= max_segment_seconds:
+        return [(0.0, duration_seconds)]
+
+    candidates = sorted((start + end) / 2 for start, end in silences)
+    segments = []
+    segment_start = 0.0
+    while duration_seconds - segment_start > max_segment_seconds:
+        window_end = segment_start + max_segment_seconds
+        window_start = segment_start + max_segment_seconds / 2
+        in_window = [c for c in candidates if window_start < c <= window_end]
+        cut = in_window[-1] if in_window else window_end
+        segments.append((segment_start, cut))
+        segment_start = cut
+    segments.append((segment_start, duration_seconds))
+    return segments
+
+
+def cut_audio_segment(source_path, output_path, start_seconds, end_seconds):
+    """재인코딩 없이(stream copy) 원본에서 [start, end) 구간을 잘라 output_path에 기록합니다."""
+    subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+         "-ss", f"{start_seconds:.3f}", "-i", source_path,
+         "-t", f"{end_seconds - start_seconds:.3f}", "-vn", "-c", "copy", output_path],
+        capture_output=True, check=True
+    )
+
+
+def decode_to_pcm(audio_file, sample_rate):
+    """오디오 파일 객체를 16-bit mono PCM(bytes)으로 디코딩합니다. 디스크 경로가 있으면 경로로 읽습니다."""
+    file_path = getattr(audio_file, "name", None)
+    command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+               "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "pipe:1"]
+    audio_file.seek(0)
+    if isinstance(file_path, str) and os.path.exists(file_path):
+        command[command.index("pipe:0")] = file_path
+        result = subprocess.run(command, capture_output=True, check=True)
+    else:
+        result = subprocess.run(command, input=audio_file.read(), capture_output=True, check=True)
+    audio_file.seek(0)
+    return result.stdout
+
+
+def encode_pcm(pcm_bytes, sample_rate):
+    """16-bit mono PCM을 Ogg/Opus로 인코딩해 (bytes, 확장자)를 반환합니다. libopus가 없으면 FLAC으로 대체합니다."""
+    input_args = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0"]
+    try:
+        result = subprocess.run(input_args + ["-c:a", "libopus", "-b:a", "24k", "-application", "voip", "-f", "ogg", "pipe:1"],
+                                input=pcm_bytes, capture_output=True, check=True)
+        return result.stdout, ".ogg"
+    except subprocess.CalledProcessError:
+        logger.warning("libopus encoding failed, falling back to FLAC.")
+        result = subprocess.run(input_args + ["-c:a", "flac", "-f", "flac", "pipe:1"], input=pcm_bytes, capture_output=True, check=True)
+        return result.stdout, ".flac"
+
+
+def probe_bit_rate(file_path):
+    """ffprobe로 전체 비트레이트(bps)를 구합니다. 구할 수 없으면 None."""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=bit_rate",
+         "-of", "default=noprint_wrappers=1:nokey=1", file_path],
+        capture_output=True, text=True, check=False
+    )
+    try:
+        return int(float(result.stdout.strip()))
+    except ValueError:
+        return None
+
+
+def transcode_for_stt(source_path, output_base_path, sample_rate, opus_bit_rate):
+    """원본을 mono/sample_rate Ogg/Opus로 변환하고 출력 경로를 반환합니다 (libopus가 없으면 FLAC).
+
+    ffmpeg가 파일을 스트리밍으로 읽고 쓰므로 원본 길이와 관계없이 메모리 사용량은 일정합니다.
+    """
+    input_args = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", "-i", source_path,
+                  "-vn", "-ac", "1", "-ar", str(sample_rate)]
+    output_path = f"{output_base_path}.ogg"
+    try:
+        subprocess.run(input_args + ["-c:a", "libopus", "-b:a", opus_bit_rate, "-application", "voip", output_path],
+                       capture_output=True, check=True)
+        return output_path
+    except subprocess.CalledProcessError:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        logger.warning("libopus encoding failed, falling back to FLAC.")
+    output_path = f"{output_base_path}.flac"
+    subprocess.run(input_args + ["-c:a", "flac", output_path], capture_output=True, check=True)
+    return output_path
@@ -0,0 +1,59 @@
+# batch_upload.py
+# /upload/batch: 한 요청으로 받은 여러 파일(또는 zip/tar 아카이브)을 GCS에 동시 업로드하기 위한 유틸리티
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import mimetypes
+import threading
+
+from config import Config
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+ARCHIVE_ERRORS = (zipfile.BadZipFile, tarfile.TarError)
+
+
+def is_archive(filename):
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def guess_content_type(filename):
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+class ArchiveMembers:
+    """아카이브 안의 일반 파일 목록 [(이름, 크기, 멤버), ...]과 멤버를 꺼내는 extract()를 제공합니다.
+
+    zip/tar 파일 객체는 여러 스레드에서 동시에 읽을 수 없으므로 멤버를 임시 파일로 꺼내는 동안만 잠그고,
+    꺼낸 뒤의 GCS 업로드는 동시에 진행됩니다.
+    """
+
+    def __init__(self, fileobj, filename):
+        self._lock = threading.Lock()
+        self._zip = None
+        self._tar = None
+        if filename.lower().endswith(".zip"):
+            self._zip = zipfile.ZipFile(fileobj)
+            self.members = [(info.filename, info.file_size, info) for info in self._zip.infolist() if not info.is_dir()]
+        else:
+            self._tar = tarfile.open(fileobj=fileobj, mode="r:*")
+            self.members = [(member.name, member.size, member) for member in self._tar.getmembers() if member.isfile()]
+
+    def extract(self, member):
+        spooled = tempfile.SpooledTemporaryFile(max_size=Config.UPLOAD_CHUNK_SIZE_BYTES)
+        with self._lock:
+            source = self._zip.open(member) if self._zip else self._tar.extractfile(member)
+            with source:
+                shutil.copyfileobj(source, spooled, Config.UPLOAD_CHUNK_SIZE_BYTES)
+        spooled.seek(0)
+        return spooled
+
+
+def upload_batch_item(blob, open_source, content_type):
+    """(스레드풀) 파일 하나를 GCS에 업로드합니다. open_source()는 업로드할 파일 객체를 반환합니다."""
+    source = open_source()
+    try:
+        blob.upload_from_file(source, content_type=content_type, rewind=True)
+    finally:
+        if isinstance(source, tempfile.SpooledTemporaryFile):
+            source.close()
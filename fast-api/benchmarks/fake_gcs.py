@@ -0,0 +1,89 @@
+# fake_gcs.py
+# 벤치마크용 파일시스템 기반 GCS 대체 (API 프로세스와 워커 프로세스가 같은 디렉토리를 공유)
+# main.py / tasks.py가 사용하는 storage.Client/Bucket/Blob 메소드만 구현합니다.
+import os
+import shutil
+
+from google.api_core.exceptions import NotFound
+
+
+class _BlobWriter:
+    """blob.open("wb")의 대체. close() 시점에 객체가 보이고, terminate()는 부분 파일을 버립니다."""
+
+    def __init__(self, path):
+        self._path = path
+        self._part_path = f"{path}.part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(self._part_path, "wb")
+
+    def write(self, data):
+        return self._file.write(data)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            os.replace(self._part_path, self._path)
+
+    def terminate(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._part_path):
+            os.remove(self._part_path)
+
+
+class FilesystemBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.path = os.path.join(bucket.root, name)
+
+    def open(self, mode="rb", **kwargs):
+        if mode == "wb":
+            return _BlobWriter(self.path)
+        if not os.path.exists(self.path):
+            raise NotFound(f"gs://{self.bucket.name}/{self.name}")
+        return open(self.path, mode)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def upload_from_string(self, data, content_type=None):
+        writer = _BlobWriter(self.path)
+        writer.write(data.encode() if isinstance(data, str) else data)
+        writer.close()
+
+    def upload_from_filename(self, filename, content_type=None):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        shutil.copyfile(filename, self.path)
+
+    def download_to_file(self, file_obj):
+        with self.open("rb") as src:
+            shutil.copyfileobj(src, file_obj)
+
+    def download_to_filename(self, filename):
+        with self.open("rb") as src, open(filename, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError as e:
+            raise NotFound(f"gs://{self.bucket.name}/{self.name}") from e
+
+
+class FilesystemBucket:
+    def __init__(self, client, name):
+        self.name = name
+        self.root = os.path.join(client.root, name)
+
+    def blob(self, name):
+        return FilesystemBlob(self, name)
+
+
+class FilesystemGCSClient:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def bucket(self, name):
+        return FilesystemBucket(self, name)
@@ -0,0 +1,319 @@
+# run_benchmark.py
+# /upload -> Celery -> /result 전체 경로의 오프라인 부하 테스트
+#
+# 외부 서비스 없이 실행됩니다.
+#   - GCS: 임시 디렉토리 기반 FilesystemGCSClient
+#   - Redis: fakeredis (기본) 또는 --redis-host로 지정한 로컬 Redis
+#   - OpenAI: benchmarks.stub_openai 서버 (지연 시간/오류율 설정 가능, 실제 openai SDK 사용)
+#
+# 기본(fakeredis) 모드는 API와 Celery 워커(threads 풀)를 한 프로세스에서 실행하고,
+# --redis-host 모드는 워커를 별도 프로세스로 띄워 컴포넌트별 최대 RSS를 따로 측정합니다.
+#
+#   cd fast-api
+#   python -m benchmarks.run_benchmark --jobs 200 --concurrency 20 --size-mix 64k:70,1m:25,8m:5
+#   python -m benchmarks.run_benchmark ... --json-out baseline.json
+#   python -m benchmarks.run_benchmark ... --baseline baseline.json   # 기준 대비 변화율 출력
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import logging
+import argparse
+import resource
+import tempfile
+import subprocess
+
+import httpx
+
+TERMINAL_STATUSES = {"Completed", "Failed"}
+SIZE_UNITS = {"k": 1024, "m": 1024 * 1024}
+
+
+def parse_size_mix(spec):
+    """'64k:70,1m:25,8m:5' -> [(65536, 70.0), (1048576, 25.0), (8388608, 5.0)]"""
+    mix = []
+    for item in spec.split(","):
+        size_str, _, weight_str = item.strip().partition(":")
+        unit = SIZE_UNITS.get(size_str[-1].lower(), 1)
+        number = size_str[:-1] if size_str[-1].lower() in SIZE_UNITS else size_str
+        mix.append((int(float(number) * unit), float(weight_str or 1)))
+    return mix
+
+
+def percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 1)}
+
+
+def peak_rss_mb(pid=None):
+    """프로세스의 최대 RSS(MB). Linux에서는 /proc/<pid>/status의 VmHWM을 사용합니다."""
+    try:
+        with open(f"/proc/{pid or os.getpid()}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid is None:
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub_openai(args):
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.stub_openai", "--port", str(port),
+        "--stt-latency-ms", str(args.stt_latency_ms), "--stt-latency-per-mb-ms", str(args.stt_latency_per_mb_ms),
+        "--chat-latency-ms", str(args.chat_latency_ms),
+        "--error-rate", str(args.error_rate), "--server-error-rate", str(args.server_error_rate),
+    ])
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(f"{base_url}/stats", timeout=0.5)
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("OpenAI stub server did not start.")
+
+
+def configure_environment(args, stub_base_url):
+    """config.Config가 import 시점에 환경 변수를 읽으므로 main/tasks import 전에 호출해야 합니다."""
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-benchmark",
+        "OPENAI_BASE_URL": f"{stub_base_url}/v1",
+        "GCS_BUCKET_NAME": "benchmark-bucket",
+        "OPENAI_STT_REQUESTS_PER_MINUTE": str(args.openai_rpm),
+        "OPENAI_CHAT_REQUESTS_PER_MINUTE": str(args.openai_rpm),
+        "OPENAI_RETRY_BASE_DELAY_SECONDS": "0.5",
+        "STT_CACHE_ENABLED": "true" if args.duplicate_ratio > 0 else "false",
+    })
+    if args.redis_host:
+        redis_base = f"redis://{args.redis_host}:{args.redis_port}"
+        os.environ.update({
+            "REDIS_HOST": args.redis_host, "REDIS_PORT": str(args.redis_port),
+            "CELERY_BROKER_URL": f"{redis_base}/0", "CELERY_RESULT_BACKEND": f"{redis_base}/1",
+        })
+    else:
+        os.environ.update({"CELERY_BROKER_URL": "memory://", "CELERY_RESULT_BACKEND": "cache+memory://"})
+
+
+async def run_job(client, index, args, size_mix, payload_pool, records):
+    sizes, weights = zip(*size_mix)
+    size = random.choices(sizes, weights)[0]
+    if payload_pool.get(size) and random.random() < args.duplicate_ratio:
+        payload = payload_pool[size] # 같은 내용 재업로드 (STT 캐시 적중 경로)
+    else:
+        payload = os.urandom(size)
+        payload_pool[size] = payload
+
+    priority = "batch" if random.random() < args.batch_ratio else "interactive"
+    record = {"size": size, "status": None, "priority": priority}
+    started = time.perf_counter()
+    try:
+        response = await client.post("/upload", files={"file": (f"bench_{index}.webm", payload, "audio/webm")}, data={"priority": priority})
+    except httpx.HTTPError as e:
+        record.update(status="UploadError", error=str(e))
+        records.append(record)
+        return
+    record["upload_ms"] = (time.perf_counter() - started) * 1000
+    if response.status_code not in (200, 202):
+        record.update(status="UploadError", error=f"HTTP {response.status_code}")
+        records.append(record)
+        return
+
+    result_key = response.json()["job_id"]
+    stages = [result_key]
+    while stages:
+        key = stages.pop(0)
+        deadline = time.perf_counter() + args.job_timeout
+        while True:
+            result = (await client.get(f"/result/{key}", params={"wait": args.wait} if args.wait else None)).json()
+            if result.get("status") in TERMINAL_STATUSES or time.perf_counter() > deadline:
+                break
+            if not args.wait:
+                await asyncio.sleep(args.poll_interval)
+        status = result.get("status") if result.get("status") in TERMINAL_STATUSES else "Timeout"
+        if key == result_key:
+            record["stt_ms"] = (time.perf_counter() - started) * 1000
+            if args.summarize and status == "Completed":
+                summary_response = await client.post("/summarize", json={"jobId": result_key, "text": result.get("transcription") or "empty", "priority": priority})
+                if summary_response.status_code == 202:
+                    stages.append(summary_response.json()["job_id"])
+        record["status"] = status
+    record["end_to_end_ms"] = (time.perf_counter() - started) * 1000
+    records.append(record)
+
+
+async def drive_load(client, args):
+    size_mix = parse_size_mix(args.size_mix)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    records, payload_pool = [], {}
+
+    async def bounded(index):
+        async with semaphore:
+            await run_job(client, index, args, size_mix, payload_pool, records)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(bounded(i) for i in range(args.jobs)))
+    return records, time.perf_counter() - started
+
+
+def build_report(args, records, wall_seconds, rss, stub_stats):
+    by_status = {}
+    for r in records:
+        by_status[r["status"]] = by_status.get(r["status"], 0) + 1
+    completed = [r for r in records if r["status"] == "Completed"]
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("json_out", "baseline")},
+        "jobs": len(records),
+        "statuses": by_status,
+        "wall_seconds": round(wall_seconds, 2),
+        "jobs_per_second": round(len(completed) / wall_seconds, 2) if wall_seconds else 0.0,
+        "upload_latency_ms": percentiles([r["upload_ms"] for r in records if "upload_ms" in r]),
+        "stt_latency_ms": percentiles([r["stt_ms"] for r in completed if "stt_ms" in r]),
+        "end_to_end_latency_ms": percentiles([r["end_to_end_ms"] for r in completed]),
+        "uploaded_mb": round(sum(r["size"] for r in records) / (1024 * 1024), 1),
+        "peak_rss_mb": rss,
+        "openai_stub": stub_stats,
+    }
+    if args.batch_ratio > 0: # 우선순위별 STT 지연 시간 (batch 부하 중 interactive p95가 유지되는지 확인)
+        for priority in ("interactive", "batch"):
+            report[f"{priority}_stt_latency_ms"] = percentiles([r["stt_ms"] for r in completed if r["priority"] == priority and "stt_ms" in r])
+    return report
+
+
+def print_report(report, baseline=None):
+    print(json.dumps({k: v for k, v in report.items() if k != "config"}, indent=2, ensure_ascii=False))
+    if not baseline:
+        return
+    print("\n--- baseline 대비 ---")
+    rows = [("jobs_per_second", None)]
+    for metric in ("upload_latency_ms", "stt_latency_ms", "end_to_end_latency_ms"):
+        rows += [(metric, p) for p in ("p50", "p95", "p99")]
+    for metric, p in rows:
+        current = report[metric] if p is None else report[metric][p]
+        previous = baseline.get(metric) if p is None else (baseline.get(metric) or {}).get(p)
+        if current is None or not previous:
+            continue
+        name = metric if p is None else f"{metric}.{p}"
+        print(f"{name:32} {previous:>10} -> {current:>10}  ({(current - previous) / previous * 100:+.1f}%)")
+
+
+async def run_in_process(args, gcs_root):
+    """fakeredis + memory 브로커로 API와 워커를 한 프로세스에서 실행합니다."""
+    import fakeredis
+    from celery.contrib.testing.worker import start_worker
+    from benchmarks.fake_gcs import FilesystemGCSClient
+    import main
+    import tasks
+    from config import Config
+    from result_waiter import ResultWaiter
+
+    redis_server = fakeredis.FakeServer()
+    main.redis_client = fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+    main.redis_result_client = fakeredis.FakeAsyncRedis(server=redis_server)
+    main.redis_pubsub_client = fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+    main.result_waiter = ResultWaiter(main.redis_pubsub_client, tasks.RESULT_EVENTS_CHANNEL_PREFIX)
+    main.gcs_bucket = FilesystemGCSClient(gcs_root).bucket(Config.GCS_BUCKET_NAME)
+    tasks.redis_task_client = fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+    tasks.redis_task_binary_client = fakeredis.FakeRedis(server=redis_server)
+    tasks.gcs_task_client = FilesystemGCSClient(gcs_root)
+    tasks.celery_app.conf.broker_transport_options = {"polling_interval": 0.01}
+
+    with start_worker(tasks.celery_app, pool="threads", concurrency=args.worker_concurrency,
+                      perform_ping_check=False, shutdown_timeout=30):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench", timeout=None) as client:
+            records, wall_seconds = await drive_load(client, args)
+    return records, wall_seconds, {"api+worker": peak_rss_mb()}
+
+
+async def run_with_redis(args, gcs_root):
+    """로컬 Redis를 사용하고 워커를 별도 프로세스로 실행합니다."""
+    from benchmarks.fake_gcs import FilesystemGCSClient
+    import main
+    from config import Config
+
+    worker = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.worker_entry", "--gcs-root", gcs_root, "--concurrency", str(args.worker_concurrency),
+    ])
+    try:
+        main.gcs_bucket = FilesystemGCSClient(gcs_root).bucket(Config.GCS_BUCKET_NAME)
+        async with main.app.router.lifespan_context(main.app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench", timeout=None) as client:
+                records, wall_seconds = await drive_load(client, args)
+                pool_stats = (await client.get("/stats/redis-pool")).json()
+        print(f"API Redis pool: {pool_stats}")
+        return records, wall_seconds, {"api": peak_rss_mb(), "worker": peak_rss_mb(worker.pid)}
+    finally:
+        worker.terminate()
+        worker.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark for /upload -> Celery -> /result")
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 진행하는 클라이언트 Job 수")
+    parser.add_argument("--size-mix", default="64k:70,1m:25,8m:5", help="파일 크기:가중치 목록 (k/m 단위)")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="같은 내용을 재업로드하는 비율 (STT 캐시 경로)")
+    parser.add_argument("--summarize", action="store_true", help="STT 완료 후 /summarize까지 수행")
+    parser.add_argument("--batch-ratio", type=float, default=0.0, help="priority=batch로 업로드하는 Job 비율")
+    parser.add_argument("--worker-concurrency", type=int, default=8)
+    parser.add_argument("--poll-interval", type=float, default=0.2)
+    parser.add_argument("--wait", type=float, default=0, help="0보다 크면 /result?wait= 롱 폴링으로 결과 대기 (--poll-interval 대신)")
+    parser.add_argument("--job-timeout", type=float, default=300)
+    parser.add_argument("--openai-rpm", type=int, default=100000, help="워커 속도 제한기의 분당 요청 수 (STT, Chat 각각)")
+    parser.add_argument("--stt-latency-ms", type=float, default=500)
+    parser.add_argument("--stt-latency-per-mb-ms", type=float, default=300)
+    parser.add_argument("--chat-latency-ms", type=float, default=800)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="OpenAI stub의 429 응답 비율")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="OpenAI stub의 500 응답 비율")
+    parser.add_argument("--redis-host", help="지정하면 fakeredis 대신 이 Redis를 사용하고 워커를 별도 프로세스로 실행")
+    parser.add_argument("--redis-port", type=int, default=6379)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json-out", help="결과 리포트를 JSON으로 저장 (다음 실행의 --baseline으로 사용)")
+    parser.add_argument("--baseline", help="비교할 이전 리포트 JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    random.seed(args.seed)
+    stub_process, stub_base_url = start_stub_openai(args)
+    try:
+        configure_environment(args, stub_base_url)
+        with tempfile.TemporaryDirectory(prefix="stt-bench-gcs-") as gcs_root:
+            runner = run_with_redis if args.redis_host else run_in_process
+            records, wall_seconds, rss = asyncio.run(runner(args, gcs_root))
+        stub_stats = httpx.get(f"{stub_base_url}/stats").json()
+        rss["openai_stub"] = peak_rss_mb(stub_process.pid)
+    finally:
+        stub_process.terminate()
+        stub_process.wait(timeout=30)
+
+    report = build_report(args, records, wall_seconds, rss, stub_stats)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
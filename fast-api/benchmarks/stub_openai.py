@@ -0,0 +1,113 @@
+# stub_openai.py
+# 벤치마크용 OpenAI API 대체 서버 (지연 시간/오류율 설정 가능)
+# 워커는 실제 openai SDK를 그대로 사용하고 OPENAI_BASE_URL만 이 서버로 바꿉니다.
+#
+#   python -m benchmarks.stub_openai --port 8765 --stt-latency-ms 800 --error-rate 0.02
+import asyncio
+import argparse
+import random
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+settings = {
+    "stt_latency_ms": 500.0,
+    "stt_latency_per_mb_ms": 300.0,  # 파일 크기에 비례하는 추가 지연 (MB당)
+    "chat_latency_ms": 800.0,
+    "jitter": 0.2,                   # 지연 시간의 ±비율
+    "error_rate": 0.0,               # 429 응답 비율
+    "server_error_rate": 0.0,        # 500 응답 비율
+    "retry_after_seconds": 1,
+}
+stats = {"transcriptions": 0, "chat_completions": 0, "rate_limited": 0, "server_errors": 0}
+
+app = FastAPI(title="OpenAI stub for benchmarks")
+
+
+async def _simulate_latency(base_ms):
+    jitter = settings["jitter"]
+    await asyncio.sleep(max(0.0, base_ms * random.uniform(1 - jitter, 1 + jitter)) / 1000.0)
+
+
+def _maybe_error():
+    roll = random.random()
+    if roll < settings["error_rate"]:
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429, headers={"retry-after": str(settings["retry_after_seconds"])},
+            content={"error": {"message": "Rate limit reached (stub)", "type": "requests", "code": "rate_limit_exceeded"}},
+        )
+    if roll < settings["error_rate"] + settings["server_error_rate"]:
+        stats["server_errors"] += 1
+        return JSONResponse(status_code=500, content={"error": {"message": "Internal error (stub)", "type": "server_error"}})
+    return None
+
+
+@app.post("/v1/audio/transcriptions")
+async def create_transcription(request: Request):
+    form = await request.form()
+    audio_bytes = await form["file"].read()
+    error_response = _maybe_error()
+    if error_response:
+        return error_response
+    await _simulate_latency(settings["stt_latency_ms"] + settings["stt_latency_per_mb_ms"] * len(audio_bytes) / (1024 * 1024))
+    stats["transcriptions"] += 1
+
+    duration = round(len(audio_bytes) / 4000, 2) # 약 32kbps 기준
+    segment_count = max(1, int(duration // 10))
+    segments = [
+        {
+            "id": i, "seek": 0, "start": round(i * duration / segment_count, 2), "end": round((i + 1) * duration / segment_count, 2),
+            "text": f" 벤치마크 구간 {i}", "tokens": [], "temperature": 0.0,
+            "avg_logprob": -0.2, "compression_ratio": 1.2, "no_speech_prob": 0.01,
+        }
+        for i in range(segment_count)
+    ]
+    return {
+        "task": "transcribe", "language": "korean", "duration": duration,
+        "text": "".join(seg["text"] for seg in segments).strip(), "segments": segments,
+    }
+
+
+@app.post("/v1/chat/completions")
+async def create_chat_completion(request: Request):
+    body = await request.json()
+    error_response = _maybe_error()
+    if error_response:
+        return error_response
+    await _simulate_latency(settings["chat_latency_ms"])
+    stats["chat_completions"] += 1
+    prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+    return {
+        "id": f"chatcmpl-stub-{stats['chat_completions']}", "object": "chat.completion", "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "벤치마크 요약입니다."}}],
+        "usage": {"prompt_tokens": prompt_chars, "completion_tokens": 10, "total_tokens": prompt_chars + 10},
+    }
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stt-latency-ms", type=float, default=settings["stt_latency_ms"])
+    parser.add_argument("--stt-latency-per-mb-ms", type=float, default=settings["stt_latency_per_mb_ms"])
+    parser.add_argument("--chat-latency-ms", type=float, default=settings["chat_latency_ms"])
+    parser.add_argument("--jitter", type=float, default=settings["jitter"])
+    parser.add_argument("--error-rate", type=float, default=settings["error_rate"])
+    parser.add_argument("--server-error-rate", type=float, default=settings["server_error_rate"])
+    args = parser.parse_args()
+    for key in ("stt_latency_ms", "stt_latency_per_mb_ms", "chat_latency_ms", "jitter", "error_rate", "server_error_rate"):
+        settings[key] = getattr(args, key)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
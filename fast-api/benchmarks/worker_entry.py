@@ -0,0 +1,24 @@
+# worker_entry.py
+# --redis 모드에서 run_benchmark.py가 별도 프로세스로 띄우는 Celery 워커 (파일시스템 GCS 사용)
+# 환경 변수(CELERY_BROKER_URL, REDIS_HOST, OPENAI_BASE_URL 등)는 부모 프로세스가 설정해 전달합니다.
+import argparse
+
+from benchmarks.fake_gcs import FilesystemGCSClient
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gcs-root", required=True)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    import tasks
+    tasks.gcs_task_client = FilesystemGCSClient(args.gcs_root)
+    tasks.celery_app.worker_main([
+        "worker", "--pool=threads", f"--concurrency={args.concurrency}",
+        "--loglevel=WARNING", "--without-gossip", "--without-mingle", "--without-heartbeat",
+    ])
+
+
+if __name__ == "__main__":
+    main()
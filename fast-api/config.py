@@ -9,14 +9,35 @@ class Config:
     # 이 값들은 Cloud Run 환경 변수 및 워커 VM 환경 변수로 실제 Redis 주소를 제공해야 함
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL') or 'redis://localhost:6379/0'
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND') or 'redis://localhost:6379/1'
+    # 실시간 사용자 요청(interactive)과 대량 백필(batch)을 분리하는 Celery 큐
+    CELERY_INTERACTIVE_QUEUE = os.environ.get('CELERY_INTERACTIVE_QUEUE') or 'stt_interactive'
+    CELERY_BATCH_QUEUE = os.environ.get('CELERY_BATCH_QUEUE') or 'stt_batch'
+    # 큐 분리 이전 버전이 기본 큐('celery')에 남긴 메시지를 계속 처리 (다 비운 뒤 'none'으로 끄고 다음 릴리스에서 제거)
+    CELERY_LEGACY_QUEUE = (os.environ.get('CELERY_LEGACY_QUEUE') or 'celery').lower()
 
     # Google Cloud Storage (GCS) 설정
     GCS_BUCKET_NAME = os.environ.get('GCS_BUCKET_NAME') or 'my-gcp-speech-test-bucket-882341'
     # GOOGLE_APPLICATION_CREDENTIALS 환경 변수는 GCS 접근에 필요 (VM에서는 서비스 계정 권한으로 대체 가능)
 
-    # STT 서비스 (OpenAI Whisper API 사용 기준)
+    # STT 서비스 - 'openai_whisper_api' 또는 'faster_whisper'(워커 로컬 CPU 엔진)
+    # 캐시 키가 엔진/모델을 포함하므로 API와 워커에 같은 값을 설정해야 합니다.
     STT_SERVICE_PROVIDER = os.environ.get('STT_SERVICE_PROVIDER') or 'openai_whisper_api'
     STT_LANGUAGE_CODE = os.environ.get('STT_LANGUAGE_CODE') or 'ko'
+    STT_MODEL = os.environ.get('STT_MODEL') or 'whisper-1'
+
+    # faster-whisper(CTranslate2) 로컬 엔진 설정 (STT_SERVICE_PROVIDER=faster_whisper 일 때)
+    # 모델은 워커 프로세스마다 메모리에 올라가므로 celery --concurrency × 모델 크기를 고려해야 합니다.
+    WHISPER_MODEL_SIZE = os.environ.get('WHISPER_MODEL_SIZE') or 'small'
+    WHISPER_DEVICE = os.environ.get('WHISPER_DEVICE') or 'cpu'
+    WHISPER_COMPUTE_TYPE = os.environ.get('WHISPER_COMPUTE_TYPE') or 'int8'
+    WHISPER_CPU_THREADS = int(os.environ.get('WHISPER_CPU_THREADS') or 0) # 0이면 CTranslate2 기본값
+    WHISPER_BEAM_SIZE = int(os.environ.get('WHISPER_BEAM_SIZE') or 5)
+    WHISPER_DOWNLOAD_ROOT = os.environ.get('WHISPER_DOWNLOAD_ROOT') # 모델 캐시 디렉토리 (기본: HuggingFace 캐시)
+
+    # STT 결과 캐시 (오디오 SHA-256 + 모델 + 언어 기준, 동일 파일 재업로드 시 Whisper 호출 생략)
+    STT_CACHE_ENABLED = (os.environ.get('STT_CACHE_ENABLED') or 'true').lower() == 'true'
+    STT_CACHE_TTL_SECONDS = int(os.environ.get('STT_CACHE_TTL_SECONDS') or 7 * 24 * 3600) # 7일 (적중 시 연장)
+    STT_CACHE_MAX_ENTRIES = int(os.environ.get('STT_CACHE_MAX_ENTRIES') or 10000)
 
     # OpenAI API 키 설정
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY') # Cloud Run/VM 환경 변수로 제공
@@ -27,21 +48,101 @@ class Config:
     REDIS_PORT = int(os.environ.get('REDIS_PORT') or 6379)
     REDIS_DB_FOR_RESULTS = int(os.environ.get('REDIS_DB_FOR_RESULTS') or 2) # Celery Broker/Backend DB와 다른 번호 사용 권장
     REDIS_RESULT_EXPIRE_SECONDS = int(os.environ.get('REDIS_RESULT_EXPIRE_SECONDS') or 3600) # 1시간
+    # 작업 결과 저장 형식: 'msgpack'(msgpack + 큰 결과는 zstd 압축) 또는 'json'
+    RESULT_CODEC = (os.environ.get('RESULT_CODEC') or 'msgpack').lower()
+    RESULT_COMPRESS_MIN_BYTES = int(os.environ.get('RESULT_COMPRESS_MIN_BYTES') or 1024) # 이보다 작은 결과는 압축하지 않음
+    RESULT_ZSTD_LEVEL = int(os.environ.get('RESULT_ZSTD_LEVEL') or 3)
+    # API 프로세스의 비동기 Redis 연결 풀 (워커 프로세스당)
+    REDIS_API_POOL_MAX_CONNECTIONS = int(os.environ.get('REDIS_API_POOL_MAX_CONNECTIONS') or 50)
+    REDIS_API_POOL_TIMEOUT_SECONDS = int(os.environ.get('REDIS_API_POOL_TIMEOUT_SECONDS') or 5) # 풀이 가득 찼을 때 최대 대기 시간
+
+    # 청크 녹음 세션 (/upload의 session_id + seq) 전사본 보관 기간
+    STT_SESSION_EXPIRE_SECONDS = int(os.environ.get('STT_SESSION_EXPIRE_SECONDS') or 6 * 3600) # 6시간 (청크 추가 시 연장)
+    # /upload의 Idempotency-Key 보관 기간 (이 시간 안의 같은 키 재시도는 처음 만든 Job을 반환)
+    IDEMPOTENCY_KEY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_KEY_TTL_SECONDS') or 24 * 3600)
+
+    # 업로드 스트리밍 설정 (/upload 요청당 메모리 사용량을 청크 크기로 제한)
+    # GCS resumable 업로드 청크는 256KB의 배수여야 합니다.
+    UPLOAD_CHUNK_SIZE_BYTES = int(os.environ.get('UPLOAD_CHUNK_SIZE_BYTES') or 4 * 1024 * 1024) # 4MB
+    UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES') or 500 * 1024 * 1024) # 500MB
+    BATCH_UPLOAD_MAX_FILES = int(os.environ.get('BATCH_UPLOAD_MAX_FILES') or 1000) # /upload/batch 한 요청의 최대 파일 수 (아카이브 내부 파일 포함)
+    BATCH_UPLOAD_CONCURRENCY = int(os.environ.get('BATCH_UPLOAD_CONCURRENCY') or 8) # /upload/batch의 동시 GCS 업로드 수
+    RESULTS_BATCH_MAX_IDS = int(os.environ.get('RESULTS_BATCH_MAX_IDS') or 500) # POST /results 한 요청의 최대 Job 수
+    RESULT_LONG_POLL_MAX_SECONDS = int(os.environ.get('RESULT_LONG_POLL_MAX_SECONDS') or 60) # GET /result?wait= 의 최대 대기 시간
+
+    # 긴 오디오 분할(fan-out) 설정 - 워커에 ffmpeg/ffprobe가 설치되어 있어야 동작
+    STT_SPLIT_ENABLED = (os.environ.get('STT_SPLIT_ENABLED') or 'true').lower() == 'true'
+    STT_MAX_UPLOAD_BYTES = int(os.environ.get('STT_MAX_UPLOAD_BYTES') or 24 * 1024 * 1024) # Whisper API 한도(25MB)보다 약간 작게
+    STT_SPLIT_MIN_DURATION_SECONDS = int(os.environ.get('STT_SPLIT_MIN_DURATION_SECONDS') or 900) # 이보다 긴 오디오만 분할
+    STT_SPLIT_TARGET_SEGMENT_SECONDS = int(os.environ.get('STT_SPLIT_TARGET_SEGMENT_SECONDS') or 300)
+    STT_SPLIT_SILENCE_NOISE_DB = int(os.environ.get('STT_SPLIT_SILENCE_NOISE_DB') or -30)
+    STT_SPLIT_SILENCE_MIN_SECONDS = float(os.environ.get('STT_SPLIT_SILENCE_MIN_SECONDS') or 0.5)
+    # 이 크기 미만의 파일은 분할 검사/트랜스코딩 없이 임시 파일 대신 메모리 버퍼로 바로 Whisper에 전송
+    # (약 32kbps webm 기준 15분 ≈ 3.6MB 이므로 분할 최소 길이보다 충분히 작게 설정)
+    STT_SPLIT_PROBE_MIN_BYTES = int(os.environ.get('STT_SPLIT_PROBE_MIN_BYTES') or 2 * 1024 * 1024)
+    # 워커 다운로드 버퍼: 이 크기까지는 메모리, 초과분은 디스크(SpooledTemporaryFile)
+    STT_INMEMORY_BUFFER_MAX_BYTES = int(os.environ.get('STT_INMEMORY_BUFFER_MAX_BYTES') or 8 * 1024 * 1024)
+    WORKER_METRICS_PORT = int(os.environ.get('WORKER_METRICS_PORT') or 0) # Celery 워커 Prometheus exporter 포트 (0이면 비활성)
+    # 분산 트레이싱 (OpenTelemetry): 'none' | 'otlp'(OTEL_EXPORTER_OTLP_ENDPOINT의 로컬 collector, 기본 http://localhost:4318) | 'file'
+    TRACING_EXPORTER = (os.environ.get('TRACING_EXPORTER') or 'none').lower()
+    TRACING_FILE_PATH = os.environ.get('TRACING_FILE_PATH') or 'stt-traces.jsonl' # 'file'일 때 span을 한 줄에 하나씩(JSON) 추가
+    TRACING_SAMPLE_RATIO = float(os.environ.get('TRACING_SAMPLE_RATIO') or 1.0) # 새 trace를 시작하는 비율 (부모가 있으면 부모를 따름)
+
+    # 작은 업로드는 GCS를 거치지 않고 Redis(결과 DB)에 짧은 TTL로 담아 워커에 전달 (0이면 비활성화)
+    STT_INLINE_AUDIO_MAX_BYTES = int(os.environ.get('STT_INLINE_AUDIO_MAX_BYTES') or 1024 * 1024) # 1MB (60초 webm 청크 수백 KB)
+    STT_INLINE_AUDIO_TTL_SECONDS = int(os.environ.get('STT_INLINE_AUDIO_TTL_SECONDS') or 600)
+
+    # 워커에서 비압축/고비트레이트 오디오(wav, 스테레오 flac 등)를 16kHz mono Opus로 변환 후 STT/분할 진행
+    # (STT_SPLIT_PROBE_MIN_BYTES 이상인 파일 대상, 비트레이트가 STT_TRANSCODE_SKIP_BIT_RATE 이하이면 생략)
+    STT_TRANSCODE_ENABLED = (os.environ.get('STT_TRANSCODE_ENABLED') or 'true').lower() == 'true'
+    STT_TRANSCODE_SKIP_BIT_RATE = int(os.environ.get('STT_TRANSCODE_SKIP_BIT_RATE') or 64000) # bps
+    STT_TRANSCODE_SAMPLE_RATE = int(os.environ.get('STT_TRANSCODE_SAMPLE_RATE') or 16000)
+    STT_TRANSCODE_OPUS_BIT_RATE = os.environ.get('STT_TRANSCODE_OPUS_BIT_RATE') or '24k'
+
+    # VAD(음성 구간 검출)로 무음을 잘라낸 뒤 STT 엔진에 전송 - 워커에 ffmpeg 필요
+    STT_VAD_ENABLED = (os.environ.get('STT_VAD_ENABLED') or 'false').lower() == 'true'
+    STT_VAD_FRAME_MS = int(os.environ.get('STT_VAD_FRAME_MS') or 30)
+    STT_VAD_THRESHOLD_DB = float(os.environ.get('STT_VAD_THRESHOLD_DB') or 12) # 잡음 수준보다 이만큼 크면 음성으로 판단
+    STT_VAD_MIN_ENERGY_DBFS = float(os.environ.get('STT_VAD_MIN_ENERGY_DBFS') or -50) # 이보다 작은 에너지는 항상 무음
+    STT_VAD_PADDING_MS = int(os.environ.get('STT_VAD_PADDING_MS') or 300) # 음성 앞뒤로 남겨 둘 여유
+    STT_VAD_MIN_SILENCE_MS = int(os.environ.get('STT_VAD_MIN_SILENCE_MS') or 600) # 이보다 짧은 무음은 제거하지 않음
+    STT_VAD_MIN_TRIM_RATIO = float(os.environ.get('STT_VAD_MIN_TRIM_RATIO') or 0.1) # 제거할 무음이 이 비율 미만이면 원본 전송 (재인코딩 생략)
+
+    # OpenAI 호출 속도 제한 (모든 워커가 Redis 토큰 버킷을 공유, 0이면 해당 한도 비활성화)
+    # 조직 쿼터보다 약간 낮게 잡아 429 응답 자체를 피하는 것이 목적
+    OPENAI_STT_REQUESTS_PER_MINUTE = int(os.environ.get('OPENAI_STT_REQUESTS_PER_MINUTE') or 50)
+    OPENAI_STT_AUDIO_SECONDS_PER_MINUTE = int(os.environ.get('OPENAI_STT_AUDIO_SECONDS_PER_MINUTE') or 0)
+    OPENAI_CHAT_REQUESTS_PER_MINUTE = int(os.environ.get('OPENAI_CHAT_REQUESTS_PER_MINUTE') or 500)
+    OPENAI_CHAT_TOKENS_PER_MINUTE = int(os.environ.get('OPENAI_CHAT_TOKENS_PER_MINUTE') or 200000)
+    # 오디오 길이/토큰 수 추정치 (정확한 값은 호출 전에 알 수 없으므로 크기 기반으로 추정)
+    STT_ESTIMATED_BYTES_PER_SECOND = int(os.environ.get('STT_ESTIMATED_BYTES_PER_SECOND') or 4000) # 약 32kbps webm/opus
+    CHAT_ESTIMATED_CHARS_PER_TOKEN = float(os.environ.get('CHAT_ESTIMATED_CHARS_PER_TOKEN') or 1.0) # 한국어는 대략 1글자 ≈ 1토큰
+    # 워커가 버킷 용량을 기다리는 최대 시간. 넘으면 작업을 재시도 큐로 돌려 워커를 점유하지 않음
+    OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.environ.get('OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS') or 30)
+    # 429/일시적 오류 재시도 (지터가 들어간 지수 백오프)
+    OPENAI_MAX_RETRIES = int(os.environ.get('OPENAI_MAX_RETRIES') or 5)
+    OPENAI_RETRY_BASE_DELAY_SECONDS = float(os.environ.get('OPENAI_RETRY_BASE_DELAY_SECONDS') or 2)
+    OPENAI_RETRY_MAX_DELAY_SECONDS = float(os.environ.get('OPENAI_RETRY_MAX_DELAY_SECONDS') or 120)
 
     # --- [신규 추가] 요약용 모델 및 프롬프트 ---
     SUMMARY_MODEL = os.environ.get('SUMMARY_MODEL') or 'gpt-3.5-turbo' # 또는 'gpt-4o' 등
     SUMMARY_PROMPT = os.environ.get('SUMMARY_PROMPT') or 'You are an assistant who summarizes the given text concisely into key points.'
+    SUMMARY_TEMPERATURE = float(os.environ.get('SUMMARY_TEMPERATURE') or 0.5)
+    # 긴 텍스트는 윈도우별로 병렬 요약(map) 후 합쳐서 다시 요약(reduce)
+    SUMMARY_WINDOW_TOKENS = int(os.environ.get('SUMMARY_WINDOW_TOKENS') or 3000) # 이보다 짧은 텍스트는 한 번에 요약
+    SUMMARY_WINDOW_PROMPT = os.environ.get('SUMMARY_WINDOW_PROMPT') or 'You are an assistant who summarizes one part of a longer transcript. Keep every key point, decision and action item, concisely.'
+    SUMMARY_PART_CACHE_TTL_SECONDS = int(os.environ.get('SUMMARY_PART_CACHE_TTL_SECONDS') or 7 * 24 * 3600) # 윈도우별 부분 요약 캐시
+    SUMMARY_MAX_MERGE_LEVELS = int(os.environ.get('SUMMARY_MAX_MERGE_LEVELS') or 3)
+    # 완료된 요약 캐시 (같은 텍스트/모델/프롬프트 재요청 시 GPT 호출 없이 즉시 200 응답)
+    SUMMARY_CACHE_ENABLED = (os.environ.get('SUMMARY_CACHE_ENABLED') or 'true').lower() == 'true'
+    SUMMARY_CACHE_TTL_SECONDS = int(os.environ.get('SUMMARY_CACHE_TTL_SECONDS') or 7 * 24 * 3600) # 7일 (적중 시 연장)
+    SUMMARY_CACHE_MAX_BYTES = int(os.environ.get('SUMMARY_CACHE_MAX_BYTES') or 32 * 1024 * 1024) # 초과 시 LRU 제거
 
     # (참고) 이전 Google STT 사용 시 설정 (주석 처리 또는 STT_SERVICE_PROVIDER 값에 따라 분기)
     # AUDIO_ENCODING_FOR_STT = 'OGG_OPUS'
     # AUDIO_SAMPLE_RATE_FOR_STT = 48000
     # AUDIO_CHANNEL_COUNT_FOR_STT = 1
 
-    # (참고) 이전 Fast Whisper 자체 호스팅 시 설정 (주석 처리)
-    # WHISPER_MODEL_SIZE = os.environ.get('WHISPER_MODEL_SIZE', 'base')
-    # WHISPER_DEVICE = os.environ.get('WHISPER_DEVICE', 'cpu')
-    # WHISPER_COMPUTE_TYPE = os.environ.get('WHISPER_COMPUTE_TYPE', 'int8')
-
 
 # --- 환경 변수 값 주입의 중요성 ---
 # 위 or 'localhost' 같은 기본값은 로컬 개발 환경용입니다.
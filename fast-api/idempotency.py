@@ -0,0 +1,56 @@
+# idempotency.py
+# /upload의 Idempotency-Key 헤더 처리 (클라이언트 재시도 시 같은 Job을 돌려주어 GCS 업로드/Whisper 호출 중복 방지)
+#
+#   stt_idempotency:upload:{key}  JSON {"request_hash", "job_id"} - SET NX로 먼저 예약하고,
+#                                 응답을 만든 뒤 {"status_code", "response"}를 더해 덮어씀 (TTL 유지)
+#
+# 예약은 작업을 시작하기 전에 원자적으로 이루어지므로, 동시에 들어온 중복 요청도 먼저 예약한 요청의 job_id 하나로 모입니다.
+import re
+import json
+import hashlib
+
+from config import Config
+
+IDEMPOTENCY_KEY_PREFIX = "stt_idempotency"
+IDEMPOTENCY_KEY_PATTERN = re.compile(r"^[\x21-\x7e]{1,255}$") # 공백 없는 출력 가능한 ASCII (UUID 권장)
+
+# 값이 그대로일 때만 삭제 (예약한 요청이 실패했을 때 다른 요청이 새로 예약한 값을 지우지 않도록)
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def idempotency_key(scope, key):
+    return f"{IDEMPOTENCY_KEY_PREFIX}:{scope}:{key}"
+
+
+def build_request_hash(*parts):
+    """요청 본문(오디오 해시와 폼 필드)을 하나의 해시로 만듭니다. 같은 키가 다른 본문에 재사용되었는지 확인하는 데 사용합니다."""
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+async def reserve_idempotency_key(redis_conn, redis_key, request_hash, job_id):
+    """(API, 비동기) 키를 job_id로 예약합니다. 예약에 성공하면 (True, 예약 값), 이미 있으면 (False, 기존 값)을 반환합니다."""
+    record = json.dumps({"request_hash": request_hash, "job_id": job_id})
+    if await redis_conn.set(redis_key, record, nx=True, ex=Config.IDEMPOTENCY_KEY_TTL_SECONDS):
+        return True, record
+    existing = await redis_conn.get(redis_key)
+    if existing is None: # 조회 직전에 만료/해제됨: 한 번 더 예약 시도
+        if await redis_conn.set(redis_key, record, nx=True, ex=Config.IDEMPOTENCY_KEY_TTL_SECONDS):
+            return True, record
+        existing = await redis_conn.get(redis_key) or record
+    return False, existing
+
+
+async def store_idempotent_response(redis_conn, redis_key, reserved_record, status_code, response_content):
+    """(API, 비동기) 예약한 키에 최초 응답을 기록합니다. 이후 같은 요청에는 이 응답을 그대로 돌려줍니다."""
+    record = {**json.loads(reserved_record), "status_code": status_code, "response": response_content}
+    await redis_conn.set(redis_key, json.dumps(record), xx=True, keepttl=True)
+
+
+async def release_idempotency_key(redis_conn, redis_key, reserved_record):
+    """(API, 비동기) 작업을 시작하지 못한 예약을 해제하여 클라이언트가 같은 키로 다시 시도할 수 있게 합니다."""
+    await redis_conn.eval(RELEASE_SCRIPT, 1, redis_key, reserved_record)
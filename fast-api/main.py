@@ -1,17 +1,35 @@
 # main.py
-from fastapi import FastAPI, Request, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, File, Form, Header, Query, UploadFile, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from typing import List, Optional
 import os
 import uuid
-import redis
+import asyncio
+import functools
+import redis.asyncio as aioredis
 import json
+import hashlib
 import logging
+from contextlib import asynccontextmanager
 
 from config import Config
 # 두 가지 작업을 모두 임포트
-from tasks import process_audio_with_openai_whisper_task, summarize_text_with_gpt_task
+from tasks import process_audio_with_openai_whisper_task, summarize_text_with_gpt_task, RESULT_EVENTS_CHANNEL_PREFIX, TRANSCODE_STATS_KEY
+from tasks import celery_app, CONSUMED_QUEUES, PRIORITY_INTERACTIVE, PRIORITY_BATCH, TASK_PRIORITIES, task_queue_options
+from stt_cache import build_cache_key, get_cached_transcription, get_cache_stats
+from summary_cache import build_summary_cache_key, get_cached_summary, get_summary_cache_stats
+from stt_session import SESSION_ID_PATTERN, queue_session_job, queue_session_result, get_session_transcript
+from idempotency import IDEMPOTENCY_KEY_PATTERN, idempotency_key, build_request_hash, reserve_idempotency_key, store_idempotent_response, release_idempotency_key
+from redis_pool import create_api_redis_client
+from result_codec import encode_result, decode_result, queue_result_size_stats, get_result_codec_stats
+from result_waiter import ResultWaiter
+from stt_segments import segments_key, split_result_segments, queue_segments, select_time_range, get_segments
+from metrics import STAGE_SECONDS, AUDIO_BYTES, METRICS_CONTENT_TYPE, render_metrics
+from tracing import init_tracing, start_span, start_http_span, record_http_response, set_span_attributes
+from batch_upload import ARCHIVE_ERRORS, ArchiveMembers, is_archive, guess_content_type, upload_batch_item
 
 from google.cloud import storage as gcs_storage
 from google.auth.exceptions import DefaultCredentialsError
@@ -21,7 +39,47 @@ from werkzeug.utils import secure_filename
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: [%(asctime)s] %(name)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Agent Backend API")
+redis_client = None          # /upload, /summarize, /result 등이 공유하는 크기 제한 풀
+redis_result_client = None   # 작업 결과(stt_result:*) 읽기 전용 - 결과는 바이너리(msgpack/zstd)로 저장되므로 decode_responses=False
+redis_pubsub_client = None   # pub/sub 구독(/ws/results) 전용 - 장시간 점유하는 연결이 공유 풀을 고갈시키지 않도록 분리
+redis_broker_client = None   # /metrics의 Celery 큐 길이 조회용 (브로커가 Redis일 때만)
+result_waiter = None         # /result?wait= 롱 폴링 - 프로세스당 pub/sub 연결 하나를 공유
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global redis_client, redis_result_client, redis_pubsub_client, redis_broker_client, result_waiter
+    init_tracing("stt-api")
+    redis_client = create_api_redis_client(Config.REDIS_DB_FOR_RESULTS)
+    redis_result_client = create_api_redis_client(Config.REDIS_DB_FOR_RESULTS, decode_responses=False)
+    if Config.CELERY_BROKER_URL.startswith(("redis://", "rediss://")):
+        redis_broker_client = aioredis.from_url(Config.CELERY_BROKER_URL)
+    redis_pubsub_client = aioredis.Redis(
+        host=Config.REDIS_HOST, port=Config.REDIS_PORT, db=Config.REDIS_DB_FOR_RESULTS, decode_responses=True
+    )
+    result_waiter = ResultWaiter(redis_pubsub_client, RESULT_EVENTS_CHANNEL_PREFIX)
+    try:
+        await redis_client.ping()
+        logger.info(f"Redis (for results on db {Config.REDIS_DB_FOR_RESULTS}) connected. Pool size: {Config.REDIS_API_POOL_MAX_CONNECTIONS}")
+    except Exception as e:
+        logger.error(f"Redis (for results) 연결 오류: {e}", exc_info=True)
+    yield
+    await result_waiter.close()
+    await redis_client.aclose()
+    await redis_result_client.aclose()
+    await redis_pubsub_client.aclose()
+    if redis_broker_client:
+        await redis_broker_client.aclose()
+
+app = FastAPI(title="AI Agent Backend API", lifespan=lifespan)
+
+@app.middleware("http")
+async def trace_http_request(request: Request, call_next):
+    # 요청 span 안에서 발행한 Celery 작업은 메시지 헤더로 이 span을 부모로 전달받음
+    with start_http_span(request.method, request.url.path, request.headers):
+        response = await call_next(request)
+        route = request.scope.get("route")
+        record_http_response(request.method, getattr(route, "path", None), response.status_code)
+        return response
 
 origins = [
     "http://localhost:3000",
@@ -33,6 +91,7 @@ origins = [
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+    expose_headers=["ETag"], # /result 조건부 요청(If-None-Match)용
 )
 
 app.add_middleware(
@@ -56,25 +115,76 @@ if Config.GCS_BUCKET_NAME:
 else:
     logger.warning("GCS_BUCKET_NAME이 설정되지 않았습니다.")
 
-redis_client = None
-try:
-    redis_client = redis.Redis(
-        host=Config.REDIS_HOST, port=Config.REDIS_PORT, db=Config.REDIS_DB_FOR_RESULTS, decode_responses=True
-    )
-    redis_client.ping()
-    logger.info(f"Redis (for results on db {Config.REDIS_DB_FOR_RESULTS}) connected.")
-except Exception as e:
-    logger.error(f"Redis (for results) 연결 오류: {e}", exc_info=True)
+TERMINAL_STATUSES = {"Completed", "Failed"}
 
 ALLOWED_EXTENSIONS = {'webm', 'wav', 'ogg', 'mp3', 'm4a'}
 
 def allowed_file(filename: str):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+async def stream_upload_to_gcs(upload_file: UploadFile, blob, content_type: str):
+    """UploadFile을 고정 크기 청크로 읽어 GCS resumable 업로드로 전송하고, 업로드된 바이트 수를 반환합니다.
+
+    요청당 메모리는 청크 크기로 제한되며, GCS 호출은 스레드풀에서 실행되어 이벤트 루프를 막지 않습니다.
+    최대 크기를 넘으면 업로드 세션을 취소하고 413을 발생시킵니다.
+    """
+    chunk = await upload_file.read(Config.UPLOAD_CHUNK_SIZE_BYTES)
+    if not chunk:
+        raise HTTPException(status_code=400, detail="업로드된 파일이 비어있습니다.")
+
+    writer = await run_in_threadpool(
+        blob.open, "wb", chunk_size=Config.UPLOAD_CHUNK_SIZE_BYTES, content_type=content_type
+    )
+    total_bytes = 0
+    try:
+        while chunk:
+            total_bytes += len(chunk)
+            if total_bytes > Config.UPLOAD_MAX_BYTES:
+                raise HTTPException(status_code=413, detail=f"파일 크기가 최대 허용치({Config.UPLOAD_MAX_BYTES} bytes)를 초과했습니다.")
+            await run_in_threadpool(writer.write, chunk)
+            chunk = await upload_file.read(Config.UPLOAD_CHUNK_SIZE_BYTES)
+        await run_in_threadpool(writer.close)
+    except BaseException:
+        # 완료되지 않은 resumable 세션은 취소하여 부분 객체가 남지 않도록 함
+        await run_in_threadpool(writer.terminate)
+        raise
+    return total_bytes
+
+async def hash_upload_file(upload_file: UploadFile):
+    """UploadFile 전체를 청크 단위로 읽어 SHA-256 해시를 계산한 뒤 파일 위치를 처음으로 되돌립니다.
+
+    UploadFile은 임시 파일(spooled)에 저장되어 있으므로 두 번 읽어도 메모리 사용량은 청크 크기로 제한됩니다.
+    """
+    hasher = hashlib.sha256()
+    total_bytes = 0
+    while chunk := await upload_file.read(Config.UPLOAD_CHUNK_SIZE_BYTES):
+        total_bytes += len(chunk)
+        if total_bytes > Config.UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"파일 크기가 최대 허용치({Config.UPLOAD_MAX_BYTES} bytes)를 초과했습니다.")
+        await run_in_threadpool(hasher.update, chunk)
+    if total_bytes == 0:
+        raise HTTPException(status_code=400, detail="업로드된 파일이 비어있습니다.")
+    await upload_file.seek(0)
+    return hasher.hexdigest()
+
+async def read_small_upload(upload_file: UploadFile):
+    """파일이 STT_INLINE_AUDIO_MAX_BYTES 이하이면 전체 바이트를, 더 크면 None을 반환합니다 (읽은 뒤 위치는 처음으로 되돌림)."""
+    data = await upload_file.read(Config.STT_INLINE_AUDIO_MAX_BYTES + 1)
+    await upload_file.seek(0)
+    if not data:
+        raise HTTPException(status_code=400, detail="업로드된 파일이 비어있습니다.")
+    if len(data) > Config.STT_INLINE_AUDIO_MAX_BYTES:
+        return None
+    return data
+
 # --- Pydantic 모델 정의 ---
 class SummarizeRequest(BaseModel):
     jobId: str # STT 작업의 원래 Job ID
     text: str
+    priority: str = PRIORITY_INTERACTIVE # "interactive" | "batch"
+
+class ResultsRequest(BaseModel):
+    job_ids: List[str] # /result/{job_id_key}와 같은 형식 ("job123", "summary:job123")
 
 # --- API 엔드포인트 정의 ---
 @app.get("/", tags=["Status"])
@@ -82,42 +192,412 @@ async def read_root():
     return {"status": "ok", "message": "AI Agent Backend is running."}
 
 @app.post("/upload", name="upload_and_process_file", tags=["STT"])
-async def upload_and_process_file(file: UploadFile = File(...)):
+async def upload_and_process_file(
+    file: UploadFile = File(...),
+    session_id: Optional[str] = Form(None), # 청크 녹음 세션 ID - seq와 함께 보내면 /session/{session_id}로 모아서 조회
+    seq: Optional[int] = Form(None),        # 세션 내 청크 순서
+    priority: str = Form(PRIORITY_INTERACTIVE), # "interactive"(실시간 사용자) | "batch"(보관 녹음 백필 등 - 남는 워커 용량으로 처리)
+    idempotency_key_header: Optional[str] = Header(None, alias="Idempotency-Key"), # 재시도 시 같은 값을 보내면 처음 만든 Job을 그대로 반환
+):
     # ... (이전 #58 답변의 /upload 라우트 내용과 거의 동일, Celery 작업 함수 이름만 확인) ...
     if not gcs_bucket or not redis_client:
         raise HTTPException(status_code=503, detail="백엔드 서비스가 준비되지 않았습니다.")
     
     if not file or not file.filename:
         raise HTTPException(status_code=400, detail="파일이 선택되지 않았습니다.")
+
+    if (session_id is None) != (seq is None) or (session_id is not None and (not SESSION_ID_PATTERN.match(session_id) or seq < 0)):
+        raise HTTPException(status_code=400, detail="session_id(영문/숫자/-/_ 64자 이내)와 seq(0 이상의 정수)는 함께 전달해야 합니다.")
+
+    if priority not in TASK_PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority는 {', '.join(TASK_PRIORITIES)} 중 하나여야 합니다.")
+
+    if idempotency_key_header is not None and not IDEMPOTENCY_KEY_PATTERN.match(idempotency_key_header):
+        raise HTTPException(status_code=400, detail="Idempotency-Key는 공백 없는 ASCII 문자 255자 이내여야 합니다.")
     
     original_filename_secured = secure_filename(file.filename)
     if not allowed_file(original_filename_secured):
         raise HTTPException(status_code=400, detail=f"허용되지 않는 파일 형식입니다: {original_filename_secured}")
 
+    audio_sha256 = await hash_upload_file(file) if Config.STT_CACHE_ENABLED or idempotency_key_header else None
     job_id = uuid.uuid4().hex
-    gcs_object_name = f"audio_uploads/{job_id}/{original_filename_secured}"
+    session_fields = {"session_id": session_id, "seq": seq} if session_id else {}
+    if not idempotency_key_header:
+        return await start_upload_job(file, job_id, original_filename_secured, session_id, seq, priority, audio_sha256)
 
+    # 같은 키가 먼저 예약되어 있으면 (처리 중이더라도) 그 Job을 돌려주고 아무 작업도 하지 않음
+    redis_key = idempotency_key("upload", idempotency_key_header)
+    request_hash = build_request_hash(audio_sha256, original_filename_secured, session_id, seq, priority)
+    reserved, record = await reserve_idempotency_key(redis_client, redis_key, request_hash, job_id)
+    if not reserved:
+        return idempotent_replay_response(record, request_hash, session_fields)
+
+    try:
+        response = await start_upload_job(file, job_id, original_filename_secured, session_id, seq, priority, audio_sha256)
+    except BaseException:
+        # 재시도할 수 있도록 예약을 해제하고, 그사이 같은 Job을 받아 간 중복 요청에는 실패 결과를 남김
+        try:
+            await release_idempotency_key(redis_client, redis_key, record)
+            await redis_client.setex(f"stt_result:{job_id}", Config.REDIS_RESULT_EXPIRE_SECONDS,
+                                     encode_result({"status": "Failed", "error": "업로드 처리 중 오류가 발생했습니다."}))
+        except Exception as e:
+            logger.error(f"Job {job_id}: Failed to release idempotency key: {e}", exc_info=True)
+        raise
     try:
-        contents = await file.read()
-        if not contents: raise HTTPException(status_code=400, detail="업로드된 파일이 비어있습니다.")
+        await store_idempotent_response(redis_client, redis_key, record, response.status_code, json.loads(response.body))
+    except Exception as e: # 예약 값(job_id)은 남아 있으므로 재시도는 여전히 같은 Job으로 모임
+        logger.error(f"Job {job_id}: Failed to store idempotent response: {e}", exc_info=True)
+    return response
 
-        blob = gcs_bucket.blob(gcs_object_name)
-        blob.upload_from_string(contents, content_type=file.content_type)
-        logger.info(f"Job {job_id}: File '{original_filename_secured}' uploaded to GCS.")
 
-        process_audio_with_openai_whisper_task.delay(
-            job_id, Config.GCS_BUCKET_NAME, gcs_object_name, file.content_type
+def idempotent_replay_response(record_json, request_hash, session_fields):
+    """같은 Idempotency-Key로 먼저 예약된 요청의 응답을 돌려줍니다. 아직 처리 중이면 job_id만 담아 202로 응답합니다."""
+    record = json.loads(record_json)
+    if record["request_hash"] != request_hash:
+        raise HTTPException(status_code=422, detail="같은 Idempotency-Key가 다른 요청 내용에 이미 사용되었습니다.")
+    if "response" in record:
+        status_code, content = record["status_code"], record["response"]
+    else:
+        status_code, content = 202, {"job_id": record["job_id"], "message": "같은 요청이 이미 처리 중입니다.", **session_fields}
+    logger.info(f"Job {record['job_id']}: Idempotent upload replayed.")
+    return JSONResponse(status_code=status_code, content={**content, "idempotent_replay": True}, headers={"Idempotent-Replayed": "true"})
+
+
+async def start_upload_job(file: UploadFile, job_id, original_filename_secured, session_id, seq, priority, audio_sha256):
+    """검증을 마친 업로드 하나를 STT 작업으로 시작하고 응답을 반환합니다 (캐시 적중 시 200, 작업 발행 시 202)."""
+    gcs_object_name = f"audio_uploads/{job_id}/{original_filename_secured}"
+    set_span_attributes(job_id=job_id, session_id=session_id, priority=priority)
+    session_fields = {"session_id": session_id, "seq": seq} if session_id else {}
+
+    audio_cache_key = None
+    if Config.STT_CACHE_ENABLED:
+        audio_cache_key = build_cache_key(audio_sha256)
+        try:
+            cached_result = await get_cached_transcription(redis_client, audio_cache_key)
+        except Exception as e:
+            logger.error(f"Job {job_id}: STT cache lookup failed: {e}", exc_info=True)
+            cached_result = None
+        if cached_result is not None:
+            # 캐시 적중: GCS/Celery를 거치지 않고 즉시 작업을 완료 상태로 기록
+            result_data, segments = split_result_segments({"status": "Completed", **cached_result})
+            encoded_result = encode_result(result_data)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.setex(f"stt_result:{job_id}", Config.REDIS_RESULT_EXPIRE_SECONDS, encoded_result)
+            queue_result_size_stats(pipe, result_data, encoded_result)
+            if segments:
+                queue_segments(pipe, job_id, segments)
+            pipe.publish(f"{RESULT_EVENTS_CHANNEL_PREFIX}{job_id}", json.dumps({"job_id": job_id, **result_data}))
+            if session_id:
+                queue_session_job(pipe, session_id, seq, job_id)
+                queue_session_result(pipe, session_id, job_id, result_data)
+            await pipe.execute()
+            logger.info(f"Job {job_id}: STT cache hit for '{original_filename_secured}'.")
+            return JSONResponse(status_code=200, content={"job_id": job_id, "message": "캐시된 STT 결과를 사용했습니다.", "cached": True, **session_fields})
+
+    inline_audio = await read_small_upload(file) if Config.STT_INLINE_AUDIO_MAX_BYTES > 0 else None
+    if inline_audio is not None:
+        # 작은 파일: GCS 대신 짧은 TTL의 Redis 키로 워커에 전달 (업로드/다운로드/삭제 왕복 생략)
+        inline_audio_key = f"stt_inline_audio:{job_id}"
+        try:
+            with STAGE_SECONDS.labels(stage="api_inline_store").time(), start_span("redis.store_inline_audio", job_id=job_id):
+                await redis_client.setex(inline_audio_key, Config.STT_INLINE_AUDIO_TTL_SECONDS, inline_audio)
+            AUDIO_BYTES.labels(stage="uploaded").inc(len(inline_audio))
+            process_audio_with_openai_whisper_task.apply_async(
+                args=(job_id, None, original_filename_secured, file.content_type, audio_cache_key, len(inline_audio), inline_audio_key),
+                kwargs={"session_id": session_id, "priority": priority},
+                **task_queue_options(priority)
+            )
+            await register_session_chunk(session_id, seq, job_id)
+        except Exception as e:
+            logger.error(f"Job {job_id}: Inline upload error: {e}", exc_info=True)
+            try:
+                await redis_client.delete(inline_audio_key)
+            except Exception as e_del:
+                logger.error(f"Job {job_id}: Error cleaning up inline audio {inline_audio_key}: {e_del}")
+            raise HTTPException(status_code=500, detail="서버에서 파일 처리 중 오류가 발생했습니다.")
+        logger.info(f"Job {job_id}: Celery STT task initiated with inline audio '{original_filename_secured}' ({len(inline_audio)} bytes).")
+        return JSONResponse(status_code=202, content={"job_id": job_id, "message": "STT 작업이 시작되었습니다.", **session_fields})
+
+    blob = gcs_bucket.blob(gcs_object_name)
+    uploaded_to_gcs = False
+    try:
+        with STAGE_SECONDS.labels(stage="api_upload").time(), start_span("gcs.upload", job_id=job_id, gcs_object=gcs_object_name):
+            uploaded_bytes = await stream_upload_to_gcs(file, blob, file.content_type)
+        AUDIO_BYTES.labels(stage="uploaded").inc(uploaded_bytes)
+        uploaded_to_gcs = True
+        logger.info(f"Job {job_id}: File '{original_filename_secured}' ({uploaded_bytes} bytes) uploaded to GCS.")
+
+        process_audio_with_openai_whisper_task.apply_async(
+            args=(job_id, Config.GCS_BUCKET_NAME, gcs_object_name, file.content_type, audio_cache_key, uploaded_bytes),
+            kwargs={"session_id": session_id, "priority": priority},
+            **task_queue_options(priority)
         )
+        await register_session_chunk(session_id, seq, job_id)
         logger.info(f"Job {job_id}: Celery STT task initiated.")
         
-        return JSONResponse(status_code=202, content={"job_id": job_id, "message": "STT 작업이 시작되었습니다."})
+        return JSONResponse(status_code=202, content={"job_id": job_id, "message": "STT 작업이 시작되었습니다.", **session_fields})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Job {job_id}: Upload error: {e}", exc_info=True)
-        if 'blob' in locals() and blob.exists(): blob.delete()
+        if uploaded_to_gcs:
+            try:
+                await run_in_threadpool(blob.delete)
+            except Exception as e_del:
+                logger.error(f"Job {job_id}: Error cleaning up GCS file {gcs_object_name}: {e_del}")
         raise HTTPException(status_code=500, detail="서버에서 파일 처리 중 오류가 발생했습니다.")
 
 
+async def register_session_chunk(session_id, seq, job_id):
+    """작업 발행에 성공한 청크만 세션의 seq 위치에 등록합니다 (업로드/발행에 실패한 청크가 세션을 '처리 중'으로 묶어 두지 않도록)."""
+    if not session_id:
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    queue_session_job(pipe, session_id, seq, job_id)
+    await pipe.execute()
+
+
+def publish_stt_jobs(jobs, priority, published):
+    """(스레드풀) 여러 STT 작업을 하나의 브로커 연결(producer)로 연속 발행합니다 (작업마다 연결을 다시 얻지 않음).
+
+    발행에 성공한 Job은 published에 추가하므로, 도중에 실패해도 호출한 쪽에서 이미 발행된 Job을 구분할 수 있습니다.
+    """
+    with celery_app.producer_or_acquire() as producer:
+        for job in jobs:
+            process_audio_with_openai_whisper_task.apply_async(
+                args=(job["job_id"], Config.GCS_BUCKET_NAME, job["gcs_object_name"], job["content_type"], None, job["size"]),
+                kwargs={"priority": priority},
+                producer=producer,
+                **task_queue_options(priority)
+            )
+            published.append(job)
+
+
+@app.post("/upload/batch", name="upload_batch", tags=["STT"])
+async def upload_batch_route(
+    files: List[UploadFile] = File(...),
+    priority: str = Form(PRIORITY_BATCH), # 보관 녹음 이전 등 대량 처리가 기본
+):
+    """여러 오디오 파일(또는 zip/tar 아카이브)을 한 번에 받아 GCS에 동시 업로드하고, 모든 Job ID를 한 번에 반환합니다."""
+    if not gcs_bucket or not redis_client:
+        raise HTTPException(status_code=503, detail="백엔드 서비스가 준비되지 않았습니다.")
+    if priority not in TASK_PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority는 {', '.join(TASK_PRIORITIES)} 중 하나여야 합니다.")
+
+    # 아카이브는 내부 파일 단위로 펼쳐서 각각 하나의 Job으로 처리
+    candidates, rejected = [], []
+    for upload in files:
+        filename = secure_filename(upload.filename or "")
+        if filename and is_archive(filename):
+            try:
+                archive = await run_in_threadpool(ArchiveMembers, upload.file, filename)
+            except ARCHIVE_ERRORS as e:
+                logger.warning(f"Batch upload: Cannot read archive '{filename}': {e}")
+                rejected.append({"filename": filename, "detail": "아카이브 파일을 읽을 수 없습니다."})
+                continue
+            for member_name, size, member in archive.members:
+                member_filename = secure_filename(os.path.basename(member_name))
+                candidates.append({"filename": member_filename, "size": size, "content_type": guess_content_type(member_filename),
+                                   "open_source": functools.partial(archive.extract, member)})
+        else:
+            candidates.append({"filename": filename, "size": upload.size, "content_type": upload.content_type,
+                               "open_source": lambda source=upload.file: source})
+
+    accepted = []
+    for item in candidates:
+        if not item["filename"] or not allowed_file(item["filename"]):
+            rejected.append({"filename": item["filename"], "detail": "허용되지 않는 파일 형식입니다."})
+        elif not item["size"]:
+            rejected.append({"filename": item["filename"], "detail": "업로드된 파일이 비어있습니다."})
+        elif item["size"] > Config.UPLOAD_MAX_BYTES:
+            rejected.append({"filename": item["filename"], "detail": f"파일 크기가 최대 허용치({Config.UPLOAD_MAX_BYTES} bytes)를 초과했습니다."})
+        else:
+            accepted.append(item)
+    if len(accepted) > Config.BATCH_UPLOAD_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {Config.BATCH_UPLOAD_MAX_FILES}개 파일까지 업로드할 수 있습니다.")
+    if not accepted:
+        raise HTTPException(status_code=400, detail={"message": "처리할 수 있는 파일이 없습니다.", "rejected": rejected})
+
+    semaphore = asyncio.Semaphore(Config.BATCH_UPLOAD_CONCURRENCY)
+
+    async def upload_one(item):
+        job_id = uuid.uuid4().hex
+        gcs_object_name = f"audio_uploads/{job_id}/{item['filename']}"
+        async with semaphore:
+            try:
+                with STAGE_SECONDS.labels(stage="api_upload").time(), start_span("gcs.upload", job_id=job_id, gcs_object=gcs_object_name):
+                    await run_in_threadpool(upload_batch_item, gcs_bucket.blob(gcs_object_name), item["open_source"], item["content_type"])
+                AUDIO_BYTES.labels(stage="uploaded").inc(item["size"])
+            except Exception as e:
+                logger.error(f"Job {job_id}: Batch GCS upload failed for '{item['filename']}': {e}", exc_info=True)
+                rejected.append({"filename": item["filename"], "detail": "GCS 업로드 중 오류가 발생했습니다."})
+                return None
+        return {"job_id": job_id, "filename": item["filename"], "gcs_object_name": gcs_object_name,
+                "content_type": item["content_type"], "size": item["size"]}
+
+    jobs = [job for job in await asyncio.gather(*(upload_one(item) for item in accepted)) if job]
+    if not jobs:
+        raise HTTPException(status_code=500, detail="서버에서 파일 처리 중 오류가 발생했습니다.")
+
+    published = []
+    try:
+        await run_in_threadpool(publish_stt_jobs, jobs, priority, published)
+    except Exception as e:
+        # 이미 발행된 Job은 워커가 오디오를 내려받으므로 그대로 두고, 발행되지 않은 Job의 오디오만 정리
+        unpublished = jobs[len(published):]
+        logger.error(f"Batch upload: Celery publish failed for {len(unpublished)}/{len(jobs)} jobs: {e}", exc_info=True)
+        await asyncio.gather(
+            *(run_in_threadpool(gcs_bucket.blob(job["gcs_object_name"]).delete) for job in unpublished), return_exceptions=True
+        )
+        if not published:
+            raise HTTPException(status_code=500, detail="서버에서 파일 처리 중 오류가 발생했습니다.")
+        rejected.extend({"filename": job["filename"], "detail": "STT 작업 시작 중 오류가 발생했습니다."} for job in unpublished)
+        jobs = published
+
+    logger.info(f"Batch upload: {len(jobs)} Celery STT tasks initiated ({len(rejected)} rejected, priority={priority}).")
+    return JSONResponse(status_code=202, content={
+        "message": f"{len(jobs)}개의 STT 작업이 시작되었습니다.",
+        "jobs": [{"job_id": job["job_id"], "filename": job["filename"]} for job in jobs],
+        "rejected": rejected,
+    })
+
+
+@app.get("/session/{session_id}", name="get_session", tags=["Results"])
+async def get_session_route(session_id: str):
+    """세션의 청크별 상태와 seq 순서로 이어붙인 전사본을 한 번에 반환합니다 (청크마다 /result를 폴링할 필요 없음)."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    session = await get_session_transcript(redis_client, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없거나 만료되었습니다.")
+    return session
+
+
+async def respond_from_summary_cache(summary_source_id, text_to_summarize):
+    """요약 캐시 적중 시 결과를 바로 기록하고 200 응답을 반환합니다 (Celery/GPT 호출 생략). 미스면 None."""
+    if not Config.SUMMARY_CACHE_ENABLED:
+        return None
+    try:
+        summary = await get_cached_summary(redis_client, build_summary_cache_key(text_to_summarize))
+    except Exception as e:
+        logger.error(f"Job {summary_source_id}: Summary cache lookup failed: {e}", exc_info=True)
+        return None
+    if summary is None:
+        return None
+
+    summary_job_key = f"summary:{summary_source_id}"
+    result_data = {"status": "Completed", "summary": summary}
+    encoded_result = encode_result(result_data)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.setex(f"stt_result:{summary_job_key}", Config.REDIS_RESULT_EXPIRE_SECONDS, encoded_result)
+    queue_result_size_stats(pipe, result_data, encoded_result)
+    pipe.publish(f"{RESULT_EVENTS_CHANNEL_PREFIX}{summary_job_key}", json.dumps({"job_id": summary_job_key, **result_data}))
+    await pipe.execute()
+    logger.info(f"Job {summary_source_id}: Summary cache hit.")
+    return JSONResponse(status_code=200, content={"job_id": summary_job_key, "message": "캐시된 요약 결과를 사용했습니다.", "cached": True, **result_data})
+
+
+@app.post("/session/{session_id}/summarize", name="summarize_session", tags=["Summarization"])
+async def summarize_session_route(session_id: str):
+    """서버에 모인 세션 전사본으로 요약 작업을 시작합니다 (클라이언트가 전체 텍스트를 다시 보낼 필요 없음)."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="백엔드 서비스가 준비되지 않았습니다.")
+    session = await get_session_transcript(redis_client, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없거나 만료되었습니다.")
+    if session["processing"]:
+        raise HTTPException(status_code=409, detail=f"아직 처리 중인 청크가 {session['processing']}개 있습니다.")
+    if not session["transcript"].strip():
+        raise HTTPException(status_code=400, detail="요약을 위한 텍스트가 비어있습니다.")
+
+    summary_source_id = f"session:{session_id}"
+    cached_response = await respond_from_summary_cache(summary_source_id, session["transcript"])
+    if cached_response is not None:
+        return cached_response
+    try:
+        summarize_text_with_gpt_task.apply_async(
+            args=(summary_source_id, session["transcript"]),
+            kwargs={"priority": PRIORITY_INTERACTIVE},
+            **task_queue_options(PRIORITY_INTERACTIVE)
+        )
+    except Exception as e:
+        logger.error(f"Session {session_id}: Summarization task initiation error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="서버에서 요약 작업 시작 중 오류가 발생했습니다.")
+    logger.info(f"Session {session_id}: Celery Summarization task initiated ({session['chunk_count']} chunks).")
+    return JSONResponse(status_code=202, content={"job_id": f"summary:{summary_source_id}", "message": "요약 작업이 시작되었습니다."})
+
+
+@app.get("/metrics", name="get_metrics", tags=["Status"])
+async def get_metrics_route():
+    """Prometheus 지표 (API 프로세스 지표 + Celery 큐 길이). 워커 지표는 WORKER_METRICS_PORT의 exporter에서 수집합니다."""
+    queue_depths = None
+    if redis_broker_client:
+        queues = CONSUMED_QUEUES
+        try:
+            pipe = redis_broker_client.pipeline(transaction=False)
+            for queue_name in queues:
+                pipe.llen(queue_name)
+            queue_depths = dict(zip(queues, await pipe.execute()))
+        except Exception as e:
+            logger.error(f"Metrics: Failed to read Celery queue depth: {e}")
+    return Response(content=render_metrics(queue_depths), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/stats/stt-cache", name="get_stt_cache_stats", tags=["Status"])
+async def get_stt_cache_stats_route():
+    """STT 결과 캐시의 적중/미스 카운터와 항목 수를 반환합니다 (캐시 크기 산정용)."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    return await get_cache_stats(redis_client)
+
+
+@app.get("/stats/summary-cache", name="get_summary_cache_stats", tags=["Status"])
+async def get_summary_cache_stats_route():
+    """요약 결과 캐시의 적중/미스 카운터와 사용 중인 바이트를 반환합니다."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    return await get_summary_cache_stats(redis_client)
+
+
+@app.get("/stats/results", name="get_result_storage_stats", tags=["Status"])
+async def get_result_storage_stats_route():
+    """작업 결과 저장 형식(msgpack/zstd)의 Job당 평균 저장 크기와 JSON 대비 절감률을 반환합니다."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    stats = await get_result_codec_stats(redis_client)
+    try:
+        stats["redis_used_memory_bytes"] = (await redis_client.info("memory")).get("used_memory")
+    except Exception: # INFO 명령이 막혀 있는 관리형 Redis
+        stats["redis_used_memory_bytes"] = None
+    return stats
+
+
+@app.get("/stats/transcode", name="get_transcode_stats", tags=["Status"])
+async def get_transcode_stats_route():
+    """워커 트랜스코딩으로 줄어든 오디오 바이트 수를 반환합니다."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    stats = {k: int(v) for k, v in (await redis_client.hgetall(TRANSCODE_STATS_KEY) or {}).items()}
+    bytes_before, bytes_after = stats.get("bytes_before", 0), stats.get("bytes_after", 0)
+    return {
+        "transcoded": stats.get("transcoded", 0),
+        "skipped": stats.get("skipped", 0),
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_saved": bytes_before - bytes_after,
+        "saved_ratio": round(1 - bytes_after / bytes_before, 4) if bytes_before else 0.0,
+    }
+
+
+@app.get("/stats/redis-pool", name="get_redis_pool_stats", tags=["Status"])
+async def get_redis_pool_stats_route():
+    """API 프로세스의 Redis 연결 풀 사용량과 대기 통계를 반환합니다."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    return redis_client.connection_pool.get_stats()
+
+
 @app.post("/summarize", name="summarize_text", tags=["Summarization"])
 async def summarize_text_route(request: SummarizeRequest):
     """텍스트를 받아 요약 작업을 시작하고, 요약 작업용 Job ID를 반환합니다."""
@@ -127,12 +607,24 @@ async def summarize_text_route(request: SummarizeRequest):
     original_job_id = request.jobId
     text_to_summarize = request.text
     summary_job_key = f"summary:{original_job_id}" # Redis 키 구분을 위한 접두사
+    set_span_attributes(job_id=summary_job_key, priority=request.priority)
 
     if not text_to_summarize or not text_to_summarize.strip():
         raise HTTPException(status_code=400, detail="요약을 위한 텍스트가 비어있습니다.")
 
+    if request.priority not in TASK_PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority는 {', '.join(TASK_PRIORITIES)} 중 하나여야 합니다.")
+
+    cached_response = await respond_from_summary_cache(original_job_id, text_to_summarize)
+    if cached_response is not None:
+        return cached_response
+
     try:
-        summarize_text_with_gpt_task.delay(original_job_id, text_to_summarize)
+        summarize_text_with_gpt_task.apply_async(
+            args=(original_job_id, text_to_summarize),
+            kwargs={"priority": request.priority},
+            **task_queue_options(request.priority)
+        )
         logger.info(f"Job {original_job_id}: Celery Summarization task initiated.")
         
         return JSONResponse(status_code=202, content={"job_id": summary_job_key, "message": "요약 작업이 시작되었습니다."})
@@ -142,9 +634,30 @@ async def summarize_text_route(request: SummarizeRequest):
         raise HTTPException(status_code=500, detail="서버에서 요약 작업 시작 중 오류가 발생했습니다.")
 
 
+PENDING_RESULT_ETAG = '"pending"' # 결과가 아직 기록되지 않은 작업
+
+def build_result_etag(stored_result):
+    """저장된 결과 값(bytes)의 해시로 ETag를 만듭니다. 워커가 상태를 바꿔 쓸 때마다 값이 달라집니다."""
+    return f'"{hashlib.blake2b(stored_result, digest_size=12).hexdigest()}"'
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
 @app.get("/result/{job_id_key}", name="get_task_result", tags=["Results"])
-async def get_task_result_route(job_id_key: str):
-    """특정 Job ID Key에 대한 작업 상태와 결과를 JSON으로 반환합니다."""
+async def get_task_result_route(
+    job_id_key: str,
+    wait: Optional[float] = Query(None, ge=0, le=Config.RESULT_LONG_POLL_MAX_SECONDS), # 롱 폴링: 최종 상태가 될 때까지 최대 대기 시간(초)
+    if_none_match: Optional[str] = Header(None),
+):
+    """특정 Job ID Key에 대한 작업 상태와 결과를 JSON으로 반환합니다.
+
+    결과는 조회해도 삭제하지 않고 REDIS_RESULT_EXPIRE_SECONDS 동안 유지됩니다 (삭제는 DELETE /result/{job_id_key}).
+    응답의 ETag를 If-None-Match로 보내면 상태가 바뀌지 않은 동안에는 본문 없이 304를 반환합니다.
+    wait를 주면 작업이 완료/실패할 때까지(최대 wait초) 응답을 보류했다가, 결과 알림을 받는 즉시 응답합니다.
+    """
     if not redis_client:
         raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
     
@@ -160,16 +673,119 @@ async def get_task_result_route(job_id_key: str):
         # 프론트에서 요약 결과 요청 시 'summary:job123'을 보내면 여기서 키를 재구성
         redis_key = f"stt_result:{job_id_key}"
 
-    result_data_json_str = redis_client.get(redis_key)
-    
-    if result_data_json_str:
-        result_data = json.loads(result_data_json_str)
-        status = result_data.get("status")
+    if wait:
+        async with result_waiter.subscribe(job_id_key) as finished:
+            stored_result = await redis_result_client.get(redis_key)
+            if not stored_result or decode_result(stored_result).get("status") not in TERMINAL_STATUSES:
+                await asyncio.wait([finished], timeout=wait)
+                stored_result = await redis_result_client.get(redis_key)
+    else:
+        stored_result = await redis_result_client.get(redis_key)
+    etag = build_result_etag(stored_result) if stored_result else PENDING_RESULT_ETAG
+    headers = {"ETag": etag, "Cache-Control": "no-cache"} # 브라우저가 매번 If-None-Match로 재검증하도록
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
 
-        if status in ["Completed", "Failed"]:
-            redis_client.delete(redis_key)
-            logger.info(f"Result for key '{redis_key}' fetched and removed from Redis.")
-        
-        return JSONResponse(status_code=200, content=result_data)
+    if stored_result:
+        return JSONResponse(status_code=200, content=decode_result(stored_result), headers=headers)
     else:
-        return JSONResponse(status_code=202, content={"status": "Processing", "message": "작업이 아직 처리 중이거나 결과를 찾을 수 없습니다."})
\ No newline at end of file
+        return JSONResponse(status_code=202, content={"status": "Processing", "message": "작업이 아직 처리 중이거나 결과를 찾을 수 없습니다."}, headers=headers)
+
+
+@app.delete("/result/{job_id_key}", name="delete_task_result", tags=["Results"])
+async def delete_task_result_route(job_id_key: str):
+    """결과와 세그먼트를 만료 전에 삭제합니다. 삭제할 결과가 없으면 404를 반환합니다."""
+    if not redis_result_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    if not await redis_result_client.delete(f"stt_result:{job_id_key}", segments_key(job_id_key)):
+        raise HTTPException(status_code=404, detail="결과를 찾을 수 없거나 이미 만료되었습니다.")
+    logger.info(f"Result for '{job_id_key}' deleted by client.")
+    return Response(status_code=204)
+
+
+@app.get("/result/{job_id}/segments", name="get_task_segments", tags=["Results"])
+async def get_task_segments_route(
+    job_id: str,
+    from_seconds: Optional[float] = Query(None, alias="from", ge=0), # 구간 시작(초)
+    to_seconds: Optional[float] = Query(None, alias="to", ge=0),     # 구간 끝(초)
+):
+    """완료된 STT 작업의 세그먼트 중 [from, to) 구간과 겹치는 것만 반환합니다 (긴 녹음에서 보이는 부분만 조회).
+
+    세그먼트는 결과와 같은 만료 시간 동안 유지되며, DELETE /result/{job_id}로 결과와 함께 삭제됩니다.
+    """
+    if not redis_result_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    if from_seconds is not None and to_seconds is not None and to_seconds <= from_seconds:
+        raise HTTPException(status_code=400, detail="to는 from보다 커야 합니다.")
+    columns = await get_segments(redis_result_client, job_id)
+    if columns is None:
+        raise HTTPException(status_code=404, detail="세그먼트를 찾을 수 없거나 만료되었습니다.")
+    first_index, segments = select_time_range(columns, from_seconds, to_seconds)
+    return {"job_id": job_id, "segment_count": len(columns["start"]), "first_index": first_index, "segments": segments}
+
+
+@app.post("/results", name="get_task_results", tags=["Results"])
+async def get_task_results_route(request: ResultsRequest):
+    """여러 Job의 상태/결과를 한 번에 반환합니다 (Job마다 /result를 폴링하는 대신 한 번의 MGET).
+
+    /result와 마찬가지로 결과는 조회해도 삭제하지 않습니다.
+    """
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="결과 저장소에 연결할 수 없습니다.")
+    job_ids = list(dict.fromkeys(request.job_ids)) # 순서를 유지한 중복 제거
+    if len(job_ids) > Config.RESULTS_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {Config.RESULTS_BATCH_MAX_IDS}개 Job까지 조회할 수 있습니다.")
+    if not job_ids:
+        return {"results": {}}
+
+    redis_keys = [f"stt_result:{job_id_key}" for job_id_key in job_ids]
+    results = {}
+    for job_id_key, stored_result in zip(job_ids, await redis_result_client.mget(redis_keys)):
+        results[job_id_key] = decode_result(stored_result) if stored_result else {"status": "Processing"}
+    return {"results": results}
+
+
+@app.websocket("/ws/results")
+async def results_websocket_route(websocket: WebSocket):
+    """하나의 WebSocket 연결로 여러 Job의 상태 변경을 실시간으로 전달합니다 (/result 폴링 대체).
+
+    클라이언트 -> 서버: {"subscribe": ["job1", "summary:job1"]} 또는 {"unsubscribe": [...]}
+    서버 -> 클라이언트: {"job_id": "...", "status": "...", ...} (/result 응답과 같은 필드)
+    구독 직후 이미 저장된 결과가 있으면 먼저 한 번 전송하므로, 구독 전에 끝난 작업도 놓치지 않습니다.
+    """
+    await websocket.accept()
+    pubsub = redis_pubsub_client.pubsub()
+    subscribed = asyncio.Event()
+
+    async def receive_commands():
+        while True:
+            command = await websocket.receive_json()
+            subscribe_ids = [str(j) for j in command.get("subscribe", []) if j]
+            unsubscribe_ids = [str(j) for j in command.get("unsubscribe", []) if j]
+            if subscribe_ids:
+                await pubsub.subscribe(*[f"{RESULT_EVENTS_CHANNEL_PREFIX}{j}" for j in subscribe_ids])
+                subscribed.set()
+                current_results = await redis_result_client.mget([f"stt_result:{j}" for j in subscribe_ids])
+                for job_id_key, stored_result in zip(subscribe_ids, current_results):
+                    if stored_result:
+                        await websocket.send_json({"job_id": job_id_key, **decode_result(stored_result)})
+            if unsubscribe_ids:
+                await pubsub.unsubscribe(*[f"{RESULT_EVENTS_CHANNEL_PREFIX}{j}" for j in unsubscribe_ids])
+
+    async def forward_events():
+        await subscribed.wait()
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=30.0)
+            if message and message["type"] == "message":
+                await websocket.send_text(message["data"])
+
+    tasks = [asyncio.create_task(receive_commands()), asyncio.create_task(forward_events())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() and not isinstance(task.exception(), WebSocketDisconnect):
+                logger.error(f"Result WebSocket error: {task.exception()}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await pubsub.aclose()
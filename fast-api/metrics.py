@@ -0,0 +1,71 @@
+# metrics.py
+# Prometheus 지표 (API와 Celery 워커가 공유)
+#
+# gunicorn 워커나 Celery prefork 자식처럼 여러 프로세스에서 기록할 때는 프로세스 시작 전에
+# PROMETHEUS_MULTIPROC_DIR 환경 변수를 (시작할 때마다 비운) 디렉토리로 지정해야 합니다.
+# 지정하지 않으면 프로세스별 기본 레지스트리를 사용합니다 (uvicorn 단일 프로세스, Celery threads 풀).
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, start_http_server
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+SAVED_BYTES_BUCKETS = (0, 64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2)
+
+# 단계: api_upload, api_inline_store, queue_wait, gcs_download, inline_load, transcode, vad,
+#       stt_rate_limit_wait, stt_call, chat_rate_limit_wait, chat_call, redis_write
+STAGE_SECONDS = Histogram("stt_stage_duration_seconds", "STT 파이프라인 단계별 소요 시간", ["stage"], buckets=STAGE_BUCKETS)
+TASKS_IN_FLIGHT = Gauge("stt_tasks_in_flight", "실행 중인 Celery 작업 수", ["task"], multiprocess_mode="livesum")
+TASKS_TOTAL = Counter("stt_tasks_total", "종료된 Celery 작업 수 (상태별)", ["task", "state"])
+AUDIO_BYTES = Counter("stt_audio_bytes_total", "단계별로 처리한 오디오 바이트 수", ["stage"])
+TRANSCODE_SAVED_BYTES = Histogram("stt_transcode_saved_bytes", "Job별 트랜스코딩으로 줄인 오디오 바이트 수 (건너뛰면 0)", buckets=SAVED_BYTES_BUCKETS)
+OPENAI_ERRORS = Counter("stt_openai_errors_total", "OpenAI 호출 오류 수 (유형별)", ["error_type"])
+
+
+def multiprocess_enabled():
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def _collecting_registry():
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class _QueueDepthCollector:
+    """스크레이프 시점에 조회한 큐 길이를 그대로 내보내는 일회용 collector (프로세스 간 공유 상태 없음)."""
+
+    def __init__(self, queue_depths):
+        self.queue_depths = queue_depths
+
+    def collect(self):
+        family = GaugeMetricFamily("stt_queue_depth", "Celery 큐에 대기 중인 메시지 수", labels=["queue"])
+        for queue_name, depth in self.queue_depths.items():
+            family.add_metric([queue_name], depth)
+        yield family
+
+
+def render_metrics(queue_depths=None):
+    """(API) /metrics 응답 본문을 만듭니다. queue_depths가 있으면 stt_queue_depth도 포함합니다."""
+    output = generate_latest(_collecting_registry())
+    if queue_depths:
+        registry = CollectorRegistry(auto_describe=False)
+        registry.register(_QueueDepthCollector(queue_depths))
+        output += generate_latest(registry)
+    return output
+
+
+def start_worker_metrics_server(port):
+    """(Celery 메인 프로세스) 모든 자식 프로세스의 지표를 합쳐 보여주는 HTTP exporter를 시작합니다."""
+    start_http_server(port, registry=_collecting_registry())
+
+
+def mark_process_dead(pid):
+    """종료된 자식 프로세스의 livesum 게이지 값을 정리합니다."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
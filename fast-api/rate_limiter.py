@@ -0,0 +1,100 @@
+# rate_limiter.py
+# 모든 Celery 워커가 공유하는 Redis 토큰 버킷 기반 OpenAI 호출 속도 제한
+import math
+import time
+import random
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "openai_rate_limit"
+
+# KEYS[i]: 버킷 키, ARGV: (용량, ms당 충전량, 요청량) 묶음이 버킷 수만큼 반복
+# 모든 버킷에 여유가 있을 때만 한꺼번에 차감하고 0을, 아니면 가장 긴 대기 시간(ms)을 반환
+_TOKEN_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local states = {}
+local wait_ms = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 2])
+    local refill_per_ms = tonumber(ARGV[i * 3 - 1])
+    local requested = math.min(tonumber(ARGV[i * 3]), capacity)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_ms)
+    if tokens < requested then
+        wait_ms = math.max(wait_ms, math.ceil((requested - tokens) / refill_per_ms))
+    end
+    states[i] = {tokens, requested, math.ceil(capacity / refill_per_ms) + 1000}
+end
+for i, key in ipairs(KEYS) do
+    local tokens = states[i][1]
+    if wait_ms == 0 then
+        tokens = tokens - states[i][2]
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', key, states[i][3])
+end
+return wait_ms
+"""
+
+
+class RateLimitWaitTooLong(Exception):
+    """허용 대기 시간 안에 용량을 얻지 못함. retry_after(초) 뒤에 작업을 다시 시도해야 합니다."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"OpenAI rate limit capacity not available; retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+_token_bucket_scripts = {}
+
+def _get_script(redis_conn):
+    script = _token_bucket_scripts.get(id(redis_conn))
+    if script is None:
+        script = redis_conn.register_script(_TOKEN_BUCKET_LUA)
+        _token_bucket_scripts[id(redis_conn)] = script
+    return script
+
+
+def acquire_capacity(redis_conn, limits, max_wait_seconds=None):
+    """limits: [(버킷 이름, 분당 한도, 요청량), ...]. 한도가 0 이하인 항목은 무시합니다.
+
+    모든 버킷에서 용량을 얻을 때까지 최대 max_wait_seconds 동안 기다리며,
+    그 안에 얻지 못하면 RateLimitWaitTooLong을 발생시킵니다. Redis가 없으면 제한하지 않습니다.
+    """
+    active_limits = [(name, per_minute, amount) for name, per_minute, amount in limits if per_minute > 0]
+    if not active_limits or redis_conn is None:
+        return 0.0
+
+    if max_wait_seconds is None:
+        max_wait_seconds = Config.OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS
+    keys = [f"{RATE_LIMIT_KEY_PREFIX}:{name}" for name, _, _ in active_limits]
+    args = []
+    for _, per_minute, amount in active_limits:
+        args.extend([per_minute, per_minute / 60000.0, max(1, math.ceil(amount))])
+
+    script = _get_script(redis_conn)
+    started = time.monotonic()
+    while True:
+        wait_ms = int(script(keys=keys, args=args))
+        if wait_ms <= 0:
+            return time.monotonic() - started
+        waited = time.monotonic() - started
+        wait_seconds = wait_ms / 1000.0 + random.uniform(0, 0.05) # 여러 워커가 동시에 깨어나지 않도록 약간의 지터
+        if waited + wait_seconds > max_wait_seconds:
+            raise RateLimitWaitTooLong(wait_seconds)
+        time.sleep(wait_seconds)
+
+
+def retry_countdown(retries, retry_after=None):
+    """지터가 들어간 지수 백오프(equal jitter) 대기 시간(초). 서버가 준 Retry-After가 있으면 그 이상 기다립니다."""
+    backoff_cap = min(Config.OPENAI_RETRY_MAX_DELAY_SECONDS, Config.OPENAI_RETRY_BASE_DELAY_SECONDS * (2 ** retries))
+    countdown = random.uniform(backoff_cap / 2, backoff_cap)
+    if retry_after:
+        countdown = max(countdown, float(retry_after))
+    return countdown
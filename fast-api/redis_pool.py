@@ -0,0 +1,59 @@
+# redis_pool.py
+# API 프로세스용 비동기 Redis 연결 풀 (크기 제한 + 사용량/대기 통계)
+import time
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from config import Config
+
+
+class InstrumentedBlockingConnectionPool(aioredis.BlockingConnectionPool):
+    """연결이 모두 사용 중이면 반납될 때까지 기다리는 풀에 사용량/대기 시간 통계를 더한 것."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquired_count = 0
+        self.wait_count = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.acquire_error_count = 0
+
+    async def get_connection(self, *args, **kwargs):
+        must_wait = not self.can_get_connection()
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError:
+            # 풀 대기 시간 초과("No connection available.") 또는 연결 실패
+            self.acquire_error_count += 1
+            raise
+        self.acquired_count += 1
+        if must_wait:
+            waited = time.perf_counter() - started
+            self.wait_count += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return connection
+
+    def get_stats(self):
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "acquired": self.acquired_count,
+            "waits": self.wait_count,
+            "wait_ratio": round(self.wait_count / self.acquired_count, 4) if self.acquired_count else 0.0,
+            "avg_wait_ms": round(self.total_wait_seconds / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            "acquire_errors": self.acquire_error_count,
+        }
+
+
+def create_api_redis_client(db, decode_responses=True):
+    """API 라우트들이 공유하는 크기 제한 풀 기반 비동기 Redis 클라이언트를 만듭니다."""
+    pool = InstrumentedBlockingConnectionPool(
+        host=Config.REDIS_HOST, port=Config.REDIS_PORT, db=db, decode_responses=decode_responses,
+        max_connections=Config.REDIS_API_POOL_MAX_CONNECTIONS,
+        timeout=Config.REDIS_API_POOL_TIMEOUT_SECONDS,
+    )
+    return aioredis.Redis(connection_pool=pool)
@@ -0,0 +1,67 @@
+# result_codec.py
+# Redis에 저장하는 작업 결과(stt_result:*)의 인코딩: msgpack + 크기 기준 zstd 압축
+# 값 앞의 형식 태그 1바이트로 구분하며, 태그가 없는 값('{'로 시작)은 이전 버전이 저장한 JSON으로 읽습니다.
+import json
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:
+    msgpack = None
+    zstandard = None
+
+FORMAT_MSGPACK = b"\x01"
+FORMAT_MSGPACK_ZSTD = b"\x02"
+RESULT_CODEC_STATS_KEY = "stt_result_codec:stats"  # hash: stored / compressed / json_bytes / stored_bytes
+
+if Config.RESULT_CODEC == "msgpack" and msgpack is None:
+    logger.warning("RESULT_CODEC=msgpack but msgpack/zstandard is not installed. Falling back to JSON.")
+
+
+def encode_result(result_data):
+    """작업 결과 dict를 Redis 저장용 bytes로 변환합니다 (RESULT_COMPRESS_MIN_BYTES 이상이면 zstd 압축)."""
+    if Config.RESULT_CODEC != "msgpack" or msgpack is None:
+        return json.dumps(result_data).encode("utf-8")
+    packed = msgpack.packb(result_data, use_bin_type=True)
+    if len(packed) >= Config.RESULT_COMPRESS_MIN_BYTES:
+        # ZstdCompressor는 스레드 간 공유할 수 없으므로 호출마다 생성
+        return FORMAT_MSGPACK_ZSTD + zstandard.ZstdCompressor(level=Config.RESULT_ZSTD_LEVEL).compress(packed)
+    return FORMAT_MSGPACK + packed
+
+
+def decode_result(raw):
+    """encode_result()로 저장된 값 또는 이전 JSON 값을 dict로 변환합니다."""
+    tag = raw[:1]
+    if tag in (FORMAT_MSGPACK, FORMAT_MSGPACK_ZSTD):
+        if msgpack is None:
+            raise RuntimeError("msgpack/zstandard is required to read this result.")
+        payload = raw[1:] if tag == FORMAT_MSGPACK else zstandard.ZstdDecompressor().decompress(raw[1:])
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(raw)
+
+
+def queue_result_size_stats(pipe, result_data, encoded):
+    """(워커/API 캐시 적중) 최종 결과 하나의 JSON 크기와 실제 저장 크기를 통계에 더하는 명령을 파이프라인에 추가합니다."""
+    pipe.hincrby(RESULT_CODEC_STATS_KEY, "stored", 1)
+    pipe.hincrby(RESULT_CODEC_STATS_KEY, "json_bytes", len(json.dumps(result_data).encode("utf-8")))
+    pipe.hincrby(RESULT_CODEC_STATS_KEY, "stored_bytes", len(encoded))
+    if encoded[:1] == FORMAT_MSGPACK_ZSTD:
+        pipe.hincrby(RESULT_CODEC_STATS_KEY, "compressed", 1)
+
+
+async def get_result_codec_stats(redis_conn):
+    stats = {k: int(v) for k, v in (await redis_conn.hgetall(RESULT_CODEC_STATS_KEY) or {}).items()}
+    stored, json_bytes, stored_bytes = stats.get("stored", 0), stats.get("json_bytes", 0), stats.get("stored_bytes", 0)
+    return {
+        "codec": Config.RESULT_CODEC if msgpack is not None else "json",
+        "stored": stored,
+        "compressed": stats.get("compressed", 0),
+        "avg_json_bytes_per_job": round(json_bytes / stored) if stored else 0,
+        "avg_stored_bytes_per_job": round(stored_bytes / stored) if stored else 0,
+        "saved_ratio": round(1 - stored_bytes / json_bytes, 4) if json_bytes else 0.0,
+    }
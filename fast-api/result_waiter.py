@@ -0,0 +1,101 @@
+# result_waiter.py
+# GET /result/{job_id_key}?wait= 롱 폴링용: API 프로세스당 pub/sub 연결 하나로 여러 요청의 대기를 처리
+#
+# 요청마다 pub/sub 연결을 열면 대기 중인 요청 수만큼 Redis 연결이 늘어나므로, 채널(stt_events:{job_id})별로
+# 대기 중인 Future를 모아 두고 공유 연결 하나에서 받은 메시지로 깨웁니다. 마지막 대기자가 빠지면 채널 구독도 해제합니다.
+import json
+import asyncio
+import logging
+import contextlib
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"Completed", "Failed"}
+
+
+class ResultWaiter:
+    def __init__(self, redis_conn, channel_prefix):
+        self._redis = redis_conn
+        self._channel_prefix = channel_prefix
+        self._pubsub = None
+        self._listener = None
+        self._waiters = {} # channel -> 대기 중인 Future 집합
+        self._lock = asyncio.Lock() # 구독/해제 명령 순서 보장
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, job_id_key):
+        """채널을 구독한 상태로 Future를 반환합니다. 작업이 최종 상태가 되면 Future가 완료됩니다.
+
+        구독한 뒤에 현재 결과를 읽어야, 읽은 직후 완료된 작업의 알림도 놓치지 않습니다.
+        """
+        channel = f"{self._channel_prefix}{job_id_key}"
+        future = asyncio.get_running_loop().create_future()
+        async with self._lock:
+            waiters = self._waiters.setdefault(channel, set())
+            waiters.add(future)
+            if len(waiters) == 1:
+                try:
+                    await self._subscribe_channel(channel)
+                except Exception:
+                    self._discard_waiter(channel, future)
+                    raise
+        try:
+            yield future
+        finally:
+            async with self._lock:
+                if self._discard_waiter(channel, future) and self._pubsub is not None:
+                    try:
+                        await self._pubsub.unsubscribe(channel)
+                    except Exception as e:
+                        logger.warning(f"Result waiter: Failed to unsubscribe {channel}: {e}")
+
+    def _discard_waiter(self, channel, future):
+        """대기자를 제거하고, 채널의 마지막 대기자였으면 True를 반환합니다."""
+        waiters = self._waiters.get(channel)
+        if waiters is None:
+            return False
+        waiters.discard(future)
+        if waiters:
+            return False
+        del self._waiters[channel]
+        return True
+
+    async def _subscribe_channel(self, channel):
+        if self._pubsub is None:
+            self._pubsub = self._redis.pubsub()
+        pubsub = self._pubsub
+        await pubsub.subscribe(channel)
+        # 리스너는 구독이 끝나 연결이 열린 뒤에 시작 (연결 전에 get_message()를 부르면 RuntimeError)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub):
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=30.0)
+                if not message or message["type"] != "message":
+                    continue
+                if json.loads(message["data"]).get("status") not in TERMINAL_STATUSES:
+                    continue
+                for future in self._waiters.get(message["channel"], ()):
+                    if not future.done():
+                        future.set_result(True)
+        except Exception as e:
+            logger.error(f"Result waiter pub/sub error: {e}", exc_info=True)
+            async with self._lock:
+                # 연결이 끊긴 pub/sub이 아직 현재 연결일 때만 상태를 초기화: 대기 중인 요청을 모두 깨워 결과를 다시 읽게 하고,
+                # 다음 구독 때 연결을 새로 만듦
+                if self._pubsub is pubsub:
+                    self._pubsub = None
+                    for waiters in self._waiters.values():
+                        for future in waiters:
+                            if not future.done():
+                                future.set_result(False)
+                    self._waiters.clear()
+            await pubsub.aclose()
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+        if self._pubsub:
+            await self._pubsub.aclose()
@@ -0,0 +1,130 @@
+# stt_backends.py
+# 워커가 사용하는 STT 엔진 추상화 (Config.STT_SERVICE_PROVIDER로 선택)
+import os
+import threading
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+OPENAI_WHISPER_API = "openai_whisper_api"
+FASTER_WHISPER = "faster_whisper"
+
+
+def stt_model_id(provider=None):
+    """캐시 키 등에 쓰는 '엔진 + 모델' 식별자. 엔진/모델이 바뀌면 이전 캐시 결과를 재사용하지 않습니다."""
+    provider = provider or Config.STT_SERVICE_PROVIDER
+    if provider == FASTER_WHISPER:
+        return f"{FASTER_WHISPER}-{Config.WHISPER_MODEL_SIZE}-{Config.WHISPER_COMPUTE_TYPE}"
+    return Config.STT_MODEL
+
+
+class STTBackend:
+    """transcribe(audio_file, filename)은 {"text", "language", "segments": [{"start", "end", "text", "avg_logprob", "no_speech_prob"}]}를 반환합니다."""
+    name = None
+    uses_openai_quota = False # True면 호출 전 공유 속도 제한기(rate_limiter)를 거침
+
+    def is_ready(self):
+        return True
+
+    def warm_up(self):
+        """워커 프로세스 시작 시 한 번 호출됩니다 (모델 미리 로드 등)."""
+
+    def transcribe(self, audio_file, filename):
+        raise NotImplementedError
+
+
+def segment_scores(seg):
+    """세그먼트의 신뢰도 지표 (낮은 avg_logprob / 높은 no_speech_prob = 신뢰도 낮음). 값이 없으면 None."""
+    avg_logprob = getattr(seg, 'avg_logprob', None)
+    no_speech_prob = getattr(seg, 'no_speech_prob', None)
+    return {
+        "avg_logprob": round(float(avg_logprob), 4) if avg_logprob is not None else None,
+        "no_speech_prob": round(float(no_speech_prob), 4) if no_speech_prob is not None else None,
+    }
+
+
+class OpenAIWhisperBackend(STTBackend):
+    name = OPENAI_WHISPER_API
+    uses_openai_quota = True
+
+    def __init__(self, openai_client):
+        self.openai_client = openai_client
+
+    def is_ready(self):
+        return self.openai_client is not None
+
+    def transcribe(self, audio_file, filename):
+        # filename의 확장자로 API가 포맷을 판단하므로 GCS 객체 이름을 그대로 넘김
+        transcription = self.openai_client.audio.transcriptions.create(
+            model=Config.STT_MODEL,
+            file=(os.path.basename(filename), audio_file),
+            language=Config.STT_LANGUAGE_CODE if Config.STT_LANGUAGE_CODE else None,
+            response_format="verbose_json"
+        )
+        segments = [
+            {"start": float(seg.start), "end": float(seg.end), "text": seg.text.strip(), **segment_scores(seg)}
+            for seg in (getattr(transcription, 'segments', None) or [])
+        ]
+        return {
+            "text": (getattr(transcription, 'text', '') or '').strip(),
+            "language": getattr(transcription, 'language', Config.STT_LANGUAGE_CODE),
+            "segments": segments,
+        }
+
+
+class FasterWhisperBackend(STTBackend):
+    """faster-whisper(CTranslate2) 로컬 엔진. 모델은 워커 프로세스당 한 번만 로드해 작업 간에 재사용합니다."""
+    name = FASTER_WHISPER
+
+    def __init__(self):
+        self._model = None
+        self._model_lock = threading.Lock() # threads/eventlet 풀에서 동시 첫 호출 시 중복 로드 방지
+
+    def _get_model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    try:
+                        from faster_whisper import WhisperModel
+                    except ImportError as e:
+                        raise RuntimeError("STT_SERVICE_PROVIDER=faster_whisper 사용 시 faster-whisper 패키지가 필요합니다.") from e
+                    logger.info(f"Loading faster-whisper model '{Config.WHISPER_MODEL_SIZE}' "
+                                f"(device={Config.WHISPER_DEVICE}, compute_type={Config.WHISPER_COMPUTE_TYPE}, pid={os.getpid()})")
+                    self._model = WhisperModel(
+                        Config.WHISPER_MODEL_SIZE,
+                        device=Config.WHISPER_DEVICE,
+                        compute_type=Config.WHISPER_COMPUTE_TYPE,
+                        cpu_threads=Config.WHISPER_CPU_THREADS,
+                        download_root=Config.WHISPER_DOWNLOAD_ROOT,
+                    )
+        return self._model
+
+    def warm_up(self):
+        self._get_model()
+
+    def transcribe(self, audio_file, filename):
+        # 파일 객체를 그대로 넘기면 faster-whisper가 PyAV로 디코딩 (임시 파일 불필요)
+        segments_iter, info = self._get_model().transcribe(
+            audio_file,
+            language=Config.STT_LANGUAGE_CODE if Config.STT_LANGUAGE_CODE else None,
+            beam_size=Config.WHISPER_BEAM_SIZE,
+        )
+        segments = [
+            {"start": round(float(seg.start), 3), "end": round(float(seg.end), 3), "text": seg.text.strip(), **segment_scores(seg)}
+            for seg in segments_iter # 제너레이터: 순회하는 동안 실제 디코딩이 진행됨
+        ]
+        return {
+            "text": " ".join(seg["text"] for seg in segments if seg["text"]),
+            "language": info.language or Config.STT_LANGUAGE_CODE,
+            "segments": segments,
+        }
+
+
+def create_stt_backend(provider, openai_client=None):
+    if provider == OPENAI_WHISPER_API:
+        return OpenAIWhisperBackend(openai_client)
+    if provider == FASTER_WHISPER:
+        return FasterWhisperBackend()
+    raise ValueError(f"Unknown STT_SERVICE_PROVIDER: {provider}")
@@ -0,0 +1,77 @@
+# stt_cache.py
+# 오디오 내용 해시(SHA-256) 기반 STT 결과 캐시 (API와 Celery 워커가 공유)
+import json
+import time
+import logging
+
+from config import Config
+from stt_backends import stt_model_id
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "stt_cache"
+CACHE_LRU_INDEX_KEY = f"{CACHE_KEY_PREFIX}:lru"     # sorted set: 캐시 키 -> 마지막 접근 시각
+CACHE_STATS_KEY = f"{CACHE_KEY_PREFIX}:stats"       # hash: hits / misses / stores / evictions
+
+
+def build_cache_key(audio_sha256):
+    language = Config.STT_LANGUAGE_CODE or "auto"
+    return f"{CACHE_KEY_PREFIX}:{stt_model_id()}:{language}:{audio_sha256}"
+
+
+async def get_cached_transcription(redis_conn, cache_key):
+    """(API, 비동기) 캐시된 STT 결과(dict)를 반환하고, 적중 시 TTL과 LRU 순서를 갱신합니다. 없으면 None."""
+    cached_json_str = await redis_conn.get(cache_key)
+    if not cached_json_str:
+        await redis_conn.hincrby(CACHE_STATS_KEY, "misses", 1)
+        return None
+
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.expire(cache_key, Config.STT_CACHE_TTL_SECONDS)
+    pipe.zadd(CACHE_LRU_INDEX_KEY, {cache_key: time.time()})
+    pipe.hincrby(CACHE_STATS_KEY, "hits", 1)
+    await pipe.execute()
+    return json.loads(cached_json_str)
+
+
+def store_cached_transcription(redis_conn, cache_key, result_data):
+    """(워커, 동기) 완료된 STT 결과를 캐시에 저장하고, 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다."""
+    cached_value = {
+        "transcription": result_data.get("transcription", ""),
+        "detected_language": result_data.get("detected_language"),
+        "segments": result_data.get("segments", []),
+    }
+    if result_data.get("error_detail"): # 음성이 없는 결과도 적중 시 같은 안내가 보이도록 함께 저장
+        cached_value["error_detail"] = result_data["error_detail"]
+    now = time.time()
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.setex(cache_key, Config.STT_CACHE_TTL_SECONDS, json.dumps(cached_value))
+    pipe.zadd(CACHE_LRU_INDEX_KEY, {cache_key: now})
+    pipe.zremrangebyscore(CACHE_LRU_INDEX_KEY, 0, now - Config.STT_CACHE_TTL_SECONDS) # TTL로 이미 만료된 항목 정리
+    pipe.hincrby(CACHE_STATS_KEY, "stores", 1)
+    pipe.zcard(CACHE_LRU_INDEX_KEY)
+    entry_count = pipe.execute()[-1]
+
+    overflow = entry_count - Config.STT_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        evicted = [key for key, _ in redis_conn.zpopmin(CACHE_LRU_INDEX_KEY, overflow)]
+        if evicted:
+            pipe = redis_conn.pipeline(transaction=False)
+            pipe.delete(*evicted)
+            pipe.hincrby(CACHE_STATS_KEY, "evictions", len(evicted))
+            pipe.execute()
+            logger.info(f"STT cache: evicted {len(evicted)} least recently used entries.")
+
+
+async def get_cache_stats(redis_conn):
+    stats = {k: int(v) for k, v in (await redis_conn.hgetall(CACHE_STATS_KEY) or {}).items()}
+    hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "stores": stats.get("stores", 0),
+        "evictions": stats.get("evictions", 0),
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "entries": await redis_conn.zcard(CACHE_LRU_INDEX_KEY),
+        "max_entries": Config.STT_CACHE_MAX_ENTRIES,
+    }
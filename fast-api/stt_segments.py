@@ -0,0 +1,70 @@
+# stt_segments.py
+# 세그먼트별 타임스탬프/신뢰도 저장소 (워커가 기록, API가 시간 범위로 조회)
+#
+#   stt_segments:{job_id}  필드별 배열(열 형식)로 인코딩한 세그먼트 - {"start": [...], "end": [...], "text": [...], ...}
+#                          + max_end: end의 누적 최댓값 (세그먼트가 겹쳐도 이진 탐색할 수 있도록)
+#
+# /result 응답에서는 segments를 빼고 segment_count만 남겨 긴 녹음도 결과 조회가 가볍도록 하고,
+# 세그먼트는 /result/{job_id}/segments?from=&to=로 필요한 구간만 가져갑니다.
+# start 배열은 정렬되어 있으므로 그대로 이진 탐색용 인덱스로 사용합니다. Whisper 세그먼트는 서로 겹칠 수 있어
+# end는 정렬되어 있지 않으므로, 구간 시작 쪽은 항상 정렬된 max_end로 찾습니다.
+import bisect
+import itertools
+
+from config import Config
+from result_codec import encode_result, decode_result
+
+SEGMENTS_KEY_PREFIX = "stt_segments"
+SEGMENT_FIELDS = ("start", "end", "text", "avg_logprob", "no_speech_prob")
+
+
+def segments_key(job_id):
+    return f"{SEGMENTS_KEY_PREFIX}:{job_id}"
+
+
+def to_columns(segments):
+    """세그먼트 dict 목록을 start 순으로 정렬된 필드별 배열로 변환합니다."""
+    ordered = sorted(segments, key=lambda seg: seg["start"])
+    columns = {field: [seg.get(field) for seg in ordered] for field in SEGMENT_FIELDS}
+    columns["max_end"] = list(itertools.accumulate(columns["end"], max))
+    return columns
+
+
+def split_result_segments(result_data):
+    """결과에서 segments를 분리해 (segment_count가 들어간 결과, segments)를 반환합니다. segments가 없으면 (원본, None)."""
+    if "segments" not in result_data:
+        return result_data, None
+    segments = result_data["segments"] or []
+    light_result = {k: v for k, v in result_data.items() if k != "segments"}
+    light_result["segment_count"] = len(segments)
+    return light_result, segments
+
+
+def queue_segments(pipe, job_id, segments):
+    """(API/워커) 세그먼트를 열 형식으로 저장하는 명령을 파이프라인에 추가합니다."""
+    pipe.setex(segments_key(job_id), Config.REDIS_RESULT_EXPIRE_SECONDS, encode_result(to_columns(segments)))
+
+
+def select_time_range(columns, from_seconds=None, to_seconds=None):
+    """[from_seconds, to_seconds)와 겹치는 세그먼트를 (첫 세그먼트 인덱스, dict 목록)으로 반환합니다."""
+    starts, ends = columns["start"], columns["end"]
+    first = 0
+    if from_seconds is not None:
+        # max_end가 from 이하인 앞쪽 세그먼트는 모두 from 이전에 끝남 (max_end가 없는 이전 데이터는 여기서 계산)
+        max_ends = columns.get("max_end") or list(itertools.accumulate(ends, max))
+        first = bisect.bisect_right(max_ends, from_seconds)
+    last = len(starts) if to_seconds is None else bisect.bisect_left(starts, to_seconds)
+    fields = [field for field in SEGMENT_FIELDS if field in columns]
+    # 범위 안에도 더 긴 앞 세그먼트에 가려 from 이전에 끝나는 세그먼트가 있을 수 있으므로 한 번 더 거름
+    selected = [
+        {"index": i, **{field: columns[field][i] for field in fields}}
+        for i in range(first, max(first, last))
+        if from_seconds is None or ends[i] > from_seconds
+    ]
+    return (selected[0]["index"] if selected else first), selected
+
+
+async def get_segments(redis_conn, job_id):
+    """(API, 비동기) 저장된 세그먼트 열 데이터를 반환합니다. 없으면 None. redis_conn은 decode_responses=False."""
+    stored = await redis_conn.get(segments_key(job_id))
+    return decode_result(stored) if stored else None
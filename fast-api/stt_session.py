@@ -0,0 +1,65 @@
+# stt_session.py
+# 여러 청크 업로드를 하나의 세션 전사본으로 모으는 Redis 저장소 (API와 Celery 워커가 공유)
+#
+#   stt_session:{session_id}:jobs     hash: seq -> job_id (API가 업로드 시 기록, 같은 seq 재업로드 시 교체)
+#   stt_session:{session_id}:results  hash: job_id -> 청크 결과 JSON (워커가 기록)
+#
+# 결과를 job_id 기준으로 저장하므로, 재업로드로 교체된 이전 작업이 늦게 끝나도 새 결과를 덮어쓰지 않습니다.
+import re
+import json
+
+from config import Config
+
+SESSION_KEY_PREFIX = "stt_session"
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def session_jobs_key(session_id):
+    return f"{SESSION_KEY_PREFIX}:{session_id}:jobs"
+
+
+def session_results_key(session_id):
+    return f"{SESSION_KEY_PREFIX}:{session_id}:results"
+
+
+def queue_session_job(pipe, session_id, seq, job_id):
+    """(API) 업로드된 청크를 세션의 seq 위치에 등록하는 명령을 파이프라인에 추가합니다."""
+    pipe.hset(session_jobs_key(session_id), str(seq), job_id)
+    pipe.expire(session_jobs_key(session_id), Config.STT_SESSION_EXPIRE_SECONDS)
+
+
+def queue_session_result(pipe, session_id, job_id, result_data):
+    """(API/워커) 청크 작업 결과를 세션에 기록하는 명령을 파이프라인에 추가합니다 (segments는 제외)."""
+    chunk_result = {k: v for k, v in result_data.items() if k in ("status", "transcription", "detected_language", "error", "error_detail")}
+    pipe.hset(session_results_key(session_id), job_id, json.dumps(chunk_result))
+    pipe.expire(session_results_key(session_id), Config.STT_SESSION_EXPIRE_SECONDS)
+
+
+async def get_session_transcript(redis_conn, session_id):
+    """(API) seq 순서로 정렬된 청크 상태와, 완료된 청크 텍스트를 이어붙인 세션 전사본을 반환합니다. 세션이 없으면 None."""
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.hgetall(session_jobs_key(session_id))
+    pipe.hgetall(session_results_key(session_id))
+    jobs, results = await pipe.execute()
+    if not jobs:
+        return None
+
+    chunks = []
+    counts = {"Processing": 0, "Completed": 0, "Failed": 0}
+    for seq, job_id in sorted(jobs.items(), key=lambda item: int(item[0])):
+        chunk = {"seq": int(seq), "job_id": job_id, "status": "Processing"}
+        if job_id in results:
+            chunk.update(json.loads(results[job_id]))
+        counts[chunk["status"]] = counts.get(chunk["status"], 0) + 1
+        chunks.append(chunk)
+
+    return {
+        "session_id": session_id,
+        "chunk_count": len(chunks),
+        "completed": counts["Completed"],
+        "failed": counts["Failed"],
+        "processing": counts["Processing"],
+        "is_final": counts["Processing"] == 0,
+        "transcript": " ".join(c["transcription"] for c in chunks if c["status"] == "Completed" and c.get("transcription")),
+        "chunks": chunks,
+    }
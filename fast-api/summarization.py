@@ -0,0 +1,55 @@
+# summarization.py
+# 긴 텍스트의 map-reduce 요약을 위한 윈도우 분할과 부분 요약 캐시 키
+import hashlib
+
+from config import Config
+
+PART_CACHE_KEY_PREFIX = "summary_cache:part"
+
+
+def summary_window_chars():
+    """한 번의 요약 호출에 넣을 최대 글자 수 (SUMMARY_WINDOW_TOKENS를 글자 수로 환산)."""
+    return max(1, int(Config.SUMMARY_WINDOW_TOKENS * Config.CHAT_ESTIMATED_CHARS_PER_TOKEN))
+
+
+def split_into_windows(text, max_chars):
+    """텍스트를 max_chars 이하의 윈도우로 나눕니다 (가능하면 윈도우 후반부의 공백/줄바꿈에서 자름).
+
+    각 절단점은 그 앞의 텍스트만으로 결정되므로, 세션 전사본처럼 뒤에 텍스트가 추가되어도
+    이전 윈도우들은 그대로 유지되어 부분 요약 캐시를 재사용할 수 있습니다.
+    """
+    windows = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        search_from = start + int(max_chars * 0.8)
+        cut = max(text.rfind(" ", search_from, end), text.rfind("\n", search_from, end))
+        if cut <= start:
+            cut = end
+        windows.append(text[start:cut].strip())
+        start = cut
+    windows.append(text[start:].strip())
+    return [w for w in windows if w]
+
+
+def group_texts(texts, max_chars):
+    """연속된 텍스트들을 합친 길이가 max_chars 이하가 되도록 묶습니다 (각 묶음에 최소 1개)."""
+    groups = []
+    current, current_chars = [], 0
+    for text in texts:
+        if current and current_chars + len(text) > max_chars:
+            groups.append(current)
+            current, current_chars = [], 0
+        current.append(text)
+        current_chars += len(text)
+    if current:
+        groups.append(current)
+    return groups
+
+
+def part_cache_key(system_prompt, text):
+    """부분 요약 캐시 키: (모델, temperature, 프롬프트, 텍스트)가 같으면 같은 요약을 재사용합니다."""
+    digest = hashlib.sha256(
+        "\x00".join([Config.SUMMARY_MODEL, str(Config.SUMMARY_TEMPERATURE), system_prompt, text]).encode("utf-8")
+    ).hexdigest()
+    return f"{PART_CACHE_KEY_PREFIX}:{digest}"
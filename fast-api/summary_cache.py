@@ -0,0 +1,115 @@
+# summary_cache.py
+# (텍스트, 모델, 프롬프트, temperature) 해시 기반 요약 결과 캐시 (API와 Celery 워커가 공유)
+# 항목 수가 아닌 바이트 예산(SUMMARY_CACHE_MAX_BYTES)으로 크기를 제한하고, 넘으면 LRU 순서로 제거합니다.
+import json
+import time
+import hashlib
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_KEY_PREFIX = "summary_cache"
+SUMMARY_CACHE_LRU_INDEX_KEY = f"{SUMMARY_CACHE_KEY_PREFIX}:lru"      # sorted set: 캐시 키 -> 마지막 접근 시각
+SUMMARY_CACHE_SIZES_KEY = f"{SUMMARY_CACHE_KEY_PREFIX}:sizes"        # hash: 캐시 키 -> 항목 크기(바이트)
+SUMMARY_CACHE_STATS_KEY = f"{SUMMARY_CACHE_KEY_PREFIX}:stats"        # hash: hits / misses / stores / evictions / bytes
+
+# KEYS: (항목 키, LRU 인덱스, 크기 hash, 통계 hash), ARGV: (값, TTL 초, 현재 시각, 최대 바이트)
+# 저장과 바이트 합계 갱신, TTL 만료 항목 정리, 예산 초과분 LRU 제거를 한 번에 원자적으로 처리하고 제거한 항목 수를 반환
+_STORE_AND_EVICT_LUA = """
+local ttl = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local max_bytes = tonumber(ARGV[4])
+local size = string.len(KEYS[1]) + string.len(ARGV[1])
+local previous = tonumber(redis.call('HGET', KEYS[3], KEYS[1]) or '0')
+redis.call('SETEX', KEYS[1], ttl, ARGV[1])
+redis.call('ZADD', KEYS[2], now, KEYS[1])
+redis.call('HSET', KEYS[3], KEYS[1], size)
+redis.call('HINCRBY', KEYS[4], 'stores', 1)
+local total = redis.call('HINCRBY', KEYS[4], 'bytes', size - previous)
+
+local function forget(key)
+    local key_size = tonumber(redis.call('HGET', KEYS[3], key) or '0')
+    redis.call('HDEL', KEYS[3], key)
+    redis.call('DEL', key)
+    return redis.call('HINCRBY', KEYS[4], 'bytes', -key_size)
+end
+
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], 0, now - ttl)
+for _, key in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], key)
+    total = forget(key)
+end
+
+local evicted = 0
+while total > max_bytes do
+    local popped = redis.call('ZPOPMIN', KEYS[2])
+    if #popped == 0 then
+        break
+    end
+    total = forget(popped[1])
+    evicted = evicted + 1
+end
+if evicted > 0 then
+    redis.call('HINCRBY', KEYS[4], 'evictions', evicted)
+end
+return evicted
+"""
+
+_store_scripts = {}
+
+
+def _get_script(redis_conn):
+    script = _store_scripts.get(id(redis_conn))
+    if script is None:
+        script = redis_conn.register_script(_STORE_AND_EVICT_LUA)
+        _store_scripts[id(redis_conn)] = script
+    return script
+
+
+def build_summary_cache_key(text):
+    digest = hashlib.sha256(
+        "\x00".join([Config.SUMMARY_MODEL, Config.SUMMARY_PROMPT, str(Config.SUMMARY_TEMPERATURE), text]).encode("utf-8")
+    ).hexdigest()
+    return f"{SUMMARY_CACHE_KEY_PREFIX}:result:{digest}"
+
+
+async def get_cached_summary(redis_conn, cache_key):
+    """(API, 비동기) 캐시된 요약 문자열을 반환하고, 적중 시 TTL과 LRU 순서를 갱신합니다. 없으면 None."""
+    cached_json_str = await redis_conn.get(cache_key)
+    if not cached_json_str:
+        await redis_conn.hincrby(SUMMARY_CACHE_STATS_KEY, "misses", 1)
+        return None
+
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.expire(cache_key, Config.SUMMARY_CACHE_TTL_SECONDS)
+    pipe.zadd(SUMMARY_CACHE_LRU_INDEX_KEY, {cache_key: time.time()})
+    pipe.hincrby(SUMMARY_CACHE_STATS_KEY, "hits", 1)
+    await pipe.execute()
+    return json.loads(cached_json_str)["summary"]
+
+
+def store_cached_summary(redis_conn, cache_key, summary):
+    """(워커, 동기) 완료된 요약을 캐시에 저장하고, 바이트 예산을 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다."""
+    evicted = _get_script(redis_conn)(
+        keys=[cache_key, SUMMARY_CACHE_LRU_INDEX_KEY, SUMMARY_CACHE_SIZES_KEY, SUMMARY_CACHE_STATS_KEY],
+        args=[json.dumps({"summary": summary}), Config.SUMMARY_CACHE_TTL_SECONDS, time.time(), Config.SUMMARY_CACHE_MAX_BYTES],
+    )
+    if evicted:
+        logger.info(f"Summary cache: evicted {evicted} least recently used entries.")
+
+
+async def get_summary_cache_stats(redis_conn):
+    stats = {k: int(v) for k, v in (await redis_conn.hgetall(SUMMARY_CACHE_STATS_KEY) or {}).items()}
+    hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "stores": stats.get("stores", 0),
+        "evictions": stats.get("evictions", 0),
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "entries": await redis_conn.zcard(SUMMARY_CACHE_LRU_INDEX_KEY),
+        "bytes": stats.get("bytes", 0),
+        "max_bytes": Config.SUMMARY_CACHE_MAX_BYTES,
+    }
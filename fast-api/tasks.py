@@ -1,16 +1,35 @@
 # tasks.py
-from celery import Celery
+from celery import Celery, chord
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, before_task_publish, task_prerun, task_postrun
+from kombu import Exchange, Queue
+import io
 import os
 import redis
 import json
 import tempfile
 import logging
+import subprocess
+import time
+from datetime import datetime
 
 from config import Config
+from stt_cache import store_cached_transcription
+from stt_session import queue_session_result
+from result_codec import encode_result, queue_result_size_stats
+from stt_segments import split_result_segments, queue_segments
+from metrics import STAGE_SECONDS, TASKS_IN_FLIGHT, TASKS_TOTAL, AUDIO_BYTES, OPENAI_ERRORS, TRANSCODE_SAVED_BYTES, start_worker_metrics_server, mark_process_dead
+from tracing import init_tracing, start_span, inject_trace_context, start_task_span, end_task_span
+from summarization import summary_window_chars, split_into_windows, group_texts, part_cache_key
+from summary_cache import build_summary_cache_key, store_cached_summary
+from rate_limiter import acquire_capacity, retry_countdown, RateLimitWaitTooLong
+from stt_backends import create_stt_backend
+from audio_processing import ffmpeg_available, probe_duration_seconds, detect_silences, plan_split_points, cut_audio_segment, decode_to_pcm, encode_pcm, probe_bit_rate, transcode_for_stt
+from vad import detect_speech_regions, extract_regions, remap_segments
 
 from google.cloud import storage as gcs_storage
 from google.auth.exceptions import DefaultCredentialsError
-from openai import OpenAI, APIError
+from google.api_core.exceptions import NotFound
+from openai import OpenAI, APIError, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +38,27 @@ celery_app = Celery('tasks',
                     broker=Config.CELERY_BROKER_URL,
                     backend=Config.CELERY_RESULT_BACKEND)
 
+# 작업 우선순위: interactive(실시간 녹음 청크/요약 버튼)와 batch(보관 녹음 백필)는 서로 다른 큐로 보냄
+# -Q 없이 실행한 워커는 두 큐를 모두 소비하며, 'priority' 순서 전략으로 항상 앞의 큐(interactive)를 먼저 확인함
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+TASK_PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+# 워커가 소비하는 큐 (priority 전략이므로 앞의 큐부터 확인). 이전 기본 큐는 새 메시지가 들어오지 않으므로 마지막에 둠
+CONSUMED_QUEUES = (Config.CELERY_INTERACTIVE_QUEUE, Config.CELERY_BATCH_QUEUE) + \
+    ((Config.CELERY_LEGACY_QUEUE,) if Config.CELERY_LEGACY_QUEUE != "none" else ())
+
+celery_app.conf.update(
+    task_queues=tuple(Queue(name, Exchange(name), routing_key=name) for name in CONSUMED_QUEUES),
+    task_default_queue=Config.CELERY_INTERACTIVE_QUEUE,
+    broker_transport_options={"queue_order_strategy": "priority"},
+    worker_prefetch_multiplier=1, # 긴 batch 작업이 끝날 때까지 다음 메시지를 미리 잡아두지 않도록
+)
+
+def task_queue_options(priority=PRIORITY_INTERACTIVE):
+    """apply_async()/signature.set()에 넘길 큐 지정 옵션."""
+    return {"queue": Config.CELERY_BATCH_QUEUE if priority == PRIORITY_BATCH else Config.CELERY_INTERACTIVE_QUEUE}
+
 # --- 클라이언트 초기화 ---
 gcs_task_client = None
 try:
@@ -39,22 +79,103 @@ try:
 except Exception as e:
     logger.error(f"Celery Worker: Redis (for results) 연결 오류: {e}", exc_info=True)
 
+# 인라인 오디오(바이너리) 읽기용 - 결과 클라이언트는 decode_responses=True라 별도로 둠
+redis_task_binary_client = redis.Redis(
+    host=Config.REDIS_HOST, port=Config.REDIS_PORT, db=Config.REDIS_DB_FOR_RESULTS, decode_responses=False
+)
+
 openai_client = None
 if Config.OPENAI_API_KEY:
     try:
-        openai_client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        # SDK 자체 재시도는 끄고, 속도 제한기를 거치는 Celery 재시도(지수 백오프)로 일원화
+        openai_client = OpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0)
         logger.info("Celery Worker: OpenAI Client initialized.")
     except Exception as e:
         logger.error(f"Celery Worker: OpenAI Client 초기화 중 오류 발생: {e}", exc_info=True)
 else:
     logger.error("Celery Worker: OPENAI_API_KEY가 설정되지 않았습니다.")
 
+stt_backend = None
+try:
+    stt_backend = create_stt_backend(Config.STT_SERVICE_PROVIDER, openai_client)
+    logger.info(f"Celery Worker: STT backend '{stt_backend.name}' selected.")
+except ValueError as e:
+    logger.error(f"Celery Worker: {e}")
+
+@worker_process_init.connect
+def warm_up_stt_backend(**kwargs):
+    # prefork 자식 프로세스마다 한 번 모델을 로드해 두고 이후 작업에서 재사용 (fork 이전 로드는 CTranslate2가 안전하지 않음)
+    if stt_backend:
+        try:
+            stt_backend.warm_up()
+        except Exception as e:
+            logger.error(f"Celery Worker: STT backend warm-up failed: {e}", exc_info=True)
+
+# --- Prometheus 지표(큐 대기 시간, 실행 중/종료된 작업 수)와 트레이싱(작업 span) ---
+@before_task_publish.connect
+def stamp_publish_time(headers=None, **kwargs):
+    if headers is not None:
+        headers["sent_at"] = time.time()
+    inject_trace_context(headers)
+
+@task_prerun.connect
+def record_task_start(task=None, **kwargs):
+    start_task_span(task)
+    TASKS_IN_FLIGHT.labels(task=task.name).inc()
+    sent_at = task.request.get("sent_at")
+    if sent_at:
+        # 재시도(countdown)는 예약 시각부터 대기 시간으로 계산
+        eta = task.request.eta
+        ready_at = max(sent_at, datetime.fromisoformat(eta).timestamp()) if eta else sent_at
+        STAGE_SECONDS.labels(stage="queue_wait").observe(max(0.0, time.time() - ready_at))
+
+@task_postrun.connect
+def record_task_end(task=None, state=None, retval=None, **kwargs):
+    TASKS_IN_FLIGHT.labels(task=task.name).dec()
+    TASKS_TOTAL.labels(task=task.name, state=state or "UNKNOWN").inc()
+    end_task_span(task, state, retval)
+
+@worker_init.connect
+def start_worker_exporters(**kwargs):
+    init_tracing("stt-worker")
+    if Config.WORKER_METRICS_PORT:
+        start_worker_metrics_server(Config.WORKER_METRICS_PORT)
+        logger.info(f"Celery Worker: Prometheus metrics exporter listening on :{Config.WORKER_METRICS_PORT}")
+
+@worker_process_shutdown.connect
+def clean_up_process_metrics(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+# 결과 상태 변경 알림용 Redis pub/sub 채널 접두사 (API의 /ws/results가 구독)
+RESULT_EVENTS_CHANNEL_PREFIX = "stt_events:"
+
+# 트랜스코딩 전후 바이트 통계 (hash: transcoded / skipped / bytes_before / bytes_after) - API의 /stats/transcode가 조회
+TRANSCODE_STATS_KEY = "stt_transcode:stats"
+
+# VAD 분석용 디코딩 샘플레이트 (Whisper 입력과 동일)
+VAD_SAMPLE_RATE = 16000
+
+# 잠시 뒤 다시 시도하면 성공할 수 있는 오류 (429, 연결/타임아웃, 5xx, 속도 제한 대기 초과)
+RETRYABLE_OPENAI_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError, RateLimitWaitTooLong)
+
 # --- 헬퍼 함수 ---
-def store_result_in_redis(job_id_key, data_dict):
+def store_result_in_redis(job_id_key, data_dict, session_id=None):
     if redis_task_client:
         result_key = f"stt_result:{job_id_key}" # Key prefix 통일
         try:
-            redis_task_client.setex(result_key, Config.REDIS_RESULT_EXPIRE_SECONDS, json.dumps(data_dict))
+            data_dict, segments = split_result_segments(data_dict) # 세그먼트는 시간 범위 조회용 키에 따로 저장
+            encoded_result = encode_result(data_dict)
+            pipe = redis_task_client.pipeline(transaction=False)
+            pipe.setex(result_key, Config.REDIS_RESULT_EXPIRE_SECONDS, encoded_result)
+            if data_dict.get("status") in ("Completed", "Failed"):
+                queue_result_size_stats(pipe, data_dict, encoded_result)
+            if segments:
+                queue_segments(pipe, job_id_key, segments)
+            pipe.publish(f"{RESULT_EVENTS_CHANNEL_PREFIX}{job_id_key}", json.dumps({"job_id": job_id_key, **data_dict}))
+            if session_id: # 세션 청크이면 세션 전사본에도 같은 결과 반영
+                queue_session_result(pipe, session_id, job_id_key, data_dict)
+            with STAGE_SECONDS.labels(stage="redis_write").time(), start_span("redis.store_result", job_id=job_id_key, status=data_dict.get("status")):
+                pipe.execute()
             logger.info(f"Job {job_id_key}: Result stored in Redis. Key: {result_key}")
         except Exception as e:
             logger.error(f"Job {job_id_key}: Failed to store result in Redis: {e}", exc_info=True)
@@ -65,82 +186,427 @@ def delete_gcs_file(bucket_name, object_name, job_id="N/A"):
     if gcs_task_client and bucket_name and object_name:
         try:
             bucket = gcs_task_client.bucket(bucket_name)
-            blob = bucket.blob(object_name)
-            if blob.exists():
-                blob.delete()
-                logger.info(f"Job {job_id}: Deleted GCS file: gs://{bucket_name}/{object_name}")
-            else:
-                logger.warning(f"Job {job_id}: GCS file not found for deletion: gs://{bucket_name}/{object_name}")
+            bucket.blob(object_name).delete()
+            logger.info(f"Job {job_id}: Deleted GCS file: gs://{bucket_name}/{object_name}")
+        except NotFound:
+            logger.warning(f"Job {job_id}: GCS file not found for deletion: gs://{bucket_name}/{object_name}")
         except Exception as e:
             logger.error(f"Job {job_id}: Error deleting GCS file gs://{bucket_name}/{object_name}: {e}", exc_info=True)
     else:
         if not gcs_task_client: logger.warning(f"Job {job_id}: GCS client not available for GCS deletion.")
         if not bucket_name or not object_name: logger.warning(f"Job {job_id}: Bucket/object name missing for GCS deletion.")
 
+def download_audio_to_buffer(bucket_name, object_name):
+    """GCS 객체를 SpooledTemporaryFile로 내려받습니다 (임계값 이하는 메모리, 초과분만 디스크).
+
+    별도의 exists() 확인 없이 다운로드 응답의 404로 누락을 판단합니다.
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=Config.STT_INMEMORY_BUFFER_MAX_BYTES)
+    try:
+        with STAGE_SECONDS.labels(stage="gcs_download").time(), start_span("gcs.download", gcs_object=object_name):
+            gcs_task_client.bucket(bucket_name).blob(object_name).download_to_file(buffer)
+    except NotFound as e:
+        buffer.close()
+        raise FileNotFoundError(f"Audio file not found in GCS: gs://{bucket_name}/{object_name}") from e
+    except Exception:
+        buffer.close()
+        raise
+    AUDIO_BYTES.labels(stage="downloaded").inc(buffer.tell())
+    buffer.seek(0)
+    return buffer
+
+def load_inline_audio(inline_audio_key):
+    """API가 Redis에 담아 둔 작은 오디오를 BytesIO로 반환합니다. 재시도에 대비해 키 삭제는 작업 종료 시 수행합니다."""
+    with STAGE_SECONDS.labels(stage="inline_load").time(), start_span("redis.load_inline_audio"):
+        audio_bytes = redis_task_binary_client.get(inline_audio_key)
+    if not audio_bytes:
+        raise FileNotFoundError(f"Inline audio expired or not found in Redis: {inline_audio_key}")
+    AUDIO_BYTES.labels(stage="downloaded").inc(len(audio_bytes))
+    return io.BytesIO(audio_bytes)
+
+def download_audio_to_file(bucket_name, object_name, file_path):
+    """ffmpeg 분할 검사처럼 파일 경로가 필요한 경우에만 사용합니다."""
+    try:
+        with STAGE_SECONDS.labels(stage="gcs_download").time(), start_span("gcs.download", gcs_object=object_name):
+            gcs_task_client.bucket(bucket_name).blob(object_name).download_to_filename(file_path)
+        AUDIO_BYTES.labels(stage="downloaded").inc(os.path.getsize(file_path))
+    except NotFound as e:
+        raise FileNotFoundError(f"Audio file not found in GCS: gs://{bucket_name}/{object_name}") from e
+
+def trim_silence(audio_file, filename, task_log_prefix):
+    """VAD로 무음 구간을 제거한 오디오를 준비해 (audio_file, filename, offset_map)을 반환합니다.
+
+    음성이 전혀 없으면 audio_file이 None이고, 제거할 무음이 적거나 디코딩에 실패하면 원본을 그대로(offset_map=None) 돌려줍니다.
+    """
+    try:
+        pcm_bytes = decode_to_pcm(audio_file, VAD_SAMPLE_RATE)
+    except subprocess.CalledProcessError as e:
+        logger.warning(f"{task_log_prefix}: VAD decode failed, sending original audio: {e.stderr.decode(errors='replace')[:200]}")
+        return audio_file, filename, None
+
+    regions = detect_speech_regions(pcm_bytes, VAD_SAMPLE_RATE)
+    total_seconds = len(pcm_bytes) / 2 / VAD_SAMPLE_RATE
+    speech_seconds = sum(end - start for start, end in regions)
+    logger.info(f"{task_log_prefix}: VAD found {speech_seconds:.1f}s of speech in {total_seconds:.1f}s ({len(regions)} regions).")
+    if not regions:
+        return None, filename, None
+    if total_seconds - speech_seconds < total_seconds * Config.STT_VAD_MIN_TRIM_RATIO:
+        return audio_file, filename, None
+
+    speech_pcm, offset_map = extract_regions(pcm_bytes, VAD_SAMPLE_RATE, regions)
+    encoded_bytes, file_extension = encode_pcm(speech_pcm, VAD_SAMPLE_RATE)
+    return io.BytesIO(encoded_bytes), os.path.splitext(filename)[0] + file_extension, offset_map
+
+def transcribe_audio_file(audio_file, filename, task_log_prefix=""):
+    """설정된 STT 엔진으로 오디오 파일 객체를 변환하여 {"text", "language", "segments"} 딕셔너리로 반환합니다.
+
+    VAD가 켜져 있으면 음성 구간만 엔진에 보내고 segments 타임스탬프를 원본 오디오 기준으로 되돌립니다.
+    """
+    offset_map = None
+    if Config.STT_VAD_ENABLED and ffmpeg_available():
+        with STAGE_SECONDS.labels(stage="vad").time(), start_span("stt.vad"):
+            audio_file, filename, offset_map = trim_silence(audio_file, filename, task_log_prefix)
+        if audio_file is None: # 음성 없음: API 호출 없이 빈 결과
+            return {"text": "", "language": Config.STT_LANGUAGE_CODE, "segments": []}
+
+    if stt_backend.uses_openai_quota:
+        with STAGE_SECONDS.labels(stage="stt_rate_limit_wait").time(), start_span("stt.rate_limit_wait"):
+            acquire_stt_capacity(audio_file)
+    with STAGE_SECONDS.labels(stage="stt_call").time(), start_span("stt.transcribe", stt_backend=stt_backend.name):
+        stt_output = stt_backend.transcribe(audio_file, filename)
+    if offset_map:
+        stt_output["segments"] = remap_segments(stt_output["segments"], offset_map)
+    return stt_output
+
+def acquire_stt_capacity(audio_file):
+    """Whisper 호출 전 요청 수/오디오 길이(파일 크기로 추정) 버킷에서 용량을 확보합니다."""
+    audio_file.seek(0, os.SEEK_END)
+    estimated_seconds = audio_file.tell() / Config.STT_ESTIMATED_BYTES_PER_SECOND
+    audio_file.seek(0)
+    acquire_capacity(redis_task_client, [
+        ("stt_requests", Config.OPENAI_STT_REQUESTS_PER_MINUTE, 1),
+        ("stt_audio_seconds", Config.OPENAI_STT_AUDIO_SECONDS_PER_MINUTE, estimated_seconds),
+    ])
+
+def acquire_chat_capacity(*message_texts):
+    """Chat 호출 전 요청 수/토큰(글자 수로 추정) 버킷에서 용량을 확보합니다."""
+    estimated_tokens = sum(len(text) for text in message_texts) / Config.CHAT_ESTIMATED_CHARS_PER_TOKEN
+    acquire_capacity(redis_task_client, [
+        ("chat_requests", Config.OPENAI_CHAT_REQUESTS_PER_MINUTE, 1),
+        ("chat_tokens", Config.OPENAI_CHAT_TOKENS_PER_MINUTE, estimated_tokens),
+    ])
+
+def get_openai_retry_countdown(task, exc, task_log_prefix):
+    """일시적인 오류이고 재시도 횟수가 남았으면 재시도 대기 시간(초)을, 아니면 None을 반환합니다."""
+    if isinstance(exc, (APIError, RateLimitWaitTooLong)):
+        OPENAI_ERRORS.labels(error_type=type(exc).__name__).inc()
+    if not isinstance(exc, RETRYABLE_OPENAI_ERRORS) or task.request.retries >= task.max_retries:
+        return None
+    if isinstance(exc, RateLimitWaitTooLong):
+        retry_after = exc.retry_after
+    else:
+        response = getattr(exc, 'response', None)
+        try:
+            retry_after = float(response.headers.get('retry-after')) if response is not None else None
+        except (TypeError, ValueError):
+            retry_after = None
+    countdown = retry_countdown(task.request.retries, retry_after)
+    logger.warning(f"{task_log_prefix}: {type(exc).__name__}, retry {task.request.retries + 1}/{task.max_retries} in {countdown:.1f}s")
+    return countdown
+
+def build_stt_result(final_text, detected_language, segments):
+    result_data = {
+        "status": "Completed", "transcription": final_text, "detected_language": detected_language, "segments": segments
+    }
+    if not final_text:
+        result_data["error_detail"] = "Whisper API 결과가 비어있거나 음성이 감지되지 않았습니다."
+    return result_data
+
+def cache_stt_result(cache_key, result_data, task_log_prefix):
+    if not cache_key or not redis_task_client:
+        return
+    try:
+        store_cached_transcription(redis_task_client, cache_key, result_data)
+    except Exception as e:
+        logger.error(f"{task_log_prefix}: Failed to store STT cache entry: {e}", exc_info=True)
+
+def may_need_local_processing(audio_size_bytes):
+    """임시 파일로 받아 트랜스코딩/분할 검사(ffprobe)를 할 대상인지 여부. 작은 파일은 메모리 버퍼로 바로 처리합니다."""
+    if not (Config.STT_TRANSCODE_ENABLED or Config.STT_SPLIT_ENABLED) or not ffmpeg_available():
+        return False
+    return audio_size_bytes is None or audio_size_bytes >= Config.STT_SPLIT_PROBE_MIN_BYTES
+
+def record_transcode_stats(task_log_prefix, bytes_before, bytes_after=None):
+    # Prometheus: Job별 절감량 분포 + 단계별 바이트 합계 (transcode_input 대비 transcoded)
+    TRANSCODE_SAVED_BYTES.observe(0 if bytes_after is None else bytes_before - bytes_after)
+    if bytes_after is not None:
+        AUDIO_BYTES.labels(stage="transcode_input").inc(bytes_before)
+        AUDIO_BYTES.labels(stage="transcoded").inc(bytes_after)
+    if not redis_task_client:
+        return
+    try:
+        pipe = redis_task_client.pipeline(transaction=False)
+        if bytes_after is None:
+            pipe.hincrby(TRANSCODE_STATS_KEY, "skipped", 1)
+        else:
+            pipe.hincrby(TRANSCODE_STATS_KEY, "transcoded", 1)
+            pipe.hincrby(TRANSCODE_STATS_KEY, "bytes_before", bytes_before)
+            pipe.hincrby(TRANSCODE_STATS_KEY, "bytes_after", bytes_after)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"{task_log_prefix}: Failed to record transcode stats: {e}", exc_info=True)
+
+def transcode_if_beneficial(file_path, task_log_prefix):
+    """이미 압축된 오디오가 아니면 16kHz mono Opus/FLAC으로 변환해 새 파일 경로를, 아니면 None을 반환합니다."""
+    if not Config.STT_TRANSCODE_ENABLED:
+        return None
+    bytes_before = os.path.getsize(file_path)
+    bit_rate = probe_bit_rate(file_path)
+    if bit_rate is not None and bit_rate <= Config.STT_TRANSCODE_SKIP_BIT_RATE:
+        logger.info(f"{task_log_prefix}: Audio already compact ({bit_rate} bps), skipping transcode.")
+        record_transcode_stats(task_log_prefix, bytes_before)
+        return None
+
+    try:
+        output_path = transcode_for_stt(file_path, f"{os.path.splitext(file_path)[0]}_stt",
+                                        Config.STT_TRANSCODE_SAMPLE_RATE, Config.STT_TRANSCODE_OPUS_BIT_RATE)
+    except subprocess.CalledProcessError as e:
+        logger.warning(f"{task_log_prefix}: Transcode failed, using original audio: {e.stderr.decode(errors='replace')[:200]}")
+        return None
+    bytes_after = os.path.getsize(output_path)
+    if bytes_after >= bytes_before:
+        os.remove(output_path)
+        record_transcode_stats(task_log_prefix, bytes_before)
+        return None
+
+    record_transcode_stats(task_log_prefix, bytes_before, bytes_after)
+    logger.info(f"{task_log_prefix}: Transcoded {bytes_before} -> {bytes_after} bytes ({(1 - bytes_after / bytes_before) * 100:.1f}% saved).")
+    return output_path
+
+def plan_long_audio_split(file_path, task_log_prefix):
+    """분할이 필요한 긴 오디오라면 [(start, end), ...] 구간 목록을, 아니면 None을 반환합니다."""
+    if not Config.STT_SPLIT_ENABLED:
+        return None
+    file_size = os.path.getsize(file_path)
+    duration = probe_duration_seconds(file_path)
+    if not duration:
+        return None
+    if duration <= Config.STT_SPLIT_MIN_DURATION_SECONDS and file_size <= Config.STT_MAX_UPLOAD_BYTES:
+        return None
+
+    # stream copy로 자르므로 구간 크기는 원본 비트레이트에 비례 -> 업로드 한도의 90% 이내로 구간 길이 제한
+    bytes_per_second = file_size / duration
+    max_segment_seconds = min(Config.STT_SPLIT_TARGET_SEGMENT_SECONDS, Config.STT_MAX_UPLOAD_BYTES * 0.9 / bytes_per_second)
+    silences = detect_silences(file_path, Config.STT_SPLIT_SILENCE_NOISE_DB, Config.STT_SPLIT_SILENCE_MIN_SECONDS)
+    split_plan = plan_split_points(duration, silences, max_segment_seconds)
+    logger.info(f"{task_log_prefix}: Audio {duration:.1f}s / {file_size} bytes, {len(silences)} silences -> {len(split_plan)} segments.")
+    return split_plan if len(split_plan) > 1 else None
+
+def dispatch_segment_fanout(job_id, bucket_name, object_name, source_path, split_plan, task_log_prefix, audio_cache_key=None, session_id=None, priority=PRIORITY_INTERACTIVE):
+    """구간별로 잘라 GCS에 올린 뒤, 구간 변환 작업들을 chord로 실행하고 병합 작업을 콜백으로 연결합니다."""
+    base_key, _ = os.path.splitext(object_name)
+    _, file_extension = os.path.splitext(source_path) # 트랜스코딩된 경우 원본과 확장자가 다름
+    bucket = gcs_task_client.bucket(bucket_name)
+    uploaded_keys = []
+    header = []
+    try:
+        for index, (start, end) in enumerate(split_plan):
+            segment_key = f"{base_key}_segments/{index:04d}{file_extension}"
+            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
+                segment_path = tmp_file.name
+            try:
+                cut_audio_segment(source_path, segment_path, start, end)
+                bucket.blob(segment_key).upload_from_filename(segment_path)
+            finally:
+                os.remove(segment_path)
+            uploaded_keys.append(segment_key)
+            header.append(transcribe_audio_segment_task.s(job_id, bucket_name, segment_key, index, start).set(**task_queue_options(priority)))
+
+        chord(header)(merge_segment_transcriptions_task.s(job_id, audio_cache_key, session_id).set(**task_queue_options(priority)))
+    except Exception:
+        for segment_key in uploaded_keys:
+            delete_gcs_file(bucket_name, segment_key, job_id)
+        raise
+    logger.info(f"{task_log_prefix}: Dispatched {len(header)} segment tasks.")
+
+
 # --- Celery 작업 정의 1: Whisper STT ---
-@celery_app.task(bind=True, name='tasks.process_audio_with_openai_whisper_task', max_retries=1, default_retry_delay=60)
-def process_audio_with_openai_whisper_task(self, job_id, gcs_bucket_for_audio, gcs_object_key_for_audio, audio_content_type_hint=None):
+@celery_app.task(bind=True, name='tasks.process_audio_with_openai_whisper_task', max_retries=Config.OPENAI_MAX_RETRIES, default_retry_delay=60)
+def process_audio_with_openai_whisper_task(self, job_id, gcs_bucket_for_audio, gcs_object_key_for_audio, audio_content_type_hint=None, audio_cache_key=None, audio_size_bytes=None, inline_audio_key=None, session_id=None, priority=PRIORITY_INTERACTIVE):
+    # inline_audio_key가 있으면 오디오는 Redis에 있고, gcs_object_key_for_audio는 파일 이름으로만 사용됨
     task_log_prefix = f"Celery Task ID: {self.request.id} - JobID: {job_id}"
-    logger.info(f"{task_log_prefix} - OpenAI Whisper API STT 처리 시작, GCS Path: gs://{gcs_bucket_for_audio}/{gcs_object_key_for_audio}")
+    if inline_audio_key:
+        logger.info(f"{task_log_prefix} - STT 처리 시작 ({Config.STT_SERVICE_PROVIDER}), Inline audio: {inline_audio_key}")
+    else:
+        logger.info(f"{task_log_prefix} - STT 처리 시작 ({Config.STT_SERVICE_PROVIDER}), GCS Path: gs://{gcs_bucket_for_audio}/{gcs_object_key_for_audio}")
     
-    if not openai_client or not gcs_task_client:
-        error_msg = "A required client (OpenAI or GCS) is not initialized in Celery worker."
+    if not (stt_backend and stt_backend.is_ready()) or not (gcs_task_client or inline_audio_key):
+        error_msg = "A required client (STT backend or GCS) is not initialized in Celery worker."
         logger.error(f"{task_log_prefix}: {error_msg}")
-        store_result_in_redis(job_id, {"status": "Failed", "error": error_msg})
-        if gcs_task_client: delete_gcs_file(gcs_bucket_for_audio, gcs_object_key_for_audio, job_id)
+        store_result_in_redis(job_id, {"status": "Failed", "error": error_msg}, session_id)
+        if inline_audio_key:
+            redis_task_binary_client.delete(inline_audio_key)
+        elif gcs_task_client:
+            delete_gcs_file(gcs_bucket_for_audio, gcs_object_key_for_audio, job_id)
         return error_msg
     
-    store_result_in_redis(job_id, {"status": "Processing"})
+    store_result_in_redis(job_id, {"status": "Processing"}, session_id)
     
     temp_audio_file_path = None
+    stt_filename = gcs_object_key_for_audio # STT 엔진이 확장자로 포맷을 판단
+    retrying = False
     try:
-        bucket = gcs_task_client.bucket(gcs_bucket_for_audio)
-        blob = bucket.blob(gcs_object_key_for_audio)
-        if not blob.exists():
-            raise FileNotFoundError(f"Audio file not found in GCS: gs://{gcs_bucket_for_audio}/{gcs_object_key_for_audio}")
-
-        _, file_extension = os.path.splitext(gcs_object_key_for_audio)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            temp_audio_file_path = tmp_file.name
-        
-        blob.download_to_filename(temp_audio_file_path)
-        logger.info(f"{task_log_prefix}: Audio downloaded to: {temp_audio_file_path}")
-
-        with open(temp_audio_file_path, "rb") as audio_file_opened:
-            transcription = openai_client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file_opened,
-                language=Config.STT_LANGUAGE_CODE if Config.STT_LANGUAGE_CODE else None,
-                response_format="verbose_json"
-            )
-        
-        final_text = getattr(transcription, 'text', '').strip()
-        detected_language_api = getattr(transcription, 'language', Config.STT_LANGUAGE_CODE)
-        
-        result_data = {
-            "status": "Completed", "transcription": final_text, "detected_language": detected_language_api
-        }
-        if not final_text:
-             result_data["error_detail"] = "Whisper API 결과가 비어있거나 음성이 감지되지 않았습니다."
-        
-        store_result_in_redis(job_id, result_data)
-        logger.info(f"{task_log_prefix}: OpenAI Whisper STT Completed.")
-        return f"Job {job_id} successfully processed with OpenAI Whisper."
+        if inline_audio_key:
+            audio_buffer = load_inline_audio(inline_audio_key)
+        elif may_need_local_processing(audio_size_bytes):
+            _, file_extension = os.path.splitext(gcs_object_key_for_audio)
+            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
+                temp_audio_file_path = tmp_file.name
+            download_audio_to_file(gcs_bucket_for_audio, gcs_object_key_for_audio, temp_audio_file_path)
+            logger.info(f"{task_log_prefix}: Audio downloaded to: {temp_audio_file_path}")
+
+            with STAGE_SECONDS.labels(stage="transcode").time(), start_span("audio.transcode"):
+                transcoded_path = transcode_if_beneficial(temp_audio_file_path, task_log_prefix)
+            if transcoded_path:
+                os.remove(temp_audio_file_path)
+                temp_audio_file_path = transcoded_path
+                stt_filename = os.path.splitext(gcs_object_key_for_audio)[0] + os.path.splitext(transcoded_path)[1]
+
+            split_plan = plan_long_audio_split(temp_audio_file_path, task_log_prefix)
+            if split_plan:
+                dispatch_segment_fanout(job_id, gcs_bucket_for_audio, gcs_object_key_for_audio, temp_audio_file_path, split_plan, task_log_prefix, audio_cache_key, session_id, priority)
+                return f"Job {job_id} split into {len(split_plan)} segments for parallel transcription."
+            audio_buffer = open(temp_audio_file_path, "rb")
+        else:
+            audio_buffer = download_audio_to_buffer(gcs_bucket_for_audio, gcs_object_key_for_audio)
+            logger.info(f"{task_log_prefix}: Audio downloaded to spooled buffer ({audio_size_bytes} bytes).")
+
+        with audio_buffer:
+            stt_output = transcribe_audio_file(audio_buffer, stt_filename, task_log_prefix)
+        result_data = build_stt_result(stt_output["text"], stt_output["language"], stt_output["segments"])
+        store_result_in_redis(job_id, result_data, session_id)
+        cache_stt_result(audio_cache_key, result_data, task_log_prefix)
+        logger.info(f"{task_log_prefix}: STT Completed ({stt_backend.name}).")
+        return f"Job {job_id} successfully processed with {stt_backend.name}."
 
     except Exception as exc:
+        countdown = get_openai_retry_countdown(self, exc, task_log_prefix)
+        if countdown is not None:
+            retrying = True
+            raise self.retry(exc=exc, countdown=countdown)
         error_message = f"Error in Whisper STT task: {type(exc).__name__} - {str(exc)}"
         logger.error(f"{task_log_prefix} Error: {exc}", exc_info=True)
-        store_result_in_redis(job_id, {"status": "Failed", "error": error_message})
+        store_result_in_redis(job_id, {"status": "Failed", "error": error_message}, session_id)
         return f"Job {job_id} failed: {error_message}"
     
     finally:
         if temp_audio_file_path and os.path.exists(temp_audio_file_path):
             os.remove(temp_audio_file_path)
-        delete_gcs_file(gcs_bucket_for_audio, gcs_object_key_for_audio, job_id)
+        if not retrying: # 재시도 시 원본 오디오가 다시 필요하므로 유지
+            if inline_audio_key:
+                redis_task_binary_client.delete(inline_audio_key)
+            else:
+                delete_gcs_file(gcs_bucket_for_audio, gcs_object_key_for_audio, job_id)
+
+@celery_app.task(bind=True, name='tasks.transcribe_audio_segment_task', max_retries=Config.OPENAI_MAX_RETRIES, default_retry_delay=60)
+def transcribe_audio_segment_task(self, job_id, gcs_bucket_for_audio, gcs_object_key_for_segment, segment_index, offset_seconds):
+    """분할된 한 구간을 변환합니다. chord 콜백이 항상 실행되도록 예외는 (재시도 후에도 실패하면) 결과의 "error" 필드로 돌려줍니다."""
+    task_log_prefix = f"Celery Task ID: {self.request.id} - JobID: {job_id} - Segment: {segment_index}"
+    retrying = False
+    try:
+        with download_audio_to_buffer(gcs_bucket_for_audio, gcs_object_key_for_segment) as audio_buffer:
+            stt_output = transcribe_audio_file(audio_buffer, gcs_object_key_for_segment, task_log_prefix)
+        stt_output.update({"index": segment_index, "offset": offset_seconds})
+        logger.info(f"{task_log_prefix}: Segment transcribed. Text length: {len(stt_output['text'])}")
+        return stt_output
+
+    except Exception as exc:
+        countdown = get_openai_retry_countdown(self, exc, task_log_prefix)
+        if countdown is not None:
+            retrying = True
+            raise self.retry(exc=exc, countdown=countdown)
+        logger.error(f"{task_log_prefix} Error: {exc}", exc_info=True)
+        return {"index": segment_index, "offset": offset_seconds, "error": f"{type(exc).__name__} - {str(exc)}"}
+
+    finally:
+        if not retrying:
+            delete_gcs_file(gcs_bucket_for_audio, gcs_object_key_for_segment, job_id)
+
+@celery_app.task(bind=True, name='tasks.merge_segment_transcriptions_task')
+def merge_segment_transcriptions_task(self, segment_results, job_id, audio_cache_key=None, session_id=None):
+    """구간 결과를 순서대로 이어붙이고 타임스탬프에 구간 시작 오프셋을 더해 원래 Job 키에 저장합니다."""
+    task_log_prefix = f"Celery Task ID: {self.request.id} - JobID: {job_id}"
+    ordered_results = sorted(segment_results, key=lambda r: r["index"])
+
+    failed = [r for r in ordered_results if r.get("error")]
+    if failed:
+        error_message = "; ".join(f"Segment {r['index']}: {r['error']}" for r in failed)
+        logger.error(f"{task_log_prefix}: {len(failed)}/{len(ordered_results)} segments failed.")
+        store_result_in_redis(job_id, {"status": "Failed", "error": f"Error in Whisper STT task: {error_message}"}, session_id)
+        return f"Job {job_id} failed: {error_message}"
+
+    merged_segments = []
+    for r in ordered_results:
+        for seg in r["segments"]:
+            merged_segments.append({
+                **seg, "start": round(seg["start"] + r["offset"], 3), "end": round(seg["end"] + r["offset"], 3)
+            })
+    final_text = " ".join(r["text"] for r in ordered_results if r["text"])
+    detected_language = next((r["language"] for r in ordered_results if r["text"] and r.get("language")), Config.STT_LANGUAGE_CODE)
+
+    result_data = build_stt_result(final_text, detected_language, merged_segments)
+    store_result_in_redis(job_id, result_data, session_id)
+    cache_stt_result(audio_cache_key, result_data, task_log_prefix)
+    logger.info(f"{task_log_prefix}: Merged {len(ordered_results)} segments. Text length: {len(final_text)}")
+    return f"Job {job_id} successfully processed with {stt_backend.name} ({len(ordered_results)} segments)."
 
 # --- Celery 작업 정의 2: GPT 요약 ---
-@celery_app.task(bind=True, name='tasks.summarize_text_with_gpt_task', max_retries=1, default_retry_delay=60)
-def summarize_text_with_gpt_task(self, job_id, text_to_summarize):
+def summarize_with_chat(system_prompt, text):
+    with STAGE_SECONDS.labels(stage="chat_rate_limit_wait").time(), start_span("chat.rate_limit_wait"):
+        acquire_chat_capacity(system_prompt, text)
+    with STAGE_SECONDS.labels(stage="chat_call").time(), start_span("openai.chat_completion", openai_model=Config.SUMMARY_MODEL):
+        chat_completion = openai_client.chat.completions.create(
+            model=Config.SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text}
+            ],
+            temperature=Config.SUMMARY_TEMPERATURE
+        )
+    return chat_completion.choices[0].message.content.strip()
+
+def summarize_part_cached(system_prompt, text):
+    """부분 요약을 내용 해시로 캐시하여 같은 윈도우/묶음은 다시 요약하지 않습니다."""
+    cache_key = part_cache_key(system_prompt, text)
+    cached_summary = redis_task_client.get(cache_key) if redis_task_client else None
+    if cached_summary is not None:
+        return cached_summary
+    summary = summarize_with_chat(system_prompt, text)
+    if redis_task_client:
+        redis_task_client.setex(cache_key, Config.SUMMARY_PART_CACHE_TTL_SECONDS, summary)
+    return summary
+
+def merge_partial_summaries(partial_summaries, task_log_prefix):
+    """부분 요약들이 한 윈도우에 들어갈 때까지 묶어서 다시 요약(계층적 병합)한 뒤 최종 요약을 만듭니다."""
+    max_chars = summary_window_chars()
+    level = partial_summaries
+    for depth in range(Config.SUMMARY_MAX_MERGE_LEVELS):
+        if len(level) == 1 or len("\n\n".join(level)) <= max_chars:
+            break
+        level = [summarize_part_cached(Config.SUMMARY_WINDOW_PROMPT, "\n\n".join(group)) for group in group_texts(level, max_chars)]
+        logger.info(f"{task_log_prefix}: Merge level {depth + 1} -> {len(level)} partial summaries.")
+    return summarize_with_chat(Config.SUMMARY_PROMPT, "\n\n".join(level))
+
+def cache_summary(summary_cache_key, summary_text, task_log_prefix):
+    if not (summary_cache_key and redis_task_client and summary_text):
+        return
+    try:
+        store_cached_summary(redis_task_client, summary_cache_key, summary_text)
+    except Exception as e: # 캐시 저장 실패는 요약 결과에 영향 없음
+        logger.error(f"{task_log_prefix}: Failed to store summary cache: {e}", exc_info=True)
+
+@celery_app.task(bind=True, name='tasks.summarize_text_with_gpt_task', max_retries=Config.OPENAI_MAX_RETRIES, default_retry_delay=60)
+def summarize_text_with_gpt_task(self, job_id, text_to_summarize, priority=PRIORITY_INTERACTIVE):
     task_log_prefix = f"Celery Task ID: {self.request.id} - JobID: {job_id}"
     summary_job_key = f"summary:{job_id}"
     logger.info(f"{task_log_prefix} - OpenAI Chat-GPT 요약 처리 시작")
@@ -158,36 +624,89 @@ def summarize_text_with_gpt_task(self, job_id, text_to_summarize):
         return f"Job {job_id} completed with empty summary as input was empty."
 
     store_result_in_redis(summary_job_key, {"status": "Processing"})
+    summary_cache_key = build_summary_cache_key(text_to_summarize) if Config.SUMMARY_CACHE_ENABLED else None
 
     try:
-        system_prompt = Config.SUMMARY_PROMPT
-        model_to_use = Config.SUMMARY_MODEL
-
-        logger.info(f"{task_log_prefix}: Sending text (length: {len(text_to_summarize)}) to '{model_to_use}' for summarization.")
-        
-        chat_completion = openai_client.chat.completions.create(
-            model=model_to_use,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text_to_summarize}
-            ],
-            temperature=0.5
-        )
+        max_chars = summary_window_chars()
+        if len(text_to_summarize) <= max_chars:
+            logger.info(f"{task_log_prefix}: Sending text (length: {len(text_to_summarize)}) to '{Config.SUMMARY_MODEL}' for summarization.")
+            summary_text = summarize_with_chat(Config.SUMMARY_PROMPT, text_to_summarize)
+            result_data = {"status": "Completed", "summary": summary_text}
+        else:
+            # 긴 텍스트: 윈도우별 부분 요약(map) - 이전에 요약한 윈도우는 캐시에서 재사용
+            windows = split_into_windows(text_to_summarize, max_chars)
+            partial_summaries = redis_task_client.mget([part_cache_key(Config.SUMMARY_WINDOW_PROMPT, w) for w in windows]) if redis_task_client else [None] * len(windows)
+            missing = [i for i, summary in enumerate(partial_summaries) if summary is None]
+            logger.info(f"{task_log_prefix}: Text (length: {len(text_to_summarize)}) split into {len(windows)} windows, {len(missing)} not cached.")
+            if missing:
+                header = [summarize_window_task.s(job_id, i, windows[i]).set(**task_queue_options(priority)) for i in missing]
+                chord(header)(reduce_window_summaries_task.s(job_id, partial_summaries, summary_cache_key).set(**task_queue_options(priority)))
+                return f"Job {job_id} summarizing {len(missing)}/{len(windows)} windows in parallel."
+            summary_text = merge_partial_summaries(partial_summaries, task_log_prefix)
+            result_data = {"status": "Completed", "summary": summary_text, "windows": len(windows)}
 
-        summary_text = chat_completion.choices[0].message.content.strip()
         logger.info(f"{task_log_prefix}: Summarization completed. Summary length: {len(summary_text)}")
-
-        result_data = {"status": "Completed", "summary": summary_text}
         store_result_in_redis(summary_job_key, result_data)
+        cache_summary(summary_cache_key, summary_text, task_log_prefix)
         return f"Job {job_id} successfully summarized."
 
     except APIError as e_openai:
+        countdown = get_openai_retry_countdown(self, e_openai, task_log_prefix)
+        if countdown is not None:
+            raise self.retry(exc=e_openai, countdown=countdown)
         error_message = f"OpenAI API Error: {type(e_openai).__name__} - Status: {e_openai.status_code if hasattr(e_openai, 'status_code') else 'N/A'} - {str(e_openai)}"
         logger.error(f"{task_log_prefix} OpenAI API Error: {e_openai}", exc_info=True)
         store_result_in_redis(summary_job_key, {"status": "Failed", "error": error_message})
         return f"Job {job_id} failed with OpenAI API: {error_message}"
     except Exception as exc:
+        countdown = get_openai_retry_countdown(self, exc, task_log_prefix)
+        if countdown is not None:
+            raise self.retry(exc=exc, countdown=countdown)
         error_message = f"Error in summarization task: {type(exc).__name__} - {str(exc)}"
         logger.error(f"{task_log_prefix} General Error: {exc}", exc_info=True)
         store_result_in_redis(summary_job_key, {"status": "Failed", "error": error_message})
-        return f"Job {job_id} failed: {error_message}"
\ No newline at end of file
+        return f"Job {job_id} failed: {error_message}"
+
+@celery_app.task(bind=True, name='tasks.summarize_window_task', max_retries=Config.OPENAI_MAX_RETRIES, default_retry_delay=60)
+def summarize_window_task(self, job_id, window_index, window_text):
+    """긴 텍스트의 한 윈도우를 요약합니다. chord 콜백이 항상 실행되도록 (재시도 후에도 실패한) 예외는 "error" 필드로 돌려줍니다."""
+    task_log_prefix = f"Celery Task ID: {self.request.id} - JobID: {job_id} - Window: {window_index}"
+    try:
+        return {"index": window_index, "summary": summarize_part_cached(Config.SUMMARY_WINDOW_PROMPT, window_text)}
+    except Exception as exc:
+        countdown = get_openai_retry_countdown(self, exc, task_log_prefix)
+        if countdown is not None:
+            raise self.retry(exc=exc, countdown=countdown)
+        logger.error(f"{task_log_prefix} Error: {exc}", exc_info=True)
+        return {"index": window_index, "error": f"{type(exc).__name__} - {str(exc)}"}
+
+@celery_app.task(bind=True, name='tasks.reduce_window_summaries_task', max_retries=Config.OPENAI_MAX_RETRIES, default_retry_delay=60)
+def reduce_window_summaries_task(self, window_results, job_id, partial_summaries, summary_cache_key=None):
+    """캐시된 부분 요약과 새로 만든 윈도우 요약을 순서대로 합쳐 최종 요약을 저장합니다."""
+    task_log_prefix = f"Celery Task ID: {self.request.id} - JobID: {job_id}"
+    summary_job_key = f"summary:{job_id}"
+    failed = [r for r in window_results if r.get("error")]
+    if failed:
+        error_message = "; ".join(f"Window {r['index']}: {r['error']}" for r in failed)
+        logger.error(f"{task_log_prefix}: {len(failed)}/{len(window_results)} windows failed.")
+        store_result_in_redis(summary_job_key, {"status": "Failed", "error": f"Error in summarization task: {error_message}"})
+        return f"Job {job_id} failed: {error_message}"
+
+    partial_summaries = list(partial_summaries)
+    for r in window_results:
+        partial_summaries[r["index"]] = r["summary"]
+    try:
+        summary_text = merge_partial_summaries(partial_summaries, task_log_prefix)
+    except Exception as exc:
+        countdown = get_openai_retry_countdown(self, exc, task_log_prefix)
+        if countdown is not None:
+            raise self.retry(exc=exc, countdown=countdown)
+        error_message = f"Error in summarization task: {type(exc).__name__} - {str(exc)}"
+        logger.error(f"{task_log_prefix} Error: {exc}", exc_info=True)
+        store_result_in_redis(summary_job_key, {"status": "Failed", "error": error_message})
+        return f"Job {job_id} failed: {error_message}"
+
+    store_result_in_redis(summary_job_key, {"status": "Completed", "summary": summary_text, "windows": len(partial_summaries)})
+    cache_summary(summary_cache_key, summary_text, task_log_prefix)
+    logger.info(f"{task_log_prefix}: Merged {len(partial_summaries)} window summaries. Summary length: {len(summary_text)}")
+    return f"Job {job_id} successfully summarized ({len(partial_summaries)} windows)."
@@ -0,0 +1,28 @@
+# conftest.py
+# fast-api/ 모듈(main, tasks 등)을 패키지 없이 import하도록 경로 추가
+import os
+import sys
+import types
+
+import fakeredis
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """main의 Redis/GCS 클라이언트를 fakeredis로 바꾸고, Celery 발행은 published 목록에 기록합니다.
+
+    GCS를 거치지 않도록 인라인 오디오 한도 이하의 작은 업로드만 사용해야 합니다.
+    """
+    import main
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(main, "redis_client", fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(main, "redis_result_client", fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(main, "gcs_bucket", object())
+    published = []
+    monkeypatch.setattr(main.process_audio_with_openai_whisper_task, "apply_async",
+                        lambda *args, **kwargs: published.append(kwargs.get("args")))
+    return types.SimpleNamespace(main=main, server=server, redis=fakeredis.FakeRedis(server=server), published=published)
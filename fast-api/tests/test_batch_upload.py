@@ -0,0 +1,78 @@
+# test_batch_upload.py
+# POST /upload/batch: 발행 도중 실패 시 이미 발행된 Job은 유지하고 나머지만 정리
+import asyncio
+import contextlib
+
+import httpx
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket, self.name = bucket, name
+
+    def upload_from_file(self, source, content_type=None, rewind=False):
+        if rewind:
+            source.seek(0)
+        self.bucket.objects[self.name] = source.read()
+
+    def delete(self):
+        del self.bucket.objects[self.name]
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+def _upload_batch(api, monkeypatch, fail_on_publish=None):
+    bucket = FakeBucket()
+    monkeypatch.setattr(api.main, "gcs_bucket", bucket)
+    monkeypatch.setattr(api.main.celery_app, "producer_or_acquire", lambda: contextlib.nullcontext(None))
+
+    def apply_async(*args, **kwargs):
+        if len(api.published) + 1 == fail_on_publish:
+            raise ConnectionError("broker connection lost")
+        api.published.append(kwargs["args"])
+
+    monkeypatch.setattr(api.main.process_audio_with_openai_whisper_task, "apply_async", apply_async)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.main.app), base_url="http://testserver") as client:
+            files = [("files", (f"chunk{i}.webm", bytes([i + 1]) * 200, "audio/webm")) for i in range(4)]
+            return await client.post("/upload/batch", files=files)
+
+    return asyncio.run(run()), bucket
+
+
+def test_batch_publishes_every_job(api, monkeypatch):
+    response, bucket = _upload_batch(api, monkeypatch)
+
+    assert response.status_code == 202
+    assert len(response.json()["jobs"]) == 4
+    assert response.json()["rejected"] == []
+    assert len(bucket.objects) == 4
+
+
+def test_partial_publish_failure_keeps_published_jobs(api, monkeypatch):
+    response, bucket = _upload_batch(api, monkeypatch, fail_on_publish=3)
+
+    assert response.status_code == 202
+    body = response.json()
+    published_job_ids = [args[0] for args in api.published]
+    assert [job["job_id"] for job in body["jobs"]] == published_job_ids
+    assert len(published_job_ids) == 2
+    assert len(body["rejected"]) == 2
+    assert {item["filename"] for item in body["rejected"]}.isdisjoint(job["filename"] for job in body["jobs"])
+    # 발행된 Job의 오디오만 남아 있어야 워커가 내려받을 수 있음
+    assert sorted(bucket.objects) == sorted(args[2] for args in api.published)
+
+
+def test_publish_failure_before_any_job_cleans_up_everything(api, monkeypatch):
+    response, bucket = _upload_batch(api, monkeypatch, fail_on_publish=1)
+
+    assert response.status_code == 500
+    assert api.published == []
+    assert bucket.objects == {}
@@ -0,0 +1,82 @@
+# test_idempotency.py
+# /upload Idempotency-Key: 재시도 응답 재사용, 다른 요청 내용에 같은 키 재사용 거부, 실패 시 예약 해제
+import asyncio
+
+import httpx
+import pytest
+
+from idempotency import idempotency_key
+
+
+def _run_upload_scenario(api, scenario):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.main.app), base_url="http://testserver") as client:
+            def upload(key, audio=b"\x1a\x45\xdf\xa3" * 100, seq="0"):
+                return client.post("/upload", files={"file": ("chunk.webm", audio, "audio/webm")},
+                                   data={"session_id": "session-1", "seq": seq}, headers={"Idempotency-Key": key})
+            return await scenario(upload)
+    return asyncio.run(run())
+
+
+def test_retry_replays_first_response(api):
+    async def scenario(upload):
+        return await upload("key-1"), await upload("key-1")
+
+    first, retry = _run_upload_scenario(api, scenario)
+    assert first.status_code == 202
+    assert "idempotent_replay" not in first.json()
+    assert retry.status_code == 202
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == {**first.json(), "idempotent_replay": True}
+    assert len(api.published) == 1
+
+
+def test_concurrent_duplicates_collapse_into_one_job(api):
+    async def scenario(upload):
+        return await asyncio.gather(*(upload("key-2") for _ in range(5)))
+
+    responses = _run_upload_scenario(api, scenario)
+    assert {response.status_code for response in responses} == {202}
+    assert len({response.json()["job_id"] for response in responses}) == 1
+    assert len(api.published) == 1
+
+
+def test_same_key_with_different_request_is_rejected(api):
+    async def scenario(upload):
+        return await upload("key-3"), await upload("key-3", seq="1"), await upload("key-3", audio=b"other audio" * 50)
+
+    first, other_seq, other_audio = _run_upload_scenario(api, scenario)
+    assert first.status_code == 202
+    assert other_seq.status_code == 422
+    assert other_audio.status_code == 422
+    assert len(api.published) == 1
+
+
+def test_failed_upload_releases_key_for_retry(api, monkeypatch):
+    publish = api.main.process_audio_with_openai_whisper_task.apply_async
+
+    def broker_down(*args, **kwargs):
+        raise ConnectionError("broker down")
+
+    async def scenario(upload):
+        monkeypatch.setattr(api.main.process_audio_with_openai_whisper_task, "apply_async", broker_down)
+        failed = await upload("key-4")
+        released = not api.redis.exists(idempotency_key("upload", "key-4"))
+        monkeypatch.setattr(api.main.process_audio_with_openai_whisper_task, "apply_async", publish)
+        return failed, released, await upload("key-4")
+
+    failed, released, retry = _run_upload_scenario(api, scenario)
+    assert failed.status_code == 500
+    assert released
+    assert retry.status_code == 202
+    assert "idempotent_replay" not in retry.json()
+    assert len(api.published) == 1
+
+
+@pytest.mark.parametrize("key", ["has space", "", "x" * 256])
+def test_malformed_key_is_rejected(api, key):
+    async def scenario(upload):
+        return await upload(key)
+
+    assert _run_upload_scenario(api, scenario).status_code == 400
+    assert api.published == []
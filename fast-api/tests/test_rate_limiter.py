@@ -0,0 +1,59 @@
+# test_rate_limiter.py
+# 워커 공유 Redis 토큰 버킷 (Lua 스크립트) 과 재시도 백오프
+import fakeredis
+import pytest
+
+from config import Config
+from rate_limiter import RATE_LIMIT_KEY_PREFIX, RateLimitWaitTooLong, acquire_capacity, retry_countdown
+
+
+@pytest.fixture
+def redis_conn():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def _tokens(redis_conn, name):
+    return float(redis_conn.hget(f"{RATE_LIMIT_KEY_PREFIX}:{name}", "tokens"))
+
+
+def test_acquire_deducts_tokens_until_bucket_is_empty(redis_conn):
+    for _ in range(3):
+        acquire_capacity(redis_conn, [("rpm", 3, 1)], max_wait_seconds=0)
+    assert _tokens(redis_conn, "rpm") < 1
+
+    with pytest.raises(RateLimitWaitTooLong) as exc_info:
+        acquire_capacity(redis_conn, [("rpm", 3, 1)], max_wait_seconds=0)
+    assert 0 < exc_info.value.retry_after <= 20.1 # 분당 3개 -> 토큰 하나에 20초
+
+
+def test_buckets_are_deducted_all_or_nothing(redis_conn):
+    acquire_capacity(redis_conn, [("tpm", 1000, 900)], max_wait_seconds=0)
+
+    # 요청 수 버킷에는 여유가 있어도 토큰 버킷이 모자라면 어느 쪽도 차감하지 않음
+    with pytest.raises(RateLimitWaitTooLong):
+        acquire_capacity(redis_conn, [("rpm", 10, 1), ("tpm", 1000, 500)], max_wait_seconds=0)
+    assert _tokens(redis_conn, "rpm") == pytest.approx(10)
+    assert _tokens(redis_conn, "tpm") < 500
+
+
+def test_acquire_waits_for_refill_within_max_wait(redis_conn):
+    acquire_capacity(redis_conn, [("rpm", 600, 600)], max_wait_seconds=0) # 초당 10개 충전
+
+    waited = acquire_capacity(redis_conn, [("rpm", 600, 1)], max_wait_seconds=2)
+    assert 0 < waited < 2
+
+
+def test_disabled_limits_and_missing_redis_do_not_block(redis_conn):
+    assert acquire_capacity(redis_conn, [("rpm", 0, 1)], max_wait_seconds=0) == 0.0
+    assert not redis_conn.exists(f"{RATE_LIMIT_KEY_PREFIX}:rpm")
+    assert acquire_capacity(None, [("rpm", 1, 1)], max_wait_seconds=0) == 0.0
+
+
+def test_retry_countdown_uses_capped_jittered_backoff(monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_RETRY_BASE_DELAY_SECONDS", 2)
+    monkeypatch.setattr(Config, "OPENAI_RETRY_MAX_DELAY_SECONDS", 10)
+
+    for _ in range(50):
+        assert 2 <= retry_countdown(1) <= 4
+        assert 5 <= retry_countdown(5) <= 10
+    assert retry_countdown(0, retry_after="30") == 30.0
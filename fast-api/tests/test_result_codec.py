@@ -0,0 +1,68 @@
+# test_result_codec.py
+# 작업 결과 저장 형식 (msgpack + 크기 기준 zstd) 인코딩/디코딩과 크기 통계
+import json
+import asyncio
+
+import fakeredis
+import pytest
+
+import result_codec
+from config import Config
+from result_codec import (FORMAT_MSGPACK, FORMAT_MSGPACK_ZSTD, decode_result, encode_result, get_result_codec_stats,
+                          queue_result_size_stats)
+
+SMALL_RESULT = {"status": "Completed", "transcription": "안녕하세요", "detected_language": "ko", "segment_count": 1}
+LARGE_RESULT = {"status": "Completed", "transcription": "회의 내용을 정리합니다. " * 200, "detected_language": "ko", "segment_count": 0}
+
+
+@pytest.fixture(autouse=True)
+def msgpack_codec(monkeypatch):
+    monkeypatch.setattr(Config, "RESULT_CODEC", "msgpack")
+    monkeypatch.setattr(Config, "RESULT_COMPRESS_MIN_BYTES", 1024)
+
+
+def test_small_result_round_trips_uncompressed():
+    encoded = encode_result(SMALL_RESULT)
+    assert encoded[:1] == FORMAT_MSGPACK
+    assert decode_result(encoded) == SMALL_RESULT
+
+
+def test_large_result_round_trips_compressed():
+    encoded = encode_result(LARGE_RESULT)
+    assert encoded[:1] == FORMAT_MSGPACK_ZSTD
+    assert len(encoded) < len(json.dumps(LARGE_RESULT).encode("utf-8"))
+    assert decode_result(encoded) == LARGE_RESULT
+
+
+def test_json_values_stay_readable(monkeypatch):
+    # 이전 버전이 저장한 JSON 문자열/바이트와 RESULT_CODEC=json으로 저장한 값
+    assert decode_result(json.dumps(SMALL_RESULT)) == SMALL_RESULT
+    assert decode_result(json.dumps(SMALL_RESULT).encode("utf-8")) == SMALL_RESULT
+    monkeypatch.setattr(Config, "RESULT_CODEC", "json")
+    encoded = encode_result(LARGE_RESULT)
+    assert encoded[:1] == b"{"
+    assert decode_result(encoded) == LARGE_RESULT
+
+
+def test_size_stats_track_json_and_stored_bytes():
+    async def scenario():
+        redis_conn = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        pipe = redis_conn.pipeline(transaction=False)
+        for result_data in (SMALL_RESULT, LARGE_RESULT):
+            queue_result_size_stats(pipe, result_data, encode_result(result_data))
+        await pipe.execute()
+        return await get_result_codec_stats(redis_conn)
+
+    stats = asyncio.run(scenario())
+    assert stats["codec"] == "msgpack"
+    assert stats["stored"] == 2
+    assert stats["compressed"] == 1
+    assert stats["avg_stored_bytes_per_job"] < stats["avg_json_bytes_per_job"]
+    assert 0 < stats["saved_ratio"] < 1
+
+
+def test_falls_back_to_json_without_msgpack(monkeypatch):
+    monkeypatch.setattr(result_codec, "msgpack", None)
+    encoded = encode_result(SMALL_RESULT)
+    assert encoded == json.dumps(SMALL_RESULT).encode("utf-8")
+    assert decode_result(encoded) == SMALL_RESULT
@@ -0,0 +1,76 @@
+# test_result_etag.py
+# GET /result의 ETag/If-None-Match 재검증(304), 결과 유지와 DELETE /result
+import asyncio
+
+import fakeredis
+import httpx
+import pytest
+
+import tasks
+
+
+@pytest.fixture
+def store_result(api, monkeypatch):
+    monkeypatch.setattr(tasks, "redis_task_client", fakeredis.FakeRedis(server=api.server, decode_responses=True))
+    return tasks.store_result_in_redis
+
+
+def _get_results(api, *requests):
+    """(method, path, headers[, json]) 요청을 순서대로 보내고 응답 목록을 반환합니다."""
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.main.app), base_url="http://testserver") as client:
+            return [await client.request(method, path, headers=headers or {}, json=body[0] if body else None)
+                    for method, path, headers, *body in requests]
+    return asyncio.run(run())
+
+
+def test_pending_result_revalidates_with_pending_etag(api):
+    first, revalidated = _get_results(api, ("GET", "/result/job-1", None), ("GET", "/result/job-1", {"If-None-Match": '"pending"'}))
+    assert first.status_code == 202
+    assert first.headers["ETag"] == '"pending"'
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+def test_etag_changes_when_worker_updates_status(api, store_result):
+    store_result("job-2", {"status": "Processing"})
+    (processing,) = _get_results(api, ("GET", "/result/job-2", None))
+    etag = processing.headers["ETag"]
+    (unchanged,) = _get_results(api, ("GET", "/result/job-2", {"If-None-Match": f"W/{etag}"}))
+
+    store_result("job-2", {"status": "Completed", "transcription": "안녕하세요", "detected_language": "ko", "segments": []})
+    changed, matched, any_tag = _get_results(
+        api,
+        ("GET", "/result/job-2", {"If-None-Match": etag}),
+        ("GET", "/result/job-2", {"If-None-Match": f'"other", {etag}'}),
+        ("GET", "/result/job-2", {"If-None-Match": "*"}),
+    )
+    assert processing.status_code == 200
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.json()["transcription"] == "안녕하세요"
+    assert changed.headers["ETag"] != etag
+    assert matched.status_code == 200 # 이전 ETag는 목록에 있어도 현재 결과와 다름
+    assert any_tag.status_code == 304
+
+
+def test_results_are_kept_until_deleted(api, store_result):
+    store_result("job-3", {"status": "Completed", "transcription": "유지", "detected_language": "ko",
+                           "segments": [{"start": 0.0, "end": 1.0, "text": "유지"}]})
+    first, again, batch, deleted, gone, deleted_again = _get_results(
+        api,
+        ("GET", "/result/job-3", None),
+        ("GET", "/result/job-3", None),
+        ("POST", "/results", None, {"job_ids": ["job-3", "job-missing"]}),
+        ("DELETE", "/result/job-3", None),
+        ("GET", "/result/job-3", None),
+        ("DELETE", "/result/job-3", None),
+    )
+    assert first.status_code == again.status_code == 200
+    assert first.headers["ETag"] == again.headers["ETag"]
+    assert batch.json()["results"] == {"job-3": first.json(), "job-missing": {"status": "Processing"}}
+    assert deleted.status_code == 204
+    assert not api.redis.exists("stt_result:job-3", "stt_segments:job-3")
+    assert gone.status_code == 202
+    assert deleted_again.status_code == 404
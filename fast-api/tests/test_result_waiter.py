@@ -0,0 +1,135 @@
+# test_result_waiter.py
+# GET /result?wait= 롱 폴링의 공유 pub/sub 대기 (ResultWaiter)
+import json
+import asyncio
+
+import fakeredis
+import httpx
+from redis.asyncio.client import PubSub
+
+from result_waiter import ResultWaiter
+
+CHANNEL_PREFIX = "stt_events:"
+
+
+def _publish(redis_conn, job_id, status):
+    return redis_conn.publish(f"{CHANNEL_PREFIX}{job_id}", json.dumps({"job_id": job_id, "status": status}))
+
+
+def _yield_on_connect(monkeypatch):
+    """실제 소켓처럼 연결 중에 이벤트 루프로 제어를 넘기도록 PubSub.connect를 감쌉니다."""
+    original_connect = PubSub.connect
+
+    async def connect(self):
+        await asyncio.sleep(0)
+        await original_connect(self)
+
+    monkeypatch.setattr(PubSub, "connect", connect)
+
+
+def test_waiter_resolves_on_terminal_status(monkeypatch):
+    _yield_on_connect(monkeypatch)
+
+    async def scenario():
+        redis_conn = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        waiter = ResultWaiter(redis_conn, CHANNEL_PREFIX)
+        try:
+            async with waiter.subscribe("job-1") as finished:
+                await asyncio.sleep(0.05) # 리스너가 연결 전에 get_message()를 부르면 여기서 False로 끝남
+                assert not finished.done()
+                await _publish(redis_conn, "job-1", "Processing")
+                await asyncio.sleep(0.05)
+                assert not finished.done()
+                await _publish(redis_conn, "job-1", "Completed")
+                assert await asyncio.wait_for(finished, timeout=2) is True
+            assert waiter._waiters == {}
+        finally:
+            await waiter.close()
+
+    asyncio.run(scenario())
+
+
+def test_waiters_share_one_pubsub(monkeypatch):
+    _yield_on_connect(monkeypatch)
+
+    async def scenario():
+        redis_conn = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        waiter = ResultWaiter(redis_conn, CHANNEL_PREFIX)
+        try:
+            async with waiter.subscribe("job-1") as first, waiter.subscribe("job-1") as second, \
+                    waiter.subscribe("job-2") as other:
+                pubsub = waiter._pubsub
+                await _publish(redis_conn, "job-1", "Failed")
+                assert await asyncio.wait_for(asyncio.gather(first, second), timeout=2) == [True, True]
+                assert not other.done()
+                assert waiter._pubsub is pubsub
+            assert waiter._waiters == {}
+        finally:
+            await waiter.close()
+
+    asyncio.run(scenario())
+
+
+def test_listener_error_only_resets_its_own_pubsub(monkeypatch):
+    async def scenario():
+        redis_conn = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        waiter = ResultWaiter(redis_conn, CHANNEL_PREFIX)
+        try:
+            async with waiter.subscribe("job-1") as finished:
+                # 이전 연결의 리스너가 뒤늦게 실패해도 현재 연결과 대기자는 그대로 유지
+                stale_pubsub = redis_conn.pubsub()
+                await stale_pubsub.subscribe("unused")
+                monkeypatch.setattr(stale_pubsub, "get_message", _raise_connection_error)
+                await waiter._listen(stale_pubsub)
+                assert waiter._pubsub is not None
+                assert not finished.done()
+
+                # 현재 연결의 리스너가 실패하면 대기자를 False로 깨워 결과를 다시 읽게 함
+                current_pubsub = waiter._pubsub
+                monkeypatch.setattr(current_pubsub, "get_message", _raise_connection_error)
+                assert await asyncio.wait_for(finished, timeout=2) is False
+                assert waiter._pubsub is None
+
+            # 다음 구독은 새 연결을 만들어 다시 동작
+            async with waiter.subscribe("job-2") as finished:
+                assert waiter._pubsub is not current_pubsub
+                await _publish(redis_conn, "job-2", "Completed")
+                assert await asyncio.wait_for(finished, timeout=2) is True
+        finally:
+            await waiter.close()
+
+    asyncio.run(scenario())
+
+
+async def _raise_connection_error(*args, **kwargs):
+    raise ConnectionError("connection lost")
+
+
+def test_long_poll_responds_when_result_is_stored(api, monkeypatch):
+    import tasks
+
+    _yield_on_connect(monkeypatch)
+    monkeypatch.setattr(tasks, "redis_task_client", fakeredis.FakeRedis(server=api.server, decode_responses=True))
+
+    async def scenario():
+        waiter = ResultWaiter(fakeredis.FakeAsyncRedis(server=api.server, decode_responses=True), tasks.RESULT_EVENTS_CHANNEL_PREFIX)
+        monkeypatch.setattr(api.main, "result_waiter", waiter)
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.main.app), base_url="http://testserver") as client:
+                pending = asyncio.create_task(client.get("/result/job-1", params={"wait": 5}))
+                await asyncio.sleep(0.1)
+                assert not pending.done() # 연결 중 구독이 실패하면 여기서 이미 202로 끝남
+                tasks.store_result_in_redis("job-1", {"status": "Processing"})
+                await asyncio.sleep(0.1)
+                assert not pending.done()
+                tasks.store_result_in_redis("job-1", {"status": "Completed", "transcription": "완료", "detected_language": "ko"})
+                response = await asyncio.wait_for(pending, timeout=2)
+                too_long = await client.get("/result/job-1", params={"wait": 3600})
+            return response, too_long
+        finally:
+            await waiter.close()
+
+    response, too_long = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.json()["transcription"] == "완료"
+    assert too_long.status_code == 422
@@ -0,0 +1,60 @@
+# test_segment_merge.py
+# 긴 오디오 분할 전사 후 chord 콜백(merge_segment_transcriptions_task)의 결과 병합
+import fakeredis
+import pytest
+
+import tasks
+from result_codec import decode_result
+from stt_segments import segments_key
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(tasks, "redis_task_client", fakeredis.FakeRedis(server=server, decode_responses=True))
+    return fakeredis.FakeRedis(server=server) # 저장된 결과(bytes) 조회용
+
+
+def _segment_result(index, offset, text, segments, language="korean"):
+    return {"index": index, "offset": offset, "text": text, "language": language, "segments": segments}
+
+
+def test_merge_orders_segments_and_shifts_timestamps(redis_server):
+    # chord는 완료 순서대로 결과를 넘길 수 있으므로 index 순서가 섞여 있음
+    segment_results = [
+        _segment_result(1, 30.0, "두 번째", [{"start": 0.5, "end": 2.25, "text": "두 번째", "avg_logprob": -0.4, "no_speech_prob": 0.02}]),
+        _segment_result(0, 0.0, "첫 번째", [
+            {"start": 0.0, "end": 1.5, "text": "첫", "avg_logprob": -0.1, "no_speech_prob": 0.01},
+            {"start": 1.5, "end": 3.0, "text": "번째", "avg_logprob": -0.2, "no_speech_prob": 0.03},
+        ]),
+        _segment_result(2, 60.0, "", [], language=None),
+    ]
+
+    tasks.merge_segment_transcriptions_task.apply(args=[segment_results, "job-merge"]).get()
+
+    result = decode_result(redis_server.get("stt_result:job-merge"))
+    assert result["status"] == "Completed"
+    assert result["transcription"] == "첫 번째 두 번째"
+    assert result["detected_language"] == "korean"
+    assert result["segment_count"] == 3
+
+    columns = decode_result(redis_server.get(segments_key("job-merge")))
+    assert columns["start"] == [0.0, 1.5, 30.5]
+    assert columns["end"] == [1.5, 3.0, 32.25]
+    assert columns["text"] == ["첫", "번째", "두 번째"]
+    assert columns["avg_logprob"] == [-0.1, -0.2, -0.4]
+    assert columns["no_speech_prob"] == [0.01, 0.03, 0.02]
+
+
+def test_merge_fails_job_when_any_segment_failed(redis_server):
+    segment_results = [
+        _segment_result(0, 0.0, "첫 번째", [{"start": 0.0, "end": 1.0, "text": "첫 번째"}]),
+        {"index": 1, "offset": 30.0, "error": "APIConnectionError - timeout"},
+    ]
+
+    tasks.merge_segment_transcriptions_task.apply(args=[segment_results, "job-failed"]).get()
+
+    result = decode_result(redis_server.get("stt_result:job-failed"))
+    assert result["status"] == "Failed"
+    assert "Segment 1: APIConnectionError - timeout" in result["error"]
+    assert not redis_server.exists(segments_key("job-failed"))
@@ -0,0 +1,72 @@
+# test_segments.py
+# GET /result/{job_id}/segments 시간 범위 조회 (겹치는 세그먼트, 구간 경계)
+import asyncio
+
+import fakeredis
+import httpx
+import pytest
+
+import tasks
+from stt_segments import select_time_range, to_columns
+
+# Whisper 세그먼트는 겹칠 수 있고 end가 정렬되어 있지 않음 (index 1이 index 2, 3보다 늦게 끝남)
+OVERLAPPING_SEGMENTS = [
+    {"start": 0.0, "end": 2.0, "text": "a"},
+    {"start": 1.5, "end": 9.0, "text": "b"},
+    {"start": 3.0, "end": 4.0, "text": "c"},
+    {"start": 4.0, "end": 5.0, "text": "d"},
+    {"start": 9.5, "end": 11.0, "text": "e"},
+]
+
+
+def _texts(segments):
+    return [seg["text"] for seg in segments]
+
+
+@pytest.mark.parametrize("from_seconds, to_seconds, expected", [
+    (None, None, ["a", "b", "c", "d", "e"]),
+    (6.0, 7.0, ["b"]),                 # 앞에서 시작한 긴 세그먼트만 걸치는 구간
+    (4.5, 9.5, ["b", "d"]),            # c는 4.0에 끝나고 e는 9.5에 시작 (반열린 구간 [from, to))
+    (2.0, 3.0, ["b"]),                 # a는 from에 정확히 끝남, c는 to에 정확히 시작
+    (4.0, 4.0001, ["b", "d"]),
+    (11.0, None, []),
+    (None, 0.5, ["a"]),
+])
+def test_select_time_range_handles_overlap_and_edges(from_seconds, to_seconds, expected):
+    first_index, segments = select_time_range(to_columns(OVERLAPPING_SEGMENTS), from_seconds, to_seconds)
+    assert _texts(segments) == expected
+    if segments:
+        assert first_index == segments[0]["index"]
+
+
+def test_select_time_range_reads_columns_stored_without_max_end():
+    columns = to_columns(OVERLAPPING_SEGMENTS)
+    del columns["max_end"]
+    assert _texts(select_time_range(columns, 6.0, 7.0)[1]) == ["b"]
+
+
+def test_segments_route_serves_time_ranges(api, monkeypatch):
+    monkeypatch.setattr(tasks, "redis_task_client", fakeredis.FakeRedis(server=api.server, decode_responses=True))
+    tasks.store_result_in_redis("job-1", {"status": "Completed", "transcription": "a b c d e", "detected_language": "ko",
+                                          "segments": list(reversed(OVERLAPPING_SEGMENTS))})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.main.app), base_url="http://testserver") as client:
+            return [await client.get(path, params=params) for path, params in [
+                ("/result/job-1/segments", {"from": 6, "to": 7}),
+                ("/result/job-1/segments", {"from": 2, "to": 3}),
+                ("/result/job-1/segments", {}),
+                ("/result/job-1/segments", {"from": 5, "to": 5}),
+                ("/result/job-missing/segments", {}),
+            ]]
+
+    window, edges, everything, empty_window, missing = asyncio.run(run())
+    assert window.status_code == 200
+    assert window.json() == {"job_id": "job-1", "segment_count": 5, "first_index": 1, "segments": [
+        {"index": 1, "start": 1.5, "end": 9.0, "text": "b", "avg_logprob": None, "no_speech_prob": None},
+    ]}
+    assert _texts(edges.json()["segments"]) == ["b"]
+    assert _texts(everything.json()["segments"]) == ["a", "b", "c", "d", "e"]
+    assert "max_end" not in everything.json()["segments"][0]
+    assert empty_window.status_code == 400
+    assert missing.status_code == 404
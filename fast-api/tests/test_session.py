@@ -0,0 +1,79 @@
+# test_session.py
+# 청크 녹음 세션: 발행에 성공한 청크만 세션에 등록되고, 세션 요약도 큐 라우팅을 따름
+import asyncio
+
+import fakeredis
+import httpx
+import pytest
+
+import tasks
+
+
+def _run(api, scenario):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.main.app), base_url="http://testserver") as client:
+            def upload(seq, audio=b"\x1a\x45\xdf\xa3" * 100):
+                return client.post("/upload", files={"file": ("chunk.webm", audio, "audio/webm")},
+                                   data={"session_id": "session-1", "seq": str(seq)})
+            return await scenario(client, upload)
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def store_result(api, monkeypatch):
+    monkeypatch.setattr(tasks, "redis_task_client", fakeredis.FakeRedis(server=api.server, decode_responses=True))
+    return tasks.store_result_in_redis
+
+
+def _broker_down(*args, **kwargs):
+    raise ConnectionError("broker down")
+
+
+def test_failed_publish_does_not_register_chunk(api, monkeypatch, store_result):
+    publish = api.main.process_audio_with_openai_whisper_task.apply_async
+
+    async def scenario(client, upload):
+        first = await upload(0)
+        monkeypatch.setattr(api.main.process_audio_with_openai_whisper_task, "apply_async", _broker_down)
+        failed = await upload(1, audio=b"other chunk" * 50)
+        monkeypatch.setattr(api.main.process_audio_with_openai_whisper_task, "apply_async", publish)
+        store_result(first.json()["job_id"], {"status": "Completed", "transcription": "첫 청크", "detected_language": "ko"}, "session-1")
+        return first, failed, await client.get("/session/session-1")
+
+    first, failed, session = _run(api, scenario)
+    assert first.status_code == 202
+    assert failed.status_code == 500
+    assert session.status_code == 200
+    assert session.json()["chunk_count"] == 1
+    assert session.json()["is_final"] is True
+    assert session.json()["transcript"] == "첫 청크"
+
+
+def test_session_with_only_failed_chunks_is_not_created(api, monkeypatch):
+    monkeypatch.setattr(api.main.process_audio_with_openai_whisper_task, "apply_async", _broker_down)
+
+    async def scenario(client, upload):
+        return await upload(0), await client.get("/session/session-1")
+
+    failed, session = _run(api, scenario)
+    assert failed.status_code == 500
+    assert session.status_code == 404
+
+
+def test_session_summary_is_routed_to_interactive_queue(api, monkeypatch, store_result):
+    dispatched = []
+    monkeypatch.setattr(api.main.summarize_text_with_gpt_task, "apply_async", lambda *args, **kwargs: dispatched.append(kwargs))
+    monkeypatch.setattr(api.main.Config, "SUMMARY_CACHE_ENABLED", False)
+
+    async def scenario(client, upload):
+        uploaded = await upload(0)
+        store_result(uploaded.json()["job_id"], {"status": "Completed", "transcription": "요약할 내용", "detected_language": "ko"}, "session-1")
+        return await client.post("/session/session-1/summarize")
+
+    response = _run(api, scenario)
+    assert response.status_code == 202
+    assert dispatched == [{
+        "args": ("session:session-1", "요약할 내용"),
+        "kwargs": {"priority": tasks.PRIORITY_INTERACTIVE},
+        **tasks.task_queue_options(tasks.PRIORITY_INTERACTIVE),
+    }]
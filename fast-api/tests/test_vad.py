@@ -0,0 +1,103 @@
+# test_vad.py
+# 에너지 기반 VAD 구간 검출, 음성 구간 추출, 타임스탬프 복원
+import numpy as np
+import pytest
+
+from config import Config
+from vad import detect_speech_regions, extract_regions, remap_segments
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture(autouse=True)
+def vad_config(monkeypatch):
+    monkeypatch.setattr(Config, "STT_VAD_FRAME_MS", 30)
+    monkeypatch.setattr(Config, "STT_VAD_THRESHOLD_DB", 12)
+    monkeypatch.setattr(Config, "STT_VAD_MIN_ENERGY_DBFS", -50)
+    monkeypatch.setattr(Config, "STT_VAD_PADDING_MS", 300)
+    monkeypatch.setattr(Config, "STT_VAD_MIN_SILENCE_MS", 600)
+
+
+def _tone(seconds, amplitude=0.1, frequency=220.0):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE))
+
+
+def _pcm(*parts):
+    return (np.concatenate(parts) * 32767).astype(np.int16).tobytes()
+
+
+def _covers(regions, start, end):
+    return any(region_start <= start and end <= region_end for region_start, region_end in regions)
+
+
+def test_all_silence_has_no_speech():
+    assert detect_speech_regions(_pcm(_silence(3)), SAMPLE_RATE) == []
+    quiet_noise = np.random.default_rng(0).normal(0, 10 ** (-70 / 20), int(3 * SAMPLE_RATE)) # -70 dBFS
+    assert detect_speech_regions(_pcm(quiet_noise), SAMPLE_RATE) == []
+
+
+@pytest.mark.parametrize("pcm_parts", [
+    (_tone(5),),                                     # 연속 음성
+    (_silence(1), _tone(10)),                        # 무음이 10% 미만
+    (_tone(10) * (1 + 0.5 * np.sin(2 * np.pi * 3 * np.arange(10 * SAMPLE_RATE) / SAMPLE_RATE)) / 1.5,), # 변조 신호
+])
+def test_continuous_speech_is_kept(pcm_parts):
+    pcm_bytes = _pcm(*pcm_parts)
+    total_seconds = len(pcm_bytes) / 2 / SAMPLE_RATE
+
+    regions = detect_speech_regions(pcm_bytes, SAMPLE_RATE)
+    assert regions
+    assert sum(end - start for start, end in regions) >= (total_seconds - 1) * 0.99
+
+
+def test_speech_separated_by_silence_is_split():
+    regions = detect_speech_regions(_pcm(_silence(2), _tone(2), _silence(3), _tone(1.5), _silence(2)), SAMPLE_RATE)
+
+    assert len(regions) == 2
+    assert _covers(regions, 2.0, 4.0)
+    assert _covers(regions, 7.0, 8.5)
+    assert regions[0][0] == pytest.approx(1.7, abs=0.05) # 앞뒤 여유 300ms
+    assert regions[1][1] == pytest.approx(8.8, abs=0.05)
+
+
+def test_short_pause_is_not_split():
+    regions = detect_speech_regions(_pcm(_silence(1), _tone(1), _silence(0.4), _tone(1), _silence(1)), SAMPLE_RATE)
+    assert len(regions) == 1
+
+
+def test_long_speech_does_not_overflow_dilation(monkeypatch):
+    # 여유 프레임이 많아도(창 크기 > 127) 합계가 넘치지 않아야 함
+    monkeypatch.setattr(Config, "STT_VAD_PADDING_MS", 3000)
+    regions = detect_speech_regions(_pcm(_silence(10), _tone(10), _silence(10)), SAMPLE_RATE)
+    assert len(regions) == 1
+    assert _covers(regions, 10.0, 20.0)
+
+
+def test_extract_and_remap_restore_original_timestamps():
+    pcm_bytes = _pcm(_silence(2), _tone(2), _silence(3), _tone(1), _silence(1))
+    regions = [(2.0, 4.0), (7.0, 8.0)]
+
+    speech_pcm, offset_map = extract_regions(pcm_bytes, SAMPLE_RATE, regions)
+    assert len(speech_pcm) == 3 * SAMPLE_RATE * 2
+    assert offset_map == [(0.0, 2.0, 4.0), (2.0, 7.0, 8.0)]
+
+    segments = [
+        {"start": 0.5, "end": 1.5, "text": "a", "avg_logprob": -0.1},
+        {"start": 2.25, "end": 3.0, "text": "b", "avg_logprob": -0.2},
+        {"start": 1.75, "end": 2.5, "text": "c", "avg_logprob": -0.3}, # 구간 경계를 넘는 세그먼트
+    ]
+    assert remap_segments(segments, offset_map) == [
+        {"start": 2.5, "end": 3.5, "text": "a", "avg_logprob": -0.1},
+        {"start": 7.25, "end": 8.0, "text": "b", "avg_logprob": -0.2},
+        {"start": 3.75, "end": 7.5, "text": "c", "avg_logprob": -0.3},
+    ]
+
+
+def test_remap_clamps_time_past_region_end():
+    offset_map = [(0.0, 1.0, 2.0)]
+    assert remap_segments([{"start": 0.0, "end": 1.4, "text": "a"}], offset_map) == [{"start": 1.0, "end": 2.0, "text": "a"}]
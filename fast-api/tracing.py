@@ -0,0 +1,150 @@
+# tracing.py
+# OpenTelemetry 분산 트레이싱 (API 요청 → Celery 메시지 → 워커 작업 → GCS/STT/Redis 단계)
+#
+# trace 컨텍스트는 Celery 메시지 헤더(trace_context)에 W3C traceparent 형식으로 실려 워커로 전달되며,
+# 워커 작업 span은 API 요청 span의 자식이 됩니다. fan-out/요약 작업처럼 워커가 발행한 작업도 같은 trace로 이어집니다.
+# TRACING_EXPORTER=none(기본값)이거나 opentelemetry가 설치되지 않았으면 모든 함수가 아무 일도 하지 않습니다.
+import contextlib
+import logging
+import socket
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import context as otel_context, propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:
+    trace = None
+
+TRACE_CONTEXT_HEADER = "trace_context"
+
+_tracer = None
+_task_spans = {} # task_id -> (span, context token): task_prerun에서 시작해 task_postrun에서 종료
+
+
+def _create_exporter():
+    if Config.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter() # OTEL_EXPORTER_OTLP_ENDPOINT 등 표준 환경 변수를 따름
+    if Config.TRACING_EXPORTER == "file":
+        # 여러 프로세스가 같은 파일에 한 줄씩 추가 (O_APPEND)
+        trace_file = open(Config.TRACING_FILE_PATH, "a", buffering=1, encoding="utf-8")
+        return ConsoleSpanExporter(out=trace_file, formatter=lambda span: span.to_json(indent=None) + "\n")
+    raise ValueError(f"Unsupported TRACING_EXPORTER: {Config.TRACING_EXPORTER}")
+
+
+def init_tracing(service_name):
+    """프로세스의 TracerProvider를 설정합니다. API는 lifespan에서, Celery는 worker_init에서 한 번 호출합니다.
+
+    BatchSpanProcessor는 fork 이후 자식 프로세스에서 내보내기 스레드를 다시 시작하므로 prefork 풀에서도 동작합니다.
+    """
+    global _tracer
+    if _tracer is not None or Config.TRACING_EXPORTER == "none":
+        return
+    if trace is None:
+        logger.warning(f"TRACING_EXPORTER={Config.TRACING_EXPORTER} but opentelemetry-sdk is not installed. Tracing disabled.")
+        return
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name, "host.name": socket.gethostname()}),
+        sampler=ParentBased(TraceIdRatioBased(Config.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("stt")
+    logger.info(f"Tracing enabled for '{service_name}' (exporter: {Config.TRACING_EXPORTER}).")
+
+
+def tracing_enabled():
+    return _tracer is not None
+
+
+def start_span(name, **attributes):
+    """현재 span의 자식 span을 시작하는 context manager. 트레이싱이 꺼져 있으면 아무 일도 하지 않습니다."""
+    if _tracer is None:
+        return contextlib.nullcontext()
+    return _tracer.start_as_current_span(name, attributes=_clean(attributes))
+
+
+def start_http_span(method, path, headers):
+    """(API 미들웨어) 요청 span을 시작합니다. 클라이언트가 traceparent 헤더를 보냈으면 그 trace에 이어 붙입니다.
+
+    FastAPI 자체 telemetry나 ASGI instrumentation이 이미 요청 span을 만들었으면 새로 만들지 않고 그 span을 사용합니다.
+    """
+    if _tracer is None or trace.get_current_span().get_span_context().is_valid:
+        return contextlib.nullcontext()
+    return _tracer.start_as_current_span(f"{method} {path}", context=propagate.extract(headers), kind=SpanKind.SERVER,
+                                         attributes={"http.request.method": method, "url.path": path})
+
+
+def record_http_response(method, route_path, status_code):
+    """(API 미들웨어) 요청 span 이름을 경로 템플릿(/result/{job_id_key})으로 바꾸고 응답 상태를 기록합니다."""
+    if _tracer is None:
+        return
+    span = trace.get_current_span()
+    if route_path:
+        span.update_name(f"{method} {route_path}")
+        span.set_attribute("http.route", route_path)
+    span.set_attribute("http.response.status_code", status_code)
+    if status_code >= 500:
+        span.set_status(Status(StatusCode.ERROR))
+
+
+def set_span_attributes(**attributes):
+    """현재 span에 속성(job_id 등)을 추가합니다."""
+    if _tracer is not None:
+        trace.get_current_span().set_attributes(_clean(attributes))
+
+
+def inject_trace_context(headers):
+    """(before_task_publish) 현재 trace 컨텍스트를 Celery 메시지 헤더에 넣습니다."""
+    if _tracer is None or headers is None:
+        return
+    carrier = {}
+    propagate.inject(carrier)
+    if carrier:
+        headers[TRACE_CONTEXT_HEADER] = carrier
+
+
+def start_task_span(task):
+    """(task_prerun) 메시지 헤더의 컨텍스트를 부모로 하는 작업 span을 시작하고 현재 컨텍스트로 설정합니다."""
+    if _tracer is None:
+        return
+    request = task.request
+    # 워커가 받은 메시지는 사용자 헤더가 request 속성으로 풀려 있고, apply(headers=...)는 request.headers에 남아 있음
+    carrier = request.get(TRACE_CONTEXT_HEADER) or (request.headers or {}).get(TRACE_CONTEXT_HEADER) or {}
+    parent_context = propagate.extract(carrier)
+    span = _tracer.start_span(f"celery.task {task.name}", context=parent_context, kind=SpanKind.CONSUMER, attributes=_clean({
+        "celery.task_name": task.name,
+        "celery.task_id": request.id,
+        "celery.retries": request.retries,
+        "celery.queue": (request.delivery_info or {}).get("routing_key"),
+        "celery.worker": request.hostname,
+        "job_id": request.args[0] if request.args and isinstance(request.args[0], str) else None,
+    }))
+    token = otel_context.attach(trace.set_span_in_context(span))
+    _task_spans[request.id] = (span, token)
+
+
+def end_task_span(task, state=None, retval=None):
+    """(task_postrun) 작업 span을 종료합니다. 실패하면 예외를 span에 기록합니다."""
+    entry = _task_spans.pop(task.request.id, None)
+    if entry is None:
+        return
+    span, token = entry
+    span.set_attribute("celery.state", state or "UNKNOWN")
+    if state == "FAILURE":
+        if isinstance(retval, BaseException):
+            span.record_exception(retval)
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+    otel_context.detach(token)
+
+
+def _clean(attributes):
+    return {key: value for key, value in attributes.items() if value is not None}
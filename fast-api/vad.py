@@ -0,0 +1,78 @@
+# vad.py
+# 에너지 기반 음성 구간 검출(VAD)과 무음 제거 후 타임스탬프 복원용 오프셋 맵
+import bisect
+
+import numpy as np
+
+from config import Config
+
+
+def detect_speech_regions(pcm_bytes, sample_rate):
+    """16-bit mono PCM에서 음성 구간 [(start, end), ...](초)을 찾습니다.
+
+    프레임별 RMS 에너지(dBFS)를 한 번에 계산하고, 하위 10% 에너지를 잡음 수준으로 보아
+    그보다 STT_VAD_THRESHOLD_DB 이상 큰 프레임을 음성으로 판단합니다 (적응형 임계값).
+    음성 앞뒤로 STT_VAD_PADDING_MS만큼 여유를 두고, STT_VAD_MIN_SILENCE_MS보다 짧은 무음은 유지합니다.
+
+    모든 프레임이 STT_VAD_MIN_ENERGY_DBFS 이하일 때만 빈 목록(음성 없음)을 반환합니다.
+    무음이 거의 없는 연속 음성은 잡음 수준을 추정할 수 없으므로 전체를 한 구간으로 반환합니다.
+    """
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+    frame_size = int(sample_rate * Config.STT_VAD_FRAME_MS / 1000)
+    frame_count = len(samples) // frame_size
+    if frame_count == 0:
+        return []
+
+    frames = samples[:frame_count * frame_size].reshape(frame_count, frame_size).astype(np.float32) / 32768.0
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    frame_seconds = frame_size / sample_rate
+    if not np.any(energy_db > Config.STT_VAD_MIN_ENERGY_DBFS):
+        return []
+    noise_floor_db = np.percentile(energy_db, 10)
+    threshold_db = max(Config.STT_VAD_MIN_ENERGY_DBFS, noise_floor_db + Config.STT_VAD_THRESHOLD_DB)
+    speech_mask = energy_db > threshold_db
+    if not speech_mask.any(): # 잡음 수준이 곧 음성 수준 (연속 음성): 자르지 않음
+        return [(0.0, float(frame_count * frame_seconds))]
+
+    # 음성 프레임을 앞뒤로 확장(dilation): 짧은 무음 메우기 + 말 시작/끝 보존
+    pad_frames = max(Config.STT_VAD_PADDING_MS, Config.STT_VAD_MIN_SILENCE_MS // 2) // Config.STT_VAD_FRAME_MS
+    if pad_frames > 0:
+        speech_mask = np.convolve(speech_mask.astype(np.int32), np.ones(2 * pad_frames + 1, dtype=np.int32), mode="same") > 0
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], speech_mask.astype(np.int32), [0]))))
+    return [(float(start * frame_seconds), float(end * frame_seconds)) for start, end in zip(edges[::2], edges[1::2])]
+
+
+def extract_regions(pcm_bytes, sample_rate, regions):
+    """음성 구간만 이어붙인 PCM과 오프셋 맵 [(trimmed_start, original_start, original_end), ...]을 반환합니다."""
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+    pieces = []
+    offset_map = []
+    trimmed_position = 0.0
+    for start, end in regions:
+        piece = samples[int(start * sample_rate):int(end * sample_rate)]
+        pieces.append(piece)
+        offset_map.append((trimmed_position, start, end))
+        trimmed_position += len(piece) / sample_rate
+    return np.concatenate(pieces).tobytes(), offset_map
+
+
+def to_original_time(offset_map, trimmed_seconds, trimmed_starts=None):
+    """무음 제거된 오디오의 시각을 원본 오디오 기준 시각으로 변환합니다."""
+    if trimmed_starts is None:
+        trimmed_starts = [entry[0] for entry in offset_map]
+    index = max(0, bisect.bisect_right(trimmed_starts, trimmed_seconds) - 1)
+    trimmed_start, original_start, original_end = offset_map[index]
+    return round(min(original_end, original_start + max(0.0, trimmed_seconds - trimmed_start)), 3)
+
+
+def remap_segments(segments, offset_map):
+    trimmed_starts = [entry[0] for entry in offset_map]
+    return [
+        {
+            **seg,
+            "start": to_original_time(offset_map, seg["start"], trimmed_starts),
+            "end": to_original_time(offset_map, seg["end"], trimmed_starts),
+        }
+        for seg in segments
+    ]
@@ -1,16 +1,19 @@
 # main.py
 from fastapi import FastAPI, Request, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 import os
 import uuid
-import redis
+import redis.asyncio as aioredis
 import json
 import logging
+from contextlib import asynccontextmanager
 
 # 프로젝트 루트의 config.py, tasks.py (Celery 작업) 임포트
 from config import Config
-from tasks import process_audio_with_openai_whisper_task # 변경된 Celery 작업 함수 임포트
+from tasks import process_audio_with_openai_whisper_task, RESULT_EVENTS_CHANNEL_PREFIX # 변경된 Celery 작업 함수 임포트
+from redis_pool import create_api_redis_client
 
 # GCS 관련
 from google.cloud import storage as gcs_storage
@@ -23,8 +26,31 @@ from werkzeug.utils import secure_filename
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# --- Redis 클라이언트 (STT 결과 임시 저장용, 앱 시작 시 lifespan에서 생성) ---
+redis_client = None          # 라우트들이 공유하는 크기 제한 비동기 연결 풀
+redis_pubsub_client = None   # 결과 상태 구독(SSE) 전용 - 장시간 점유하는 연결이 공유 풀을 고갈시키지 않도록 분리
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global redis_client, redis_pubsub_client
+    redis_client = create_api_redis_client(Config.REDIS_RESULT_DB)
+    redis_pubsub_client = aioredis.Redis(
+        host=Config.REDIS_HOST,
+        port=Config.REDIS_PORT,
+        db=Config.REDIS_RESULT_DB,
+        decode_responses=True
+    )
+    try:
+        await redis_client.ping()
+        logger.info(f"Redis (for results on db {Config.REDIS_RESULT_DB}) connected. Pool size: {Config.REDIS_API_POOL_MAX_CONNECTIONS}")
+    except Exception as e:
+        logger.error(f"Redis (for results) connection error: {e}")
+    yield
+    await redis_client.aclose()
+    await redis_pubsub_client.aclose()
+
 # --- FastAPI 앱 생성 ---
-app = FastAPI(title="Audio-to-Text Service (OpenAI Whisper API)")
+app = FastAPI(title="Audio-to-Text Service (OpenAI Whisper API)", lifespan=lifespan)
 
 # --- 템플릿 설정 ---
 templates = Jinja2Templates(directory="templates") # main.py와 같은 레벨에 templates 폴더
@@ -45,19 +71,7 @@ else:
     logger.warning("GCS_BUCKET_NAME이 설정되지 않았거나 플레이스홀더 값입니다. GCS 기능이 제한됩니다.")
 
 
-# --- Redis 클라이언트 초기화 (STT 결과 임시 저장용) ---
-redis_client = None
-try:
-    redis_client = redis.Redis(
-        host=Config.REDIS_HOST,
-        port=Config.REDIS_PORT,
-        db=Config.REDIS_RESULT_DB,
-        decode_responses=True
-    )
-    redis_client.ping()
-    logger.info(f"Redis (for results on db {Config.REDIS_RESULT_DB}) connected.")
-except Exception as e:
-    logger.error(f"Redis (for results) connection error: {e}")
+TERMINAL_STATUSES = {"Completed", "Failed"}
 
 
 # --- 허용 파일 확장자 (Whisper API는 다양한 포맷 지원) ---
@@ -67,6 +81,34 @@ def allowed_file(filename: str):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+async def stream_upload_to_gcs(upload_file: UploadFile, blob, content_type: str):
+    """UploadFile을 고정 크기 청크로 읽어 GCS resumable 업로드로 전송하고, 업로드된 바이트 수를 반환합니다.
+
+    요청당 메모리는 청크 크기로 제한되며, GCS 호출은 스레드풀에서 실행되어 이벤트 루프를 막지 않습니다.
+    최대 크기를 넘으면 업로드 세션을 취소하고 413을 발생시킵니다.
+    """
+    chunk = await upload_file.read(Config.UPLOAD_CHUNK_SIZE_BYTES)
+    if not chunk:
+        raise HTTPException(status_code=400, detail="업로드된 파일이 비어있습니다.")
+
+    writer = await run_in_threadpool(
+        blob.open, "wb", chunk_size=Config.UPLOAD_CHUNK_SIZE_BYTES, content_type=content_type
+    )
+    total_bytes = 0
+    try:
+        while chunk:
+            total_bytes += len(chunk)
+            if total_bytes > Config.UPLOAD_MAX_BYTES:
+                raise HTTPException(status_code=413, detail=f"파일 크기가 최대 허용치({Config.UPLOAD_MAX_BYTES} bytes)를 초과했습니다.")
+            await run_in_threadpool(writer.write, chunk)
+            chunk = await upload_file.read(Config.UPLOAD_CHUNK_SIZE_BYTES)
+        await run_in_threadpool(writer.close)
+    except BaseException:
+        # 완료되지 않은 resumable 세션은 취소하여 부분 객체가 남지 않도록 함
+        await run_in_threadpool(writer.terminate)
+        raise
+    return total_bytes
+
 # --- 라우트 정의 ---
 @app.get("/", response_class=HTMLResponse, name="get_upload_form_route", tags=["Pages"])
 async def get_upload_form_route(request: Request):
@@ -99,19 +141,19 @@ async def upload_and_process_file_route(request: Request, file: UploadFile = Fil
     job_id = uuid.uuid4().hex
     gcs_object_name = f"audio_uploads_for_whisper/{job_id}/{original_filename_secured}" # GCS 저장 경로
 
+    blob = gcs_bucket.blob(gcs_object_name)
+    file_content_type = file.content_type or f"audio/{original_filename_secured.rsplit('.', 1)[1].lower()}"
+    uploaded_to_gcs = False
     try:
-        contents = await file.read()
-        if not contents:
-            logger.warning(f"Job {job_id} (IP {uploader_ip}): 업로드된 파일 '{original_filename_secured}'이 비어있습니다.")
-            raise HTTPException(status_code=400, detail="업로드된 파일이 비어있습니다.")
-
-        blob = gcs_bucket.blob(gcs_object_name)
-        file_content_type = file.content_type or f"audio/{original_filename_secured.rsplit('.', 1)[1].lower()}"
-        
-        blob.upload_from_string(contents, content_type=file_content_type)
+        try:
+            uploaded_bytes = await stream_upload_to_gcs(file, blob, file_content_type)
+        except HTTPException as e_http:
+            logger.warning(f"Job {job_id} (IP {uploader_ip}): 업로드 거부 '{original_filename_secured}' - {e_http.detail}")
+            raise
+        uploaded_to_gcs = True
         # GCS URI는 Whisper API에 직접 사용하지 않지만, 로깅이나 다른 용도로 남겨둘 수 있음
         # gcs_uri = f"gs://{Config.GCS_BUCKET_NAME}/{gcs_object_name}" 
-        logger.info(f"Job {job_id}: File '{original_filename_secured}' (Type: {file_content_type}) uploaded to GCS: gs://{Config.GCS_BUCKET_NAME}/{gcs_object_name}")
+        logger.info(f"Job {job_id}: File '{original_filename_secured}' (Type: {file_content_type}, {uploaded_bytes} bytes) uploaded to GCS: gs://{Config.GCS_BUCKET_NAME}/{gcs_object_name}")
 
         # Celery 작업 호출 (OpenAI Whisper API 사용 작업)
         process_audio_with_openai_whisper_task.delay(
@@ -124,11 +166,13 @@ async def upload_and_process_file_route(request: Request, file: UploadFile = Fil
 
         return RedirectResponse(url=request.url_for('get_result_page_route', job_id=job_id), status_code=303)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Job {job_id}: Upload or Celery task initiation error: {e}", exc_info=True)
-        if 'blob' in locals() and blob and gcs_bucket.get_blob(gcs_object_name):
+        if uploaded_to_gcs:
             try:
-                blob.delete()
+                await run_in_threadpool(blob.delete)
                 logger.info(f"Job {job_id}: Cleaned up GCS file due to error: {gcs_object_name}")
             except Exception as e_del:
                 logger.error(f"Job {job_id}: Error cleaning up GCS file {gcs_object_name}: {e_del}")
@@ -148,7 +192,7 @@ async def get_result_page_route(request: Request, job_id: str):
         })
 
     result_key = f"stt_result:{job_id}"
-    result_data_json_str = redis_client.get(result_key)
+    result_data_json_str = await redis_client.get(result_key)
     
     template_context = {"request": request, "job_id": job_id, "uploader_ip": current_uploader_ip}
 
@@ -163,12 +207,11 @@ async def get_result_page_route(request: Request, job_id: str):
                 template_context["detected_language"] = result_data.get("detected_language")
                 if result_data.get("error_detail"): 
                     template_context["warning_message"] = result_data.get("error_detail")
-                redis_client.delete(result_key) 
-                logger.info(f"Job {job_id}: Result fetched by IP {current_uploader_ip} and removed from Redis.")
+                # 새로고침/다른 탭에서도 다시 볼 수 있도록 삭제하지 않고 만료 시간(REDIS_RESULT_EXPIRE_SECONDS)까지 유지
+                logger.info(f"Job {job_id}: Result fetched by IP {current_uploader_ip}.")
             elif status == "Failed":
                 template_context["error_message"] = result_data.get("error")
-                redis_client.delete(result_key)
-                logger.info(f"Job {job_id}: Failed status fetched by IP {current_uploader_ip} and removed from Redis.")
+                logger.info(f"Job {job_id}: Failed status fetched by IP {current_uploader_ip}.")
             else: # Processing
                 logger.info(f"Job {job_id}: Status is '{status}', will refresh for IP {current_uploader_ip}.")
         
@@ -176,7 +219,7 @@ async def get_result_page_route(request: Request, job_id: str):
             logger.error(f"Job {job_id}: Failed to decode JSON from Redis: {result_data_json_str}")
             template_context["status"] = "Error"
             template_context["error_message"] = "결과 데이터 형식 오류."
-            redis_client.delete(result_key)
+            await redis_client.delete(result_key)
         except Exception as e:
             logger.error(f"Job {job_id}: Error processing result from Redis: {e}")
             template_context["status"] = "Error"
@@ -187,4 +230,39 @@ async def get_result_page_route(request: Request, job_id: str):
 
     return templates.TemplateResponse("result_display_stateless.html", template_context)
 
+@app.get("/result/{job_id}/events", name="get_result_events_route", tags=["Pages"])
+async def get_result_events_route(request: Request, job_id: str):
+    """작업 상태 변경을 Server-Sent Events로 전달합니다 (결과 페이지의 주기적 새로고침 대체)."""
+    async def event_stream():
+        pubsub = redis_pubsub_client.pubsub()
+        try:
+            await pubsub.subscribe(f"{RESULT_EVENTS_CHANNEL_PREFIX}{job_id}")
+            # 구독 이전에 이미 저장된 상태가 있으면 먼저 전송
+            current_result = await redis_pubsub_client.get(f"stt_result:{job_id}")
+            if current_result:
+                yield f"data: {current_result}\n\n"
+                if json.loads(current_result).get("status") in TERMINAL_STATUSES:
+                    return
+            while not await request.is_disconnected():
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=15.0)
+                if not message:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {message['data']}\n\n"
+                if json.loads(message["data"]).get("status") in TERMINAL_STATUSES:
+                    return
+        except Exception as e:
+            logger.error(f"Job {job_id}: Result event stream error: {e}")
+        finally:
+            await pubsub.aclose()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/stats/redis-pool", name="get_redis_pool_stats_route", tags=["Status"])
+async def get_redis_pool_stats_route():
+    """API 프로세스의 Redis 연결 풀 사용량과 대기 통계를 반환합니다."""
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="내부 결과 저장소(Redis)가 준비되지 않았습니다.")
+    return redis_client.connection_pool.get_stats()
+
 # Uvicorn으로 실행: uvicorn main:app --reload --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -49,12 +49,18 @@ else:
     logger.error("Celery Worker: OPENAI_API_KEY가 설정되지 않았습니다. Config 또는 환경 변수를 확인하세요.")
 
 
+# 결과 상태 변경 알림용 Redis pub/sub 채널 접두사 (결과 페이지의 SSE 엔드포인트가 구독)
+RESULT_EVENTS_CHANNEL_PREFIX = "stt_events:"
+
 # --- 헬퍼 함수 ---
 def store_result_in_redis(job_id, data_dict):
     if redis_task_client:
         result_key = f"stt_result:{job_id}"
         try:
-            redis_task_client.setex(result_key, Config.REDIS_RESULT_EXPIRE_SECONDS, json.dumps(data_dict))
+            pipe = redis_task_client.pipeline(transaction=False)
+            pipe.setex(result_key, Config.REDIS_RESULT_EXPIRE_SECONDS, json.dumps(data_dict))
+            pipe.publish(f"{RESULT_EVENTS_CHANNEL_PREFIX}{job_id}", json.dumps(data_dict))
+            pipe.execute()
             logger.info(f"Job {job_id}: Result stored in Redis. Key: {result_key}")
         except Exception as e:
             logger.error(f"Job {job_id}: Failed to store result in Redis: {e}")